@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.replicas import get_read_db
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.models import User, Achievement
 from app.schemas.schemas import Achievement as AchievementSchema, AchievementCreate
@@ -11,11 +13,13 @@ router = APIRouter()
 @router.get("/", response_model=List[AchievementSchema])
 async def get_achievements(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    achievements = db.query(Achievement).filter(
-        Achievement.user_id == current_user.id
-    ).order_by(Achievement.earned_at.desc()).all()
+    achievements = (await db.execute(
+        select(Achievement).where(
+            Achievement.user_id == current_user.id
+        ).order_by(Achievement.earned_at.desc())
+    )).scalars().all()
     
     return achievements
 
@@ -23,22 +27,22 @@ async def get_achievements(
 async def create_achievement(
     achievement_data: AchievementCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     achievement = Achievement(**achievement_data.dict())
     db.add(achievement)
-    db.commit()
-    db.refresh(achievement)
+    await db.commit()
+    await db.refresh(achievement)
     return achievement
 
 @router.get("/stats")
 async def get_achievement_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    achievements = db.query(Achievement).filter(
-        Achievement.user_id == current_user.id
-    ).all()
+    achievements = (await db.execute(
+        select(Achievement).where(Achievement.user_id == current_user.id)
+    )).scalars().all()
     
     total_points = sum([achievement.points for achievement in achievements])
     
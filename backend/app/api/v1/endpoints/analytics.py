@@ -1,21 +1,23 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.replicas import get_read_db
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.models import User, SlackActivity, PerformanceMetric
 from app.schemas.schemas import AnalyticsData, CollaborationData
+from app.services.ml_engine_service import ml_engine_service
 
 router = APIRouter()
 
 @router.get("/", response_model=AnalyticsData)
 async def get_analytics_data(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Get collaboration data from Slack activities
-    slack_activities = db.query(SlackActivity).filter(
-        SlackActivity.user_id == current_user.id
-    ).all()
+    slack_activities = (await db.execute(
+        select(SlackActivity).where(SlackActivity.user_id == current_user.id)
+    )).scalars().all()
     
     # Calculate collaboration metrics
     if slack_activities:
@@ -34,6 +36,17 @@ async def get_analytics_data(
         teamwork=90.0  # Mock data for now
     )
     
+    # Recommendations precomputed by the ml-engine snapshot job; the mock
+    # data below is only used until the user has a snapshot
+    snapshot = await ml_engine_service.get_recommendation_snapshot(current_user.id)
+    if snapshot is not None:
+        return AnalyticsData(
+            collaboration_data=collaboration_data,
+            strengths=snapshot["strengths"],
+            improvement_areas=snapshot["improvement_areas"],
+            recommendations=snapshot["recommendations"]
+        )
+    
     # Mock strengths and improvement areas (in production, these would be ML-generated)
     strengths = [
         "Code Quality & Best Practices",
@@ -79,12 +92,14 @@ async def get_analytics_data(
 @router.get("/performance-trends")
 async def get_performance_trends(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Get performance metrics from database
-    metrics = db.query(PerformanceMetric).filter(
-        PerformanceMetric.user_id == current_user.id
-    ).order_by(PerformanceMetric.period_start.desc()).limit(6).all()
+    metrics = (await db.execute(
+        select(PerformanceMetric).where(
+            PerformanceMetric.user_id == current_user.id
+        ).order_by(PerformanceMetric.period_start.desc()).limit(6)
+    )).scalars().all()
     
     # Mock data for demonstration
     if not metrics:
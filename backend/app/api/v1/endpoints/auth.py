@@ -1,44 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash
-from app.db.database import get_db
-from app.models.models import User
+from app.core.security import create_access_token, verify_token_claims
+from app.db.database import get_async_db
+from app.models.models import User, UserDashboardSummary
 from app.schemas.schemas import Token, UserCreate, User as UserSchema, LoginRequest
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Stored with older cost parameters; upgrade while the plain password is at hand
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme),
+                           db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    from app.core.security import verify_token
-    email = verify_token(token)
-    if email is None:
+    claims = verify_token_claims(token)
+    if claims is None:
         raise credentials_exception
+    email, token_expires_at = claims
     
-    user = db.query(User).filter(User.email == email).first()
+    # A cached user is detached from ``db``; the session only connects on a miss
+    user = await user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        user = await get_user_by_email(db, email)
+        if user is None:
+            raise credentials_exception
+        await user_cache.put(user, token_expires_at)
+    # Lets ReadYourWritesMiddleware pin this user's reads to the primary after a write
+    request.state.user_id = user.id
     return user
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,9 +70,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=UserSchema)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
+    db_user = await get_user_by_email(db, user_data.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -62,7 +80,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -73,8 +91,11 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.flush()
+    # A new user has nothing to count yet; the row saves the dashboard building it
+    db.add(UserDashboardSummary(user_id=db_user.id, total_points=0, daily_completions={}))
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.replicas import get_read_db
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.models import User, Task
 from app.schemas.schemas import Task as TaskSchema, TaskCreate, TaskUpdate
@@ -13,33 +15,35 @@ async def get_tasks(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    tasks = db.query(Task).filter(Task.assignee_id == current_user.id).offset(skip).limit(limit).all()
+    tasks = (await db.execute(
+        select(Task).where(Task.assignee_id == current_user.id).offset(skip).limit(limit)
+    )).scalars().all()
     return tasks
 
 @router.post("/", response_model=TaskSchema)
 async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     task = Task(
         **task_data.dict(),
         created_by=current_user.id
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     return task
 
 @router.get("/{task_id}", response_model=TaskSchema)
 async def get_task(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -54,9 +58,9 @@ async def update_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -73,17 +77,17 @@ async def update_task(
         from datetime import datetime
         task.completed_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     return task
 
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -91,6 +95,6 @@ async def delete_task(
     if task.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.commit()
     return {"message": "Task deleted successfully"}
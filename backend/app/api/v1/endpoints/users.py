@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.replicas import get_read_db
 from app.api.v1.endpoints.auth import get_current_user
 from app.models.models import User
 from app.schemas.schemas import User as UserSchema, UserUpdate
+from app.services.password_hasher import password_hasher
 
 router = APIRouter()
 
@@ -16,30 +19,35 @@ async def get_current_user_profile(current_user: User = Depends(get_current_user
 async def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    # current_user may come from the user cache, detached from this session
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
     # Update user fields
     for field, value in user_update.dict(exclude_unset=True).items():
         if field == "password" and value:
-            from app.core.security import get_password_hash
-            setattr(current_user, "hashed_password", get_password_hash(value))
+            setattr(user, "hashed_password", await password_hasher.hash(value))
         elif field != "password":
-            setattr(current_user, field, value)
+            setattr(user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    # Committing drops the cached user (see app.services.user_cache)
+    await db.commit()
+    await db.refresh(user)
+    return user
 
 @router.get("/", response_model=List[UserSchema])
 async def get_users(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Only allow certain roles to view all users
     if current_user.role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    users = db.query(User).offset(skip).limit(limit).all()
+    users = (await db.execute(select(User).offset(skip).limit(limit))).scalars().all()
     return users
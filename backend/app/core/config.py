@@ -14,6 +14,29 @@ class Settings(BaseSettings):
     postgres_user: str = "pragati_user"
     postgres_password: str = "pragati_password"
     
+    # Connection pool, per worker process
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    # Seconds a request waits for a free connection before failing
+    db_pool_timeout: float = 5.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Server-side cap on any single statement, so one slow query cannot hold a connection indefinitely
+    db_statement_timeout_ms: int = 5000
+    
+    # Read replicas (postgresql:// URLs, as a JSON list); empty sends every read to the primary
+    database_replica_urls: List[str] = []
+    # Short, so a dead replica fails over quickly instead of stalling the request
+    db_replica_connect_timeout: float = 2.0
+    # Replicas further behind than this are skipped until they catch up
+    db_replica_max_lag_seconds: float = 5.0
+    # How often replica lag is checked, and how long a failed replica is skipped
+    db_replica_check_interval: float = 10.0
+    # After a user writes, their reads stay on the primary this long
+    read_your_writes_seconds: float = 5.0
+    # Shares those windows across workers; unset keeps them per worker
+    read_your_writes_redis_url: Optional[str] = None
+    
     mongodb_uri: str = "mongodb://localhost:27017/pragati"
     redis_url: str = "redis://localhost:6379"
     elasticsearch_url: str = "http://localhost:9200"
@@ -22,6 +45,22 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-here"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # bcrypt cost; raising it rehashes each user's password at their next login
+    bcrypt_rounds: int = 12
+    # bcrypt releases the GIL, so these threads hash in parallel off the event loop
+    password_hash_workers: int = 4
+    # Hashes allowed to wait for a worker; past that, login and register answer 503 at once
+    password_hash_queue_size: int = 16
+    
+    # Verified tokens kept so repeat requests skip signature checks
+    token_cache_size: int = 10000
+    
+    # Authenticated-user cache used by get_current_user
+    user_cache_size: int = 10000
+    # Also the longest another worker can serve a changed user from its own tier
+    user_cache_ttl: float = 60.0
+    # Shared tier across workers; unset keeps the cache in-process only
+    user_cache_redis_url: Optional[str] = None
     
     # Slack API
     slack_bot_token: Optional[str] = None
@@ -37,6 +76,9 @@ class Settings(BaseSettings):
     # ML/AI
     ml_model_path: str = "/app/models"
     openai_api_key: Optional[str] = None
+    ml_engine_url: str = "http://localhost:8001"
+    # Page views fall back to defaults rather than wait on a slow ml-engine
+    ml_engine_timeout: float = 0.25
     
     # CORS
     allowed_origins: List[str] = ["http://localhost:3000", "http://localhost:3001"]
@@ -45,6 +87,10 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
     
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+    
     class Config:
         env_file = ".env"
 
@@ -1,11 +1,25 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Tuple, Union, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min_rounds marks hashes made with fewer rounds for rehashing by verify_and_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+)
+
+# token -> (subject, expires_at) for tokens that passed verification; only
+# valid tokens are kept, so garbage tokens cannot fill it
+_verified_tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_verified_tokens_lock = threading.Lock()
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -21,17 +35,45 @@ def create_access_token(
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[str]:
+    claims = verify_token_claims(token)
+    return claims[0] if claims else None
+
+def verify_token_claims(token: str) -> Optional[Tuple[str, float]]:
+    """(subject, expiry timestamp) of a valid token, memoized until the token expires"""
+    now = time.time()
+    with _verified_tokens_lock:
+        claims = _verified_tokens.get(token)
+        if claims is not None:
+            if claims[1] > now:
+                _verified_tokens.move_to_end(token)
+                return claims
+            del _verified_tokens[token]
+    
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
         )
-        token_data = payload.get("sub")
-        return token_data
     except JWTError:
         return None
+    subject = payload.get("sub")
+    if subject is None:
+        return None
+    
+    # Tokens without an expiry are re-verified as often as cached users are refreshed
+    expires_at = float(payload["exp"]) if payload.get("exp") is not None else now + settings.user_cache_ttl
+    claims = (subject, expires_at)
+    with _verified_tokens_lock:
+        _verified_tokens[token] = claims
+        while len(_verified_tokens) > settings.token_cache_size:
+            _verified_tokens.popitem(last=False)
+    return claims
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Whether the password matches, and a new hash if the stored one uses outdated parameters"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
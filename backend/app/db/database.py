@@ -1,11 +1,34 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.database_url)
+pool_options = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+)
+
+# Synchronous engine for scripts, migrations and background jobs
+engine = create_engine(
+    settings.database_url,
+    connect_args={"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"},
+    **pool_options,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API, so queries never block the event loop
+async_engine = create_async_engine(
+    settings.async_database_url,
+    connect_args={"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}},
+    **pool_options,
+)
+# Objects stay readable after commit; responses are serialized after the endpoint commits
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -14,3 +37,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,267 @@
+import asyncio
+import itertools
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints.auth import get_current_user
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal, async_engine, pool_options
+from app.models.models import User
+from app.services.redis_backoff import RedisBackoff
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Zero when the replica has replayed everything it received, so an idle
+# primary does not make a caught-up replica look stale
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+CONNECTION_ERRORS = (OSError, SQLAlchemyError, asyncio.TimeoutError)
+
+
+def async_url(url: str) -> URL:
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        # NullPool (e.g. behind pgbouncer) keeps no connections to report
+        return {"class": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+class Replica:
+    """One read replica: its engine, and whether reads may currently be sent to it"""
+
+    def __init__(self, url: str):
+        parsed = async_url(url)
+        self.name = f"{parsed.host}:{parsed.port or 5432}/{parsed.database}"
+        self.engine = create_async_engine(
+            parsed,
+            connect_args={
+                "timeout": settings.db_replica_connect_timeout,
+                "server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)},
+            },
+            **pool_options,
+        )
+        self.sessionmaker = async_sessionmaker(self.engine, class_=AsyncSession, autoflush=False,
+                                               expire_on_commit=False)
+        self.healthy = True
+        self.retry_at = 0.0
+        self.lag_seconds: Optional[float] = None
+        self.failures = 0
+
+    @property
+    def available(self) -> bool:
+        # A failed replica gets another try once its back-off has passed
+        return self.healthy or time.monotonic() >= self.retry_at
+
+    def mark_down(self):
+        self.healthy = False
+        self.failures += 1
+        self.retry_at = time.monotonic() + settings.db_replica_check_interval
+
+
+class ReplicaRouter:
+    """Hands out read sessions, spread round-robin over healthy replicas.
+
+    A replica that cannot give a connection, or lags more than
+    ``db_replica_max_lag_seconds``, is skipped for ``db_replica_check_interval``;
+    with none available, reads fall back to the primary. Sessions for clients
+    that wrote recently always come from the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._cycle = itertools.count()
+        self._next_check = 0.0
+        self._check_task: Optional[asyncio.Task] = None
+        self.route_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"replica": 0, "primary": 0, "sticky": 0, "failover": 0}
+        )
+
+    async def session(self, route: str, sticky: bool = False) -> AsyncSession:
+        stats = self.route_stats[route]
+        if sticky:
+            stats["sticky"] += 1
+            return AsyncSessionLocal()
+        if not self.replicas:
+            stats["primary"] += 1
+            return AsyncSessionLocal()
+
+        self._maybe_check_lag()
+        candidates = [replica for replica in self.replicas if replica.available]
+        start = next(self._cycle)
+        for i in range(len(candidates)):
+            replica = candidates[(start + i) % len(candidates)]
+            session = replica.sessionmaker()
+            try:
+                # Check a connection out now (pre-ping included), so a dead
+                # replica fails here and not halfway through the endpoint
+                await session.connection()
+            except CONNECTION_ERRORS:
+                await session.close()
+                replica.mark_down()
+                continue
+            replica.healthy = True
+            stats["replica"] += 1
+            return session
+
+        stats["failover"] += 1
+        return AsyncSessionLocal()
+
+    def _maybe_check_lag(self):
+        now = time.monotonic()
+        if now < self._next_check or (self._check_task is not None and not self._check_task.done()):
+            return
+        self._next_check = now + settings.db_replica_check_interval
+        # Runs in the background; requests keep the current health view meanwhile
+        self._check_task = asyncio.create_task(self.check_lag())
+
+    async def check_lag(self):
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    replica.lag_seconds = float(await connection.scalar(REPLICA_LAG_QUERY))
+            except CONNECTION_ERRORS:
+                replica.mark_down()
+                continue
+            if replica.lag_seconds > settings.db_replica_max_lag_seconds:
+                replica.mark_down()
+            else:
+                replica.healthy = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "primary": {"pool": pool_stats(async_engine)},
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "available": replica.available,
+                    "lag_seconds": replica.lag_seconds,
+                    "failures": replica.failures,
+                    "pool": pool_stats(replica.engine),
+                }
+                for replica in self.replicas
+            ],
+            "routes": dict(self.route_stats),
+        }
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class PrimaryPins:
+    """Users whose reads stay on the primary for a while after they write.
+
+    Keyed by user id rather than anything the client must send back, so it
+    works for bearer-token clients. Each worker keeps its own pins; with
+    ``read_your_writes_redis_url`` set they are also shared through Redis, so
+    a read served by another worker sees them too.
+    """
+
+    def __init__(self, window_seconds: float = settings.read_your_writes_seconds,
+                 redis_url: Optional[str] = settings.read_your_writes_redis_url):
+        self.window_seconds = window_seconds
+        self._until: Dict[int, float] = {}
+        self._redis = None
+        self._redis_backoff = RedisBackoff()
+
+        if redis_url:
+            import redis.asyncio
+
+            self._redis = redis.asyncio.Redis.from_url(
+                redis_url, socket_connect_timeout=0.1, socket_timeout=0.1
+            )
+
+    async def pin(self, user_id: int):
+        now = time.time()
+        self._until[user_id] = now + self.window_seconds
+        if len(self._until) > 10000:
+            self._until = {key: until for key, until in self._until.items() if until > now}
+        if self._redis_available():
+            try:
+                await self._redis.set(self._redis_key(user_id), 1, px=int(self.window_seconds * 1000))
+            except Exception:
+                self._redis_backoff.failed()
+
+    async def pinned(self, user_id: int) -> bool:
+        if self._until.get(user_id, 0.0) > time.time():
+            return True
+        if self._redis_available():
+            try:
+                return bool(await self._redis.exists(self._redis_key(user_id)))
+            except Exception:
+                self._redis_backoff.failed()
+        return False
+
+    @staticmethod
+    def _redis_key(user_id: int) -> str:
+        return f"backend:primary-pin:{user_id}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and self._redis_backoff.available()
+
+
+replica_router = ReplicaRouter(settings.database_replica_urls)
+primary_pins = PrimaryPins()
+
+
+async def get_read_db(request: Request, current_user: User = Depends(get_current_user)):
+    """Session for read-only endpoints: a replica, or the primary for read-your-writes and failover"""
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    # The lookup is skipped without replicas, where every read hits the primary anyway
+    sticky = bool(replica_router.replicas) and await primary_pins.pinned(current_user.id)
+    db = await replica_router.session(route, sticky=sticky)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+class ReadYourWritesMiddleware:
+    """Pins a user's reads to the primary for a while after they write.
+
+    A successful unsafe request made by an authenticated user (whose id
+    ``get_current_user`` leaves in the request state) pins that user before
+    the response starts, so the client cannot read from a replica that has
+    not replayed its write yet.
+    """
+
+    def __init__(self, app, pins: PrimaryPins = primary_pins):
+        self.app = app
+        self.pins = pins
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_pinning(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                user_id = scope.get("state", {}).get("user_id")
+                if user_id is not None:
+                    await self.pins.pin(user_id)
+            await send(message)
+
+        await self.app(scope, receive, send_after_pinning)
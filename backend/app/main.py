@@ -2,6 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.db.database import async_engine
+from app.db.replicas import ReadYourWritesMiddleware, replica_router
+from app.services.ml_engine_service import ml_engine_service
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
 
 def create_application() -> FastAPI:
     app = FastAPI(
@@ -20,9 +25,42 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ReadYourWritesMiddleware)
 
     app.include_router(api_router, prefix="/api/v1")
 
+    @app.on_event("shutdown")
+    async def close_ml_engine_client():
+        await ml_engine_service.close()
+
+    @app.on_event("shutdown")
+    async def stop_user_cache():
+        await user_cache.close()
+
+    @app.on_event("shutdown")
+    async def stop_password_hasher():
+        password_hasher.shutdown()
+
+    @app.on_event("shutdown")
+    async def close_database_pools():
+        await replica_router.dispose()
+        await async_engine.dispose()
+
+    @app.get("/health/database", tags=["health"])
+    async def database_health():
+        """Replica health and lag, pool usage, and where each route's reads were served"""
+        return replica_router.stats()
+
+    @app.get("/health/user-cache", tags=["health"])
+    async def user_cache_health():
+        """Hit rate and size of the authenticated-user cache in this worker"""
+        return user_cache.stats()
+
+    @app.get("/health/password-hashing", tags=["health"])
+    async def password_hashing_health():
+        """Busy and queued bcrypt workers, and requests turned away with 503"""
+        return password_hasher.stats()
+
     return app
 
 app = create_application()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -20,7 +20,7 @@ class User(Base):
     
     # Relationships
     manager = relationship("User", remote_side=[id])
-    tasks = relationship("Task", back_populates="assignee")
+    tasks = relationship("Task", back_populates="assignee", foreign_keys="Task.assignee_id")
     achievements = relationship("Achievement", back_populates="user")
 
 class Task(Base):
@@ -80,3 +80,15 @@ class SlackActivity(Base):
     response_time = Column(Float)  # in seconds
     helpfulness_score = Column(Float)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class UserDashboardSummary(Base):
+    __tablename__ = "user_dashboard_summary"
+    
+    # Maintained by app.services.dashboard_summary as tasks, achievements and scores change
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_points = Column(Integer, nullable=False, default=0)
+    # Completed tasks per UTC day ("YYYY-MM-DD" -> count), last 30 days only
+    daily_completions = Column(JSON, nullable=False, default=dict)
+    performance_score = Column(Float)
+    collaboration_score = Column(Float)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,172 @@
+# Per-user dashboard totals, kept current as tasks, achievements and scores change
+# Importing this module registers the session hook that maintains them
+
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import Achievement, PerformanceMetric, Task, UserDashboardSummary
+
+WINDOW_DAYS = 30
+# PerformanceMetric names whose latest value is the score shown on the dashboard
+SCORE_METRICS = ("performance_score", "collaboration_score")
+# INSERT ... ON CONFLICT for the databases the backend runs on (Postgres; sqlite in tests)
+INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _day(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date().isoformat()
+
+
+def window_start(today: Optional[date] = None) -> date:
+    """First UTC day counted in the 30-day window, which includes today"""
+    return (today or datetime.utcnow().date()) - timedelta(days=WINDOW_DAYS - 1)
+
+
+def completions_in_window(summary: UserDashboardSummary) -> int:
+    start = window_start().isoformat()
+    return sum(count for day, count in (summary.daily_completions or {}).items() if day >= start)
+
+
+def build_summary(session: Session, user_id: int) -> UserDashboardSummary:
+    """A user's summary computed from the base tables; not added to the session"""
+    since = datetime.combine(window_start(), time.min)
+    total_points = session.scalar(
+        select(func.coalesce(func.sum(Achievement.points), 0)).where(Achievement.user_id == user_id)
+    )
+    completed_at = session.scalars(
+        select(Task.completed_at).where(
+            Task.assignee_id == user_id,
+            Task.status == "completed",
+            Task.completed_at >= since
+        )
+    )
+    scores = {
+        name: session.scalar(
+            select(PerformanceMetric.metric_value).where(
+                PerformanceMetric.user_id == user_id,
+                PerformanceMetric.metric_name == name
+            ).order_by(PerformanceMetric.created_at.desc(), PerformanceMetric.id.desc()).limit(1)
+        )
+        for name in SCORE_METRICS
+    }
+    return UserDashboardSummary(
+        user_id=user_id,
+        total_points=total_points,
+        daily_completions=dict(Counter(_day(value) for value in completed_at)),
+        **scores
+    )
+
+
+def ensure_summary(session: Session, user_id: int) -> UserDashboardSummary:
+    """A user's summary row, locked for update and created from the base tables if missing.
+
+    Two transactions may both find the row missing; the insert skips a row
+    the other one committed first, and the locking read then waits for it.
+    """
+    summary = session.get(UserDashboardSummary, user_id, with_for_update=True)
+    if summary is None:
+        built = build_summary(session, user_id)
+        insert = INSERTS[session.get_bind().dialect.name]
+        session.execute(
+            insert(UserDashboardSummary).values(
+                user_id=user_id,
+                total_points=built.total_points,
+                daily_completions=built.daily_completions,
+                performance_score=built.performance_score,
+                collaboration_score=built.collaboration_score
+            ).on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        summary = session.get(UserDashboardSummary, user_id, with_for_update=True)
+    return summary
+
+
+def _before(obj, key) -> Any:
+    # Value as loaded from the database, before this flush's changes
+    history = inspect(obj).attrs[key].history
+    values = history.deleted or history.unchanged
+    return values[0] if values else None
+
+
+def _completion(task: Task, before: bool = False) -> Optional[Tuple[int, str]]:
+    """(assignee, day) a task counts as completed for, or None"""
+    value = (lambda key: _before(task, key)) if before else (lambda key: getattr(task, key))
+    if value("status") != "completed" or value("completed_at") is None or value("assignee_id") is None:
+        return None
+    return value("assignee_id"), _day(value("completed_at"))
+
+
+def _points(achievement: Achievement, before: bool = False) -> Optional[Tuple[int, int]]:
+    value = (lambda key: _before(achievement, key)) if before else (lambda key: getattr(achievement, key))
+    if value("user_id") is None:
+        return None
+    return value("user_id"), value("points") or 0
+
+
+@event.listens_for(Session, "before_flush")
+def _update_summaries(session, flush_context, instances):
+    """Fold this flush's task, achievement and score changes into the affected summaries.
+
+    The summaries are written in the same transaction as the change itself.
+    A user without a summary row gets one built from the base tables first,
+    see ``ensure_summary``.
+    Bulk ``update()``/``delete()`` statements and raw SQL bypass the ORM and
+    are not seen; ``scripts/rebuild_dashboard_summary.py`` recomputes rows.
+    """
+    points: Dict[int, int] = defaultdict(int)
+    completions: Dict[int, Counter] = defaultdict(Counter)
+    scores: Dict[int, Dict[str, float]] = defaultdict(dict)
+
+    def move(old, new, apply):
+        if old != new:
+            if old is not None:
+                apply(old, -1)
+            if new is not None:
+                apply(new, 1)
+
+    def count_completion(key, sign):
+        completions[key[0]][key[1]] += sign
+
+    def count_points(key, sign):
+        points[key[0]] += sign * key[1]
+
+    for obj in session.new:
+        if isinstance(obj, Task):
+            move(None, _completion(obj), count_completion)
+        elif isinstance(obj, Achievement):
+            move(None, _points(obj), count_points)
+        elif isinstance(obj, PerformanceMetric) and obj.metric_name in SCORE_METRICS and obj.user_id is not None:
+            scores[obj.user_id][obj.metric_name] = obj.metric_value
+    for obj in session.dirty:
+        if isinstance(obj, Task):
+            move(_completion(obj, before=True), _completion(obj), count_completion)
+        elif isinstance(obj, Achievement):
+            move(_points(obj, before=True), _points(obj), count_points)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            move(_completion(obj, before=True), None, count_completion)
+        elif isinstance(obj, Achievement):
+            move(_points(obj, before=True), None, count_points)
+
+    user_ids = {user_id for user_id, delta in points.items() if delta}
+    user_ids |= {user_id for user_id, days in completions.items() if any(days.values())}
+    user_ids |= set(scores)
+    start = window_start().isoformat()
+    for user_id in user_ids:
+        # Locks the row, so concurrent changes for one user apply one after another
+        summary = ensure_summary(session, user_id)
+        summary.total_points = (summary.total_points or 0) + points.get(user_id, 0)
+        daily = Counter({day: count for day, count in (summary.daily_completions or {}).items() if day >= start})
+        for day, delta in completions.get(user_id, {}).items():
+            if day >= start:
+                daily[day] = max(0, daily[day] + delta)
+        # A new dict, so the JSON column is seen as changed
+        summary.daily_completions = {day: count for day, count in sorted(daily.items()) if count}
+        for name, value in scores.get(user_id, {}).items():
+            setattr(summary, name, value)
@@ -0,0 +1,42 @@
+# ml-engine client for the backend
+# Reads precomputed results; never asks ml-engine to compute on a page view
+
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+
+class MLEngineService:
+    """Client for the ml-engine API with a short timeout and no retries"""
+
+    def __init__(self, base_url: str = settings.ml_engine_url, timeout: float = settings.ml_engine_timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # One pooled client for the process, so lookups reuse connections
+        if self._client is None:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+        return self._client
+
+    async def get_recommendation_snapshot(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """The user's precomputed recommendations, or None if there is none or ml-engine is unavailable"""
+        try:
+            response = await self.client.get(f"/recommendations/snapshots/{user_id}")
+        except httpx.HTTPError:
+            return None
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+ml_engine_service = MLEngineService()
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import User
+from app.services.redis_backoff import RedisBackoff
+
+# The password hash is never needed after login, so it is kept out of the cache (and Redis)
+CACHED_COLUMNS = [column.key for column in User.__table__.columns if column.key != "hashed_password"]
+DATETIME_COLUMNS = {column.key for column in User.__table__.columns if isinstance(column.type, DateTime)}
+# Emails of changed users are published here so every worker drops them from its own tier
+INVALIDATION_CHANNEL = "backend:user-invalidations"
+
+UserData = Dict[str, Any]
+
+
+def _to_json(data: UserData) -> str:
+    return json.dumps({
+        key: value.isoformat() if key in DATETIME_COLUMNS and value is not None else value
+        for key, value in data.items()
+    })
+
+
+def _from_json(raw: bytes) -> Tuple[float, UserData]:
+    data = json.loads(raw)
+    expires_at = data.pop("_expires_at")
+    for key in DATETIME_COLUMNS:
+        if data.get(key) is not None:
+            data[key] = datetime.fromisoformat(data[key])
+    return expires_at, data
+
+
+class UserCache:
+    """Authenticated users by token subject (email), in-process LRU plus optional Redis.
+
+    An entry lives for ``user_cache_ttl`` at most, and never past the expiry
+    of the token that loaded it. Hits return a new, detached ``User`` built
+    from the cached columns: fine for reading, but endpoints that change the
+    user must load it into their own session. Committed ORM updates and
+    deletes of a user drop its entry here and in Redis, and are published
+    to every worker so a role change or deactivation applies everywhere at
+    once. A worker trusts its in-process tier only while it is subscribed to
+    those invalidations, and reads through to Redis otherwise. Without Redis
+    the cache is per worker, which suits a single worker only. Bulk
+    ``update()`` statements bypass the ORM and are not seen.
+    """
+
+    def __init__(self, max_size: int = settings.user_cache_size, ttl: float = settings.user_cache_ttl,
+                 redis_url: Optional[str] = settings.user_cache_redis_url):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self._entries: "OrderedDict[str, Tuple[float, UserData]]" = OrderedDict()
+        # Invalidation runs from session commit hooks, which sync sessions may fire off the event loop
+        self._lock = threading.Lock()
+        self._redis = None
+        self._subscriber = None
+        self._redis_backoff = RedisBackoff()
+        self._pending: Set[asyncio.Task] = set()
+        self._listener: Optional[asyncio.Task] = None
+        # Set while this worker is sure to hear every invalidation
+        self._subscribed = False
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        if redis_url:
+            import redis.asyncio
+
+            self._redis = redis.asyncio.Redis.from_url(
+                redis_url, socket_connect_timeout=0.1, socket_timeout=0.1
+            )
+            # No read timeout: the subscription waits indefinitely for messages
+            self._subscriber = redis.asyncio.Redis.from_url(redis_url, socket_connect_timeout=0.1)
+
+    async def get(self, email: str) -> Optional[User]:
+        now = time.time()
+        trusted = self._local_tier_trusted()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and entry[0] > now and trusted:
+                self._entries.move_to_end(email)
+                self.hits += 1
+                return User(**entry[1])
+            if entry is not None:
+                del self._entries[email]
+
+        if self._redis_available():
+            try:
+                raw = await self._redis.get(self._redis_key(email))
+            except Exception:
+                self._redis_backoff.failed()
+                raw = None
+            if raw is not None:
+                expires_at, data = _from_json(raw)
+                self._store_local(email, min(expires_at, now + self.ttl), data)
+                with self._lock:
+                    self.redis_hits += 1
+                return User(**data)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def put(self, user: User, token_expires_at: float):
+        data = {key: getattr(user, key) for key in CACHED_COLUMNS}
+        expires_at = min(time.time() + self.ttl, token_expires_at)
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return
+        self._store_local(user.email, expires_at, data)
+        if self._redis_available():
+            try:
+                await self._redis.set(self._redis_key(user.email), _to_json(dict(data, _expires_at=expires_at)),
+                                      px=max(1, int(ttl * 1000)))
+            except Exception:
+                self._redis_backoff.failed()
+
+    def invalidate(self, emails: Iterable[str]):
+        """Drop users from this worker's tier now, and from Redis and other workers in the background"""
+        emails = list(emails)
+        keys = [self._redis_key(email) for email in emails]
+        with self._lock:
+            for email in emails:
+                self._entries.pop(email, None)
+                self.invalidations += 1
+        if not keys or self._redis is None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync session outside the app (scripts, jobs): delete with a blocking client
+            self._delete_blocking(keys, emails)
+            return
+        task = loop.create_task(self._delete(keys, emails))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "redis_enabled": self._redis is not None,
+                "subscribed": self._subscribed,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            }
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _delete(self, keys, emails):
+        try:
+            await self._redis.delete(*keys)
+            await self._redis.publish(INVALIDATION_CHANNEL, json.dumps(emails))
+        except Exception:
+            self._redis_backoff.failed()
+
+    def _delete_blocking(self, keys, emails):
+        import redis
+
+        try:
+            client = redis.Redis.from_url(self.redis_url, socket_connect_timeout=0.1, socket_timeout=0.1)
+            try:
+                client.delete(*keys)
+                client.publish(INVALIDATION_CHANNEL, json.dumps(emails))
+            finally:
+                client.close()
+        except Exception:
+            self._redis_backoff.failed()
+
+    def _local_tier_trusted(self) -> bool:
+        if self._redis is None:
+            return True
+        if (self._listener is None or self._listener.done()) and self._redis_available():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return self._subscribed
+
+    async def _listen(self):
+        pubsub = self._subscriber.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    # Entries cached while unsubscribed may have missed an invalidation
+                    with self._lock:
+                        self._entries.clear()
+                    self._subscribed = True
+                elif message["type"] == "message":
+                    with self._lock:
+                        for email in json.loads(message["data"]):
+                            self._entries.pop(email, None)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._redis_backoff.failed()
+        finally:
+            self._subscribed = False
+            await pubsub.reset()
+
+    def _store_local(self, email: str, expires_at: float, data: UserData):
+        with self._lock:
+            self._entries[email] = (expires_at, data)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _redis_key(email: str) -> str:
+        return f"backend:user:{email}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and self._redis_backoff.available()
+
+
+user_cache = UserCache()
+
+
+# Changed users are collected per session and invalidated only once the change
+# is committed, so a rolled-back update leaves the cache alone
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target):
+    state = inspect(target)
+    emails = {target.email, *state.attrs.email.history.deleted}
+    state.session.info.setdefault("changed_user_emails", set()).update(
+        email for email in emails if email
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    emails = session.info.pop("changed_user_emails", None)
+    if emails:
+        user_cache.invalidate(emails)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_emails", None)
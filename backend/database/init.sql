@@ -68,11 +68,25 @@ CREATE TABLE IF NOT EXISTS slack_activities (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Create user_dashboard_summary table
+-- One row per user, kept current by the backend as tasks, achievements and
+-- scores change; rebuild with backend/scripts/rebuild_dashboard_summary.py
+CREATE TABLE IF NOT EXISTS user_dashboard_summary (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id),
+    total_points INTEGER NOT NULL DEFAULT 0,
+    daily_completions JSON NOT NULL DEFAULT '{}',
+    performance_score FLOAT,
+    collaboration_score FLOAT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
 CREATE INDEX IF NOT EXISTS idx_achievements_user ON achievements(user_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_created ON tasks(assignee_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_achievements_user_earned ON achievements(user_id, earned_at DESC);
 CREATE INDEX IF NOT EXISTS idx_performance_metrics_user ON performance_metrics(user_id);
 CREATE INDEX IF NOT EXISTS idx_slack_activities_user ON slack_activities(user_id);
 
@@ -80,3 +94,27 @@ CREATE INDEX IF NOT EXISTS idx_slack_activities_user ON slack_activities(user_id
 INSERT INTO users (email, hashed_password, first_name, last_name, role, department) VALUES
 ('demo@pragati.com', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewykJ2jSCfCIEm16', 'Demo', 'User', 'Senior Developer', 'Engineering')
 ON CONFLICT (email) DO NOTHING;
+
+-- Summaries for the users above
+INSERT INTO user_dashboard_summary (user_id, total_points, daily_completions, performance_score, collaboration_score)
+SELECT
+    u.id,
+    COALESCE((SELECT SUM(a.points) FROM achievements a WHERE a.user_id = u.id), 0),
+    COALESCE((
+        SELECT json_object_agg(d.day, d.completed)
+        FROM (
+            SELECT to_char(t.completed_at AT TIME ZONE 'UTC', 'YYYY-MM-DD') AS day, COUNT(*) AS completed
+            FROM tasks t
+            WHERE t.assignee_id = u.id AND t.status = 'completed'
+              AND t.completed_at >= (date_trunc('day', NOW() AT TIME ZONE 'UTC') - INTERVAL '29 days') AT TIME ZONE 'UTC'
+            GROUP BY 1
+        ) d
+    ), '{}'),
+    (SELECT m.metric_value FROM performance_metrics m
+     WHERE m.user_id = u.id AND m.metric_name = 'performance_score'
+     ORDER BY m.created_at DESC, m.id DESC LIMIT 1),
+    (SELECT m.metric_value FROM performance_metrics m
+     WHERE m.user_id = u.id AND m.metric_name = 'collaboration_score'
+     ORDER BY m.created_at DESC, m.id DESC LIMIT 1)
+FROM users u
+ON CONFLICT (user_id) DO NOTHING;
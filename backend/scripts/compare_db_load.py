@@ -0,0 +1,161 @@
+"""Compare backend throughput on the synchronous and the async database layer.
+
+Serves the dashboard two ways in one process, against the database
+configured in Settings:
+
+- ``sync``: the pre-migration pattern, an ``async def`` endpoint running its
+  queries on a synchronous Session from ``get_db``, so every query blocks the
+  event loop;
+- ``async``: the real dashboard endpoint on ``AsyncSession``.
+
+Concurrent clients drive each app on a single event loop, as one uvicorn
+worker would see them, and requests/sec and latency percentiles are
+reported. ``--slow-query-ms`` adds a ``pg_sleep`` to every request to stand
+in for one slow query.
+
+    python scripts/compare_db_load.py --concurrency 50 --seconds 20 --slow-query-ms 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.v1.endpoints import dashboard  # noqa: E402
+from app.api.v1.endpoints.auth import get_current_user  # noqa: E402
+from app.db.database import AsyncSessionLocal, get_async_db, get_db  # noqa: E402
+from app.models.models import Achievement, Task, User  # noqa: E402
+
+
+def build_sync_app(user: User, slow_query_ms: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/dashboard/")
+    async def sync_dashboard(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        if slow_query_ms:
+            db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": slow_query_ms / 1000})
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        recent_tasks = db.query(Task).filter(
+            Task.assignee_id == current_user.id,
+            Task.created_at >= thirty_days_ago
+        ).limit(5).all()
+        recent_achievements = db.query(Achievement).filter(
+            Achievement.user_id == current_user.id,
+            Achievement.earned_at >= thirty_days_ago
+        ).limit(5).all()
+        completed_tasks = db.query(Task).filter(
+            Task.assignee_id == current_user.id,
+            Task.status == "completed",
+            Task.completed_at >= thirty_days_ago
+        ).count()
+        total_points = sum([achievement.points for achievement in
+                            db.query(Achievement).filter(Achievement.user_id == current_user.id).all()])
+        return {
+            "tasks_completed": completed_tasks,
+            "achievement_points": total_points,
+            "recent_tasks": len(recent_tasks),
+            "recent_achievements": len(recent_achievements),
+        }
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    return app
+
+
+def build_async_app(user: User, slow_query_ms: float) -> FastAPI:
+    async def slow_query(db: AsyncSession = Depends(get_async_db)):
+        if slow_query_ms:
+            await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": slow_query_ms / 1000})
+
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/dashboard", dependencies=[Depends(slow_query)])
+    app.dependency_overrides[get_current_user] = lambda: user
+    return app
+
+
+async def load_user(email: Optional[str]) -> User:
+    async with AsyncSessionLocal() as db:
+        query = select(User).where(User.email == email) if email else select(User).where(User.is_active).limit(1)
+        user = (await db.execute(query)).scalars().first()
+    if user is None:
+        raise SystemExit("No matching active user to run the dashboard as; pass --email")
+    return user
+
+
+async def drive(app: FastAPI, concurrency: int, seconds: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://backend") as client:
+        # One warm-up request opens the pool and loads the mappers
+        (await client.get("/dashboard/")).raise_for_status()
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get("/dashboard/")
+                    response.raise_for_status()
+                except Exception:
+                    # With the sync layer this is typically a pool checkout timeout
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000 if latencies else None,
+    }
+
+
+async def main_async(args):
+    user = await load_user(args.email)
+    results = {}
+    for mode, build in (("sync", build_sync_app), ("async", build_async_app)):
+        if args.only and mode != args.only:
+            continue
+        results[mode] = await drive(build(user, args.slow_query_ms), args.concurrency, args.seconds)
+
+    print(f"{'mode':8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, result in results.items():
+        print(f"{mode:8} {result['requests']:>9} {result['errors']:>7} {result['requests_per_second']:>9.1f} "
+              f"{result['p50_ms'] or 0:>9.2f} {result['p99_ms'] or 0:>9.2f}")
+    if len(results) == 2 and results["sync"]["requests_per_second"]:
+        speedup = results["async"]["requests_per_second"] / results["sync"]["requests_per_second"]
+        print(f"async serves {speedup:.2f}x the requests/sec of sync")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10, help="Duration per mode")
+    parser.add_argument("--slow-query-ms", type=float, default=0, help="pg_sleep added to every request")
+    parser.add_argument("--email", help="User to load the dashboard for (default: any active user)")
+    parser.add_argument("--only", choices=["sync", "async"], help="Run one mode only")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
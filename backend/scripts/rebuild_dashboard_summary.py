@@ -0,0 +1,38 @@
+"""Recompute user_dashboard_summary rows from the base tables.
+
+The backend keeps summaries current as tasks, achievements and scores change
+through the ORM. Run this after loading data with raw SQL or bulk
+statements, which bypass that, or to backfill existing users.
+
+    python scripts/rebuild_dashboard_summary.py
+    python scripts/rebuild_dashboard_summary.py --user-id 42
+"""
+import argparse
+import os
+import sys
+
+from sqlalchemy import select
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal  # noqa: E402
+from app.models.models import User  # noqa: E402
+from app.services.dashboard_summary import build_summary  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, action="append", help="Only this user (repeatable)")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        user_ids = args.user_id or db.scalars(select(User.id).order_by(User.id)).all()
+        for user_id in user_ids:
+            # One transaction per user keeps each row lock short
+            db.merge(build_summary(db, user_id))
+            db.commit()
+    print(f"Rebuilt {len(user_ids)} dashboard summaries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Backend tests run on throwaway sqlite databases through aiosqlite, so no
+Postgres or Redis server is needed (pytest and aiosqlite are)."""
+import asyncio
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import security  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db import database, replicas  # noqa: E402
+from app.models.models import User  # noqa: E402
+from app.services.user_cache import user_cache  # noqa: E402
+
+
+def create_database(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def async_sessions(path: str):
+    # NullPool: TestClient runs each request on its own event loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    return async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def clean_process_state():
+    """Module singletons outlive a test; user ids repeat across test databases"""
+    yield
+    user_cache._entries.clear()
+    security._verified_tokens.clear()
+    replicas.primary_pins._until.clear()
+    replicas.replica_router.replicas = []
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Sync sessionmaker on a fresh primary database; the API's async sessions use the same file"""
+    path = str(tmp_path / "primary.db")
+    Session = create_database(path)
+    AsyncSessionLocal = async_sessions(path)
+    monkeypatch.setattr(database, "AsyncSessionLocal", AsyncSessionLocal)
+    monkeypatch.setattr(replicas, "AsyncSessionLocal", AsyncSessionLocal)
+    return Session
+
+
+@pytest.fixture
+def make_user(db):
+    def make(email="dev@pragati.com", role="Senior Developer", **fields):
+        with db() as session:
+            user = User(email=email, hashed_password="x", first_name="Dev", last_name="User", role=role,
+                        department="Engineering", **fields)
+            session.add(user)
+            session.commit()
+            return user.id
+    return make
+
+
+def auth_headers(email="dev@pragati.com"):
+    return {"Authorization": f"Bearer {create_access_token(subject=email)}"}
+
+
+@pytest.fixture
+def client(db):
+    """TestClient for an app with the given endpoint modules mounted at /<module name>"""
+    def build(*modules, middleware=()):
+        app = FastAPI()
+        for middleware_class in middleware:
+            app.add_middleware(middleware_class)
+        for module in modules:
+            app.include_router(module.router, prefix=f"/{module.__name__.rsplit('.', 1)[-1]}")
+
+        async def get_async_db():
+            async with database.AsyncSessionLocal() as session:
+                yield session
+
+        app.dependency_overrides[database.get_async_db] = get_async_db
+        return TestClient(app)
+    return build
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+
+from app.api.v1.endpoints import auth, dashboard
+from app.models.models import Achievement, PerformanceMetric, Task, UserDashboardSummary
+from app.services import dashboard_summary
+from app.services.dashboard_summary import build_summary, completions_in_window
+from conftest import auth_headers
+
+
+def task(user_id, status="completed", completed_at=None, **fields):
+    if status == "completed" and completed_at is None:
+        completed_at = datetime.utcnow()
+    return Task(title="Task", status=status, priority="low", assignee_id=user_id, created_by=user_id,
+                completed_at=completed_at, **fields)
+
+
+def achievement(user_id, points):
+    return Achievement(title="Award", category="task", level="gold", points=points, user_id=user_id)
+
+
+def summary(db, user_id):
+    with db() as session:
+        return session.get(UserDashboardSummary, user_id)
+
+
+def assert_matches_rebuild(db, user_id):
+    with db() as session:
+        stored = session.get(UserDashboardSummary, user_id)
+        built = build_summary(session, user_id)
+        assert stored.total_points == built.total_points
+        assert stored.daily_completions == built.daily_completions
+        assert stored.performance_score == built.performance_score
+
+
+def test_complete_and_uncomplete(db, make_user):
+    user_id = make_user()
+    with db() as session:
+        session.add_all([task(user_id), task(user_id), task(user_id, status="pending")])
+        session.commit()
+    assert completions_in_window(summary(db, user_id)) == 2
+
+    with db() as session:
+        pending = session.query(Task).filter_by(status="pending").one()
+        pending.status, pending.completed_at = "completed", datetime.utcnow()
+        done = session.query(Task).filter_by(status="completed").first()
+        done.status = "in_progress"
+        session.commit()
+    assert completions_in_window(summary(db, user_id)) == 2
+    assert_matches_rebuild(db, user_id)
+
+
+def test_reassign_and_delete(db, make_user):
+    first, second = make_user(), make_user(email="other@pragati.com")
+    with db() as session:
+        session.add_all([task(first), task(first)])
+        session.commit()
+    with db() as session:
+        moved, deleted = session.query(Task).all()
+        moved.assignee_id = second
+        session.delete(deleted)
+        session.commit()
+    assert completions_in_window(summary(db, first)) == 0
+    assert completions_in_window(summary(db, second)) == 1
+    assert_matches_rebuild(db, first)
+    assert_matches_rebuild(db, second)
+
+
+def test_window_edge(db, make_user):
+    user_id = make_user()
+    first_day = datetime.combine(dashboard_summary.window_start(), datetime.min.time())
+    with db() as session:
+        session.add_all([
+            task(user_id, completed_at=first_day),
+            task(user_id, completed_at=first_day - timedelta(seconds=1)),
+        ])
+        session.commit()
+    stored = summary(db, user_id)
+    assert list(stored.daily_completions) == [first_day.date().isoformat()]
+    assert completions_in_window(stored) == 1
+    assert_matches_rebuild(db, user_id)
+
+
+def test_achievement_points_and_scores(db, make_user):
+    user_id = make_user()
+    with db() as session:
+        session.add_all([achievement(user_id, 50), achievement(user_id, 25)])
+        session.add(PerformanceMetric(user_id=user_id, metric_name="performance_score", metric_value=87.5,
+                                      period_start=datetime.utcnow(), period_end=datetime.utcnow()))
+        session.commit()
+    assert summary(db, user_id).total_points == 75
+    assert summary(db, user_id).performance_score == 87.5
+
+    with db() as session:
+        changed, removed = session.query(Achievement).order_by(Achievement.id).all()
+        changed.points = 60
+        session.delete(removed)
+        session.commit()
+    assert summary(db, user_id).total_points == 60
+    assert_matches_rebuild(db, user_id)
+
+
+def test_missing_row_created_by_another_transaction_first(db, make_user, monkeypatch):
+    user_id = make_user()
+    with db() as session:
+        session.add(achievement(user_id, 10))
+        session.commit()
+    with db() as session:
+        session.query(UserDashboardSummary).delete()
+        session.commit()
+
+    def build_while_another_worker_inserts(session, user_id):
+        built = build_summary(session, user_id)
+        with db() as other:
+            other.add(build_summary(other, user_id))
+            other.commit()
+        return built
+
+    monkeypatch.setattr(dashboard_summary, "build_summary", build_while_another_worker_inserts)
+    with db() as session:
+        session.add(achievement(user_id, 5))
+        session.commit()
+    assert summary(db, user_id).total_points == 15
+
+
+def test_register_creates_summary(db, client):
+    api = client(auth)
+    response = api.post("/auth/register", json={
+        "email": "new@pragati.com", "password": "secret", "first_name": "New", "last_name": "User",
+        "role": "Developer", "department": "Engineering"
+    })
+    assert response.status_code == 200
+    stored = summary(db, response.json()["id"])
+    assert (stored.total_points, stored.daily_completions) == (0, {})
+
+
+def test_dashboard_persists_missing_summary(db, client, make_user):
+    user_id = make_user()
+    with db() as session:
+        session.add_all([task(user_id), achievement(user_id, 40)])
+        session.commit()
+        session.query(UserDashboardSummary).delete()
+        session.commit()
+
+    response = client(dashboard).get("/dashboard/", headers=auth_headers())
+    assert response.status_code == 200
+    assert (response.json()["tasks_completed"], response.json()["achievement_points"]) == (1, 40)
+    assert summary(db, user_id).total_points == 40
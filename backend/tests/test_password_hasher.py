@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.password_hasher import PasswordHasher
+from conftest import run
+
+
+def test_cancelled_call_keeps_its_slot_until_the_hash_finishes():
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_hash(password):
+        started.set()
+        finish.wait(5)
+        return f"hashed-{password}"
+
+    async def scenario():
+        hasher = PasswordHasher(workers=1, queue_size=0)
+        call = asyncio.ensure_future(hasher._run(slow_hash, "secret"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        # The thread is still hashing, so the pool is still full
+        assert hasher.in_flight == 1
+        with pytest.raises(HTTPException) as excinfo:
+            await hasher._run(slow_hash, "other")
+        assert excinfo.value.status_code == 503
+
+        finish.set()
+        for _ in range(100):
+            if hasher.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.stats()["in_flight"] == 0
+        assert hasher.stats()["completed"] == 1
+        assert await hasher._run(slow_hash, "again") == "hashed-again"
+        hasher.shutdown()
+    run(scenario())
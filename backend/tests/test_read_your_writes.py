@@ -0,0 +1,68 @@
+import time
+
+from app.api.v1.endpoints import tasks
+from app.db import replicas
+from app.models.models import User
+from conftest import async_sessions, auth_headers, create_database, run
+
+
+def use_replica(tmp_path):
+    """A replica on its own sqlite file, which never receives the primary's writes"""
+    path = str(tmp_path / "replica.db")
+    Session = create_database(path)
+    replica = replicas.Replica.__new__(replicas.Replica)
+    replica.name = "replica"
+    replica.sessionmaker = async_sessions(path)
+    replica.engine = replica.sessionmaker.kw["bind"]
+    replica.healthy, replica.retry_at, replica.lag_seconds, replica.failures = True, 0.0, None, 0
+    replicas.replica_router.replicas = [replica]
+    replicas.replica_router._next_check = float("inf")
+    return Session
+
+
+def replica_user(user_id, email):
+    return User(id=user_id, email=email, hashed_password="x", first_name="R", last_name="U",
+                role="Developer", department="Engineering")
+
+
+def new_task(title):
+    return {"title": title, "status": "pending", "priority": "low", "assignee_id": 1}
+
+
+def test_writer_reads_own_write_without_cookies(tmp_path, client, make_user):
+    make_user()
+    make_user(email="other@pragati.com")
+    replica = use_replica(tmp_path)
+    with replica() as session:
+        session.add_all([replica_user(1, "dev@pragati.com"), replica_user(2, "other@pragati.com")])
+        session.commit()
+    api = client(tasks, middleware=[replicas.ReadYourWritesMiddleware])
+
+    created = api.post("/tasks/", headers=auth_headers(), json=new_task("fresh"))
+    assert created.status_code == 200
+    assert "set-cookie" not in created.headers
+    api.cookies.clear()
+
+    # The writer is pinned to the primary and sees the task at once
+    assert api.get(f"/tasks/{created.json()['id']}", headers=auth_headers()).status_code == 200
+    # Everyone else still reads from the (lagging) replica
+    assert api.get(f"/tasks/{created.json()['id']}", headers=auth_headers("other@pragati.com")).status_code == 404
+
+
+def test_failed_writes_do_not_pin(tmp_path, client, make_user):
+    make_user()
+    use_replica(tmp_path)
+    api = client(tasks, middleware=[replicas.ReadYourWritesMiddleware])
+
+    assert api.put("/tasks/999", headers=auth_headers(), json=new_task("missing")).status_code == 404
+    assert not run(replicas.primary_pins.pinned(1))
+
+
+def test_pins_expire():
+    pins = replicas.PrimaryPins(window_seconds=0.05, redis_url=None)
+    run(pins.pin(7))
+    assert run(pins.pinned(7))
+    assert not run(pins.pinned(8))
+    time.sleep(0.06)
+    assert not run(pins.pinned(7))
+
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from app.models.models import User
+from app.services import user_cache as user_cache_module
+from app.services.user_cache import UserCache
+from conftest import run
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def cached_user(email="dev@pragati.com", role="Senior Developer"):
+    return User(id=1, email=email, hashed_password="x", first_name="Dev", last_name="User", role=role,
+                department="Engineering", is_active=True)
+
+
+def worker(server):
+    """A UserCache as one worker sees it, on a Redis shared with the other workers"""
+    cache = UserCache(max_size=10, ttl=60, redis_url=None)
+    cache.redis_url = "redis://fake"
+    cache._redis = fakeredis.aioredis.FakeRedis(server=server)
+    cache._subscriber = fakeredis.aioredis.FakeRedis(server=server)
+    return cache
+
+
+async def subscribed(*caches):
+    for cache in caches:
+        await cache.get("nobody@pragati.com")
+    for _ in range(100):
+        if all(cache._subscribed for cache in caches):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("invalidation listener never subscribed")
+
+
+def test_local_tier_without_redis():
+    async def scenario():
+        cache = UserCache(max_size=10, ttl=60, redis_url=None)
+        await cache.put(cached_user(), time.time() + 60)
+        assert (await cache.get("dev@pragati.com")).role == "Senior Developer"
+        cache.invalidate(["dev@pragati.com"])
+        assert await cache.get("dev@pragati.com") is None
+        assert cache.stats()["hits"] == 1
+    run(scenario())
+
+
+def test_invalidation_reaches_other_workers():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        first, second = worker(server), worker(server)
+        await subscribed(first, second)
+        await first.put(cached_user(), time.time() + 60)
+        assert (await second.get("dev@pragati.com")).role == "Senior Developer"
+        assert "dev@pragati.com" in second._entries
+
+        first.invalidate(["dev@pragati.com"])
+        await asyncio.gather(*first._pending)
+        for _ in range(100):
+            if "dev@pragati.com" not in second._entries:
+                break
+            await asyncio.sleep(0.01)
+        assert await second.get("dev@pragati.com") is None
+        await first.close()
+        await second.close()
+    run(scenario())
+
+
+def test_local_tier_not_trusted_until_subscribed():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        cache = worker(server)
+        cache._store_local("dev@pragati.com", time.time() + 60, {"email": "dev@pragati.com"})
+        # The first lookup starts the listener; until it is subscribed the lookup goes to Redis
+        assert await cache.get("dev@pragati.com") is None
+        await subscribed(cache)
+        assert "dev@pragati.com" not in cache._entries
+        await cache.close()
+    run(scenario())
+
+
+def test_commit_invalidates_changed_user(db, make_user, monkeypatch):
+    cache = UserCache(max_size=10, ttl=60, redis_url=None)
+    monkeypatch.setattr(user_cache_module, "user_cache", cache)
+    user_id = make_user()
+    run(cache.put(make_user_row(db, user_id), time.time() + 60))
+    with db() as session:
+        session.get(User, user_id).role = "Developer"
+        session.rollback()
+    assert "dev@pragati.com" in cache._entries
+    with db() as session:
+        session.get(User, user_id).role = "Developer"
+        session.commit()
+    assert "dev@pragati.com" not in cache._entries
+
+
+def make_user_row(db, user_id):
+    with db() as session:
+        user = session.get(User, user_id)
+        session.expunge(user)
+        return user
@@ -0,0 +1,77 @@
+import asyncio
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+from core.profiling import ADMIN_TOKEN, PROFILE_MAX_SECONDS, cpu_profiler, memory_profiler
+
+KEY_TYPES = "^(lineno|filename|traceback)$"
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Every admin endpoint needs the ML_ADMIN_TOKEN; with none configured, all are refused"""
+    if not ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+# Only mounted when ML_PROFILING_ENABLED is set
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.post("/profile/cpu", response_class=PlainTextResponse)
+async def cpu_profile(seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+                      interval_ms: float = Query(10, ge=1, le=1000)):
+    """Sample every thread of this worker for ``seconds`` and return collapsed stacks.
+
+    The output is one ``frame;frame;... count`` line per distinct stack, as
+    read by flamegraph.pl, speedscope and inferno. The worker keeps serving
+    traffic while it is sampled.
+    """
+    stacks, stats = await asyncio.to_thread(cpu_profiler.profile, seconds, interval_ms / 1000)
+    body = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+    return PlainTextResponse(body, headers={
+        "X-Profile-Samples": str(stats["samples"]),
+        "X-Profile-Seconds": f"{stats['seconds']:.3f}",
+    })
+
+@router.get("/memory")
+async def memory_status():
+    """Whether tracemalloc is tracing, how much it has traced, and the stored snapshots"""
+    return memory_profiler.status()
+
+@router.post("/memory/start")
+async def start_memory_tracing(frames: Optional[int] = Query(None, ge=1, le=100)):
+    """Start tracing allocations; allocation is slower until tracing is stopped"""
+    return memory_profiler.start(frames) if frames else memory_profiler.start()
+
+@router.post("/memory/stop")
+async def stop_memory_tracing():
+    """Stop tracing and drop stored snapshots"""
+    return memory_profiler.stop()
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(key_type: str = Query("lineno", regex=KEY_TYPES),
+                               limit: int = Query(25, ge=1, le=500)):
+    """Take a snapshot and return its largest allocation sites"""
+    snapshot_id = await asyncio.to_thread(memory_profiler.take_snapshot)
+    top = await asyncio.to_thread(memory_profiler.top, snapshot_id, key_type, limit)
+    return {"id": snapshot_id, "top": top}
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def memory_snapshot(snapshot_id: int, key_type: str = Query("lineno", regex=KEY_TYPES),
+                          limit: int = Query(25, ge=1, le=500)):
+    """Largest allocation sites of a stored snapshot"""
+    top = await asyncio.to_thread(memory_profiler.top, snapshot_id, key_type, limit)
+    return {"id": snapshot_id, "top": top}
+
+@router.get("/memory/diff")
+async def memory_diff(base: int, current: Optional[int] = None,
+                      key_type: str = Query("lineno", regex=KEY_TYPES),
+                      limit: int = Query(25, ge=1, le=500)):
+    """Allocation sites that grew most since snapshot ``base``.
+
+    Compares against snapshot ``current``, or a fresh snapshot when it is
+    omitted. ``key_type=traceback`` groups by full allocation stack, which
+    shows the model or request path behind the growth.
+    """
+    if current is None:
+        current = await asyncio.to_thread(memory_profiler.take_snapshot)
+    diff = await asyncio.to_thread(memory_profiler.diff, base, current, key_type, limit)
+    return {"base": base, "current": current, "diff": diff}
@@ -1,10 +1,53 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from models.ai_models import CollaborationAnalyzer
+from typing import List, Dict, Any, Optional
+import asyncio
+import json
+import os
+from core.batching import MicroBatcher
+from core.executor import executor
+from models.ai_models import CollaborationAggregate
+from models.registry import aget_model, get_model
 
 router = APIRouter()
-analyzer = CollaborationAnalyzer()
+
+# Activities folded per inference task by /analyze-stream; bounds its memory use
+STREAM_CHUNK_SIZE = int(os.getenv("COLLABORATION_STREAM_CHUNK_SIZE", "1000"))
+# Longest single NDJSON line accepted; a line is buffered whole until its newline arrives
+STREAM_MAX_LINE_BYTES = int(os.getenv("COLLABORATION_STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
+# Task functions run in the inference pool; they are module-level so they can
+# be pickled when the pool is a process pool
+def _analyze_activities(slack_activities: List[Dict[str, Any]]) -> Dict[str, float]:
+    analyzer = get_model("collaboration_analyzer")
+    features = analyzer.extract_features(slack_activities)
+    return analyzer.calculate_collaboration_score(features)
+
+def _aggregate_activities(slack_activities: List[Dict[str, Any]]) -> CollaborationAggregate:
+    features = get_model("collaboration_analyzer").extract_features(slack_activities)
+    return CollaborationAggregate.from_features(features)
+
+def _analyze_sentiments(message_texts: List[str]) -> List[float]:
+    return get_model("collaboration_analyzer").analyze_messages_sentiment(message_texts)
+
+def _analyzer_stats() -> Dict[str, Any]:
+    analyzer = get_model("collaboration_analyzer")
+    return {
+        "pid": os.getpid(),
+        "sentiment_cache": analyzer.sentiment_cache.stats(),
+        "sentiment_batching": analyzer.batching_stats.stats(),
+    }
+
+async def _run_sentiment_batch(message_texts: List[str]) -> List[float]:
+    return await executor.run(_analyze_sentiments, message_texts)
+
+# Concurrent /sentiment calls are coalesced into one batched forward pass
+sentiment_batcher = MicroBatcher(
+    _run_sentiment_batch,
+    max_batch_size=int(os.getenv("SENTIMENT_MICROBATCH_SIZE", "32")),
+    max_wait_ms=float(os.getenv("SENTIMENT_MICROBATCH_WAIT_MS", "5")),
+    router="collaboration",
+)
 
 class SlackMessage(BaseModel):
     message_text: str
@@ -22,23 +65,81 @@ class CollaborationResponse(BaseModel):
     communication: float
     teamwork: float
 
+class ActivityUpdateRequest(BaseModel):
+    slack_activities: List[Dict[str, Any]]
+
+class StateMergeRequest(BaseModel):
+    states: Dict[str, Dict[str, float]]
+
 @router.post("/analyze", response_model=CollaborationResponse)
 async def analyze_collaboration(request: CollaborationRequest):
     """Analyze collaboration patterns from Slack activities"""
     try:
-        features = analyzer.extract_features(request.slack_activities)
-        scores = analyzer.calculate_collaboration_score(features)
+        scores = await executor.run(_analyze_activities, request.slack_activities)
         
         return CollaborationResponse(**scores)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@router.post("/analyze-stream", response_model=CollaborationResponse)
+async def analyze_collaboration_stream(request: Request):
+    """Analyze collaboration from a newline-delimited JSON stream of Slack activities.
+    
+    Activities are folded into running totals chunk by chunk, so memory stays
+    bounded regardless of how many are sent; a line longer than
+    COLLABORATION_STREAM_MAX_LINE_BYTES is rejected with 413.
+    """
+    aggregate = CollaborationAggregate()
+    chunk: List[Dict[str, Any]] = []
+    pending = b""
+    
+    async def fold(activities: List[Dict[str, Any]]):
+        aggregate.merge(await executor.run(_aggregate_activities, activities))
+    
+    try:
+        async for data in request.stream():
+            *lines, pending = (pending + data).split(b"\n")
+            if len(pending) > STREAM_MAX_LINE_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"A line exceeds {STREAM_MAX_LINE_BYTES} bytes; send one activity per line"
+                )
+            for line in lines:
+                if line.strip():
+                    chunk.append(_parse_activity(line))
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    await fold(chunk)
+                    chunk = []
+        
+        if pending.strip():
+            chunk.append(_parse_activity(pending))
+        if chunk:
+            await fold(chunk)
+        
+        return CollaborationResponse(**aggregate.scores())
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+def _parse_activity(line: bytes) -> Dict[str, Any]:
+    try:
+        activity = json.loads(line)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Each line must be a JSON object")
+    if not isinstance(activity, dict):
+        raise HTTPException(status_code=400, detail="Each line must be a JSON object")
+    return activity
+
 @router.post("/sentiment")
 async def analyze_sentiment(message: SlackMessage):
     """Analyze sentiment of a single message"""
     try:
-        sentiment_score = analyzer.analyze_message_sentiment(message.message_text)
+        sentiment_score = await sentiment_batcher.submit(message.message_text)
         
         return {
             "message": message.message_text,
@@ -46,9 +147,66 @@ async def analyze_sentiment(message: SlackMessage):
             "sentiment_label": "positive" if sentiment_score > 0.1 else "negative" if sentiment_score < -0.1 else "neutral"
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sentiment analysis failed: {str(e)}")
 
+@router.post("/users/{user_id}/activities", response_model=CollaborationResponse)
+async def add_user_activities(user_id: str, request: ActivityUpdateRequest):
+    """Fold new activities into a user's running state and return the updated scores"""
+    try:
+        # Features are computed in the pool; the state itself lives in this
+        # process so every worker type updates the same store
+        delta = await executor.run(_aggregate_activities, request.slack_activities)
+        store = await aget_model("collaboration_state")
+        scores = await asyncio.to_thread(store.merge_user, user_id, delta)
+        
+        return CollaborationResponse(**scores)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"State update failed: {str(e)}")
+
+@router.get("/users/{user_id}/scores", response_model=CollaborationResponse)
+async def get_user_scores(user_id: str):
+    """Current collaboration scores from a user's running state"""
+    store = await aget_model("collaboration_state")
+    scores = store.scores(user_id)
+    if scores is None:
+        raise HTTPException(status_code=404, detail="No collaboration state for this user")
+    return CollaborationResponse(**scores)
+
+@router.get("/state")
+async def export_state(user_ids: Optional[List[str]] = Query(None)):
+    """Export running states so they can be merged into another shard"""
+    store = await aget_model("collaboration_state")
+    return {"states": store.export(user_ids)}
+
+@router.post("/state/merge")
+async def merge_state(request: StateMergeRequest):
+    """Merge states exported from another shard into this one"""
+    store = await aget_model("collaboration_state")
+    await asyncio.to_thread(store.merge, request.states)
+    return {"merged_users": len(request.states)}
+
+@router.get("/stats")
+async def collaboration_stats():
+    """Report sentiment cache, micro-batching and length-bucketing statistics for sizing.
+
+    The analyzer lives where inference runs. With a process pool each worker
+    has its own cache and batching counters, and these come from whichever
+    worker takes the request (its ``pid`` is included); the micro-batcher
+    runs in this process and covers all of them.
+    """
+    if executor.kind == "process":
+        stats = await executor.run(_analyzer_stats)
+    else:
+        await aget_model("collaboration_analyzer")
+        stats = _analyzer_stats()
+    return {**stats, "sentiment_batcher": sentiment_batcher.stats()}
+
 @router.get("/health")
 async def health_check():
     return {"status": "Collaboration analyzer is healthy"}
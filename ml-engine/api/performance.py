@@ -1,10 +1,20 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Any
-from models.ai_models import PerformancePredictor
+from typing import List, Dict, Any
+from core.executor import executor
+from models.registry import aget_model, get_model
 
 router = APIRouter()
-predictor = PerformancePredictor()
+
+def _predict_batch(users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    result = get_model("performance_predictor").predict_performance_batch(users)
+    return [
+        {"predicted_score": score, "confidence": confidence, "trend": trend}
+        for score, confidence, trend in zip(
+            result["predicted_score"].tolist(), result["confidence"].tolist(), result["trend"].tolist()
+        )
+    ]
 
 class PerformanceRequest(BaseModel):
     user_id: str
@@ -20,37 +30,46 @@ class PerformanceResponse(BaseModel):
     confidence: float
     trend: str
 
+class PerformanceBatchRequest(BaseModel):
+    users: List[PerformanceRequest]
+
+class PerformanceBatchItem(PerformanceResponse):
+    user_id: str
+
+class PerformanceBatchResponse(BaseModel):
+    predictions: List[PerformanceBatchItem]
+
 @router.post("/predict", response_model=PerformanceResponse)
 async def predict_performance(request: PerformanceRequest):
     """Predict future performance based on current metrics"""
     try:
-        user_data = request.dict()
-        predicted_score = predictor.predict_performance(user_data)
-        
-        # Calculate confidence based on data completeness
-        data_completeness = sum(1 for v in user_data.values() if v > 0) / len(user_data)
-        confidence = data_completeness * 100
-        
-        # Determine trend
-        current_avg = (request.tasks_completed * 2 + request.collaboration_score + 
-                      request.code_quality_score) / 4
-        
-        if predicted_score > current_avg:
-            trend = "improving"
-        elif predicted_score < current_avg:
-            trend = "declining"
-        else:
-            trend = "stable"
+        # Scored as a batch of one so single and batch predictions share one code path
+        prediction = (await executor.run(_predict_batch, [request.dict()]))[0]
         
-        return PerformanceResponse(
-            predicted_score=predicted_score,
-            confidence=confidence,
-            trend=trend
-        )
+        return PerformanceResponse(**prediction)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@router.post("/predict-batch", response_model=PerformanceBatchResponse)
+async def predict_performance_batch(request: PerformanceBatchRequest):
+    """Predict future performance for many users in one call, in input order"""
+    try:
+        users = [user.dict() for user in request.users]
+        predictions = await executor.run(_predict_batch, users)
+        
+        return PerformanceBatchResponse(predictions=[
+            PerformanceBatchItem(user_id=user["user_id"], **prediction)
+            for user, prediction in zip(users, predictions)
+        ])
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
 @router.post("/skills-assessment")
 async def assess_skills(user_data: Dict[str, Any]):
     """Assess user skills across different dimensions"""
@@ -73,6 +92,29 @@ async def assess_skills(user_data: Dict[str, Any]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Skills assessment failed: {str(e)}")
 
+@router.get("/model")
+async def model_info():
+    """Version of the trained model currently serving predictions"""
+    predictor = await aget_model("performance_predictor")
+    return {
+        "version": predictor.model_version,
+        "is_trained": predictor.is_trained,
+        "load_stats": predictor.load_stats,
+    }
+
+@router.get("/cache")
+async def prediction_cache_stats():
+    """Prediction cache size and hit rates"""
+    predictor = await aget_model("performance_predictor")
+    return predictor.prediction_cache.stats()
+
+@router.post("/reload")
+async def reload_model():
+    """Hot-load the latest published model without waiting for the periodic check"""
+    predictor = await aget_model("performance_predictor")
+    reloaded = await asyncio.to_thread(predictor.maybe_reload, True)
+    return {"reloaded": reloaded, "version": predictor.model_version}
+
 @router.get("/health")
 async def health_check():
     return {"status": "Performance predictor is healthy"}
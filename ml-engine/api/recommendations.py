@@ -1,10 +1,35 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict, Any
-from models.ai_models import RecommendationEngine
+from core.executor import executor
+from models.ai_models import rule_record
+from models.registry import aget_model, get_model
+from models.snapshots import SNAPSHOT_TABLES, refresh_snapshots
 
 router = APIRouter()
-engine = RecommendationEngine()
+
+def _generate(user_profile: Dict[str, Any], performance_data: Dict[str, Any]) -> Dict[str, Any]:
+    engine = get_model("recommendation_engine")
+    return {
+        'recommendations': engine.generate_recommendations(user_profile, performance_data),
+        **engine.identify_strengths_and_areas(performance_data),
+    }
+
+def _generate_cohort(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    engine = get_model("recommendation_engine")
+    records = [rule_record(member['user_profile'], member['performance_data']) for member in members]
+    results = engine.apply_rules(records, list(SNAPSHOT_TABLES))
+    return {
+        'rules_version': engine.rules_version,
+        'users': [
+            {'user_id': member['user_id'], **{table: results[table][i] for table in SNAPSHOT_TABLES}}
+            for i, member in enumerate(members)
+        ],
+    }
+
+def _refresh_snapshots(members: List[Dict[str, Any]]) -> Dict[str, Any]:
+    inputs = {member['user_id']: (member['user_profile'], member['performance_data']) for member in members}
+    return refresh_snapshots(get_model("recommendation_engine"), get_model("recommendation_snapshots"), inputs)
 
 class RecommendationRequest(BaseModel):
     user_profile: Dict[str, Any]
@@ -21,23 +46,37 @@ class RecommendationResponse(BaseModel):
     strengths: List[str]
     improvement_areas: List[str]
 
+class CohortMember(BaseModel):
+    user_id: str
+    user_profile: Dict[str, Any]
+    performance_data: Dict[str, Any] = {}
+
+class CohortRequest(BaseModel):
+    users: List[CohortMember]
+
+class CohortMemberResult(RecommendationResponse):
+    user_id: str
+    career_paths: List[Dict[str, Any]]
+    learning_recommendations: List[Dict[str, Any]]
+
+class CohortResponse(BaseModel):
+    rules_version: str
+    users: List[CohortMemberResult]
+
 @router.post("/generate", response_model=RecommendationResponse)
 async def generate_recommendations(request: RecommendationRequest):
     """Generate personalized recommendations for career growth"""
     try:
-        recommendations = engine.generate_recommendations(
-            request.user_profile, 
-            request.performance_data
-        )
-        
-        strengths_and_areas = engine.identify_strengths_and_areas(request.performance_data)
+        result = await executor.run(_generate, request.user_profile, request.performance_data)
         
         return RecommendationResponse(
-            recommendations=[Recommendation(**rec) for rec in recommendations],
-            strengths=strengths_and_areas['strengths'],
-            improvement_areas=strengths_and_areas['improvement_areas']
+            recommendations=[Recommendation(**rec) for rec in result['recommendations']],
+            strengths=result['strengths'],
+            improvement_areas=result['improvement_areas']
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Recommendation generation failed: {str(e)}")
 
@@ -45,36 +84,8 @@ async def generate_recommendations(request: RecommendationRequest):
 async def suggest_career_path(user_profile: Dict[str, Any]):
     """Suggest career progression paths"""
     try:
-        current_role = user_profile.get('role', '').lower()
-        skills = user_profile.get('skills', {})
-        experience = user_profile.get('years_experience', 0)
-        
-        # Simple career path suggestions based on current role and skills
-        career_paths = []
-        
-        if 'developer' in current_role:
-            if skills.get('leadership', 0) > 70:
-                career_paths.append({
-                    'title': 'Engineering Manager',
-                    'requirements': ['Leadership training', 'Project management skills'],
-                    'timeline': '1-2 years'
-                })
-            
-            if skills.get('technical', 0) > 85:
-                career_paths.append({
-                    'title': 'Senior/Principal Engineer',
-                    'requirements': ['Advanced technical skills', 'System design'],
-                    'timeline': '6 months - 1 year'
-                })
-        
-        if skills.get('innovation', 0) > 75:
-            career_paths.append({
-                'title': 'Technical Lead/Architect',
-                'requirements': ['System architecture', 'Technical mentoring'],
-                'timeline': '1-3 years'
-            })
-        
-        return {"career_paths": career_paths}
+        engine = await aget_model("recommendation_engine")
+        return {"career_paths": engine.suggest_career_paths([user_profile])[0]}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Career path suggestion failed: {str(e)}")
@@ -83,52 +94,59 @@ async def suggest_career_path(user_profile: Dict[str, Any]):
 async def suggest_learning_paths(user_profile: Dict[str, Any]):
     """Recommend learning resources based on skill gaps"""
     try:
-        skills = user_profile.get('skills', {})
-        role = user_profile.get('role', '').lower()
-        
-        learning_recommendations = []
-        
-        # Technical skills
-        if skills.get('technical', 0) < 70:
-            learning_recommendations.append({
-                'category': 'Technical Skills',
-                'resources': [
-                    'Advanced programming courses',
-                    'System design fundamentals',
-                    'Code review best practices'
-                ],
-                'priority': 'high'
-            })
-        
-        # Communication skills
-        if skills.get('communication', 0) < 60:
-            learning_recommendations.append({
-                'category': 'Communication',
-                'resources': [
-                    'Technical writing workshop',
-                    'Presentation skills course',
-                    'Active listening training'
-                ],
-                'priority': 'medium'
-            })
-        
-        # Leadership skills
-        if skills.get('leadership', 0) < 50 and 'senior' in role:
-            learning_recommendations.append({
-                'category': 'Leadership',
-                'resources': [
-                    'Leadership fundamentals',
-                    'Mentoring best practices',
-                    'Team management course'
-                ],
-                'priority': 'medium'
-            })
-        
-        return {"learning_recommendations": learning_recommendations}
+        engine = await aget_model("recommendation_engine")
+        return {"learning_recommendations": engine.suggest_learning_paths([user_profile])[0]}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Learning recommendation failed: {str(e)}")
 
+@router.post("/cohort", response_model=CohortResponse)
+async def generate_cohort_recommendations(request: CohortRequest):
+    """Evaluate every rule table for a whole cohort in one vectorized pass"""
+    try:
+        members = [member.dict() for member in request.users]
+        results = await executor.run(_generate_cohort, members)
+        
+        return CohortResponse(rules_version=results['rules_version'], users=results['users'])
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Cohort recommendation failed: {str(e)}")
+
+@router.post("/snapshots/refresh")
+async def refresh_recommendation_snapshots(request: CohortRequest):
+    """Recompute stored snapshots for the given users; unchanged inputs are skipped"""
+    try:
+        members = [member.dict() for member in request.users]
+        return await executor.run(_refresh_snapshots, members)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Snapshot refresh failed: {str(e)}")
+
+@router.get("/snapshots")
+async def snapshot_stats():
+    """Number of stored snapshots and the latest generation"""
+    store = await aget_model("recommendation_snapshots")
+    return store.stats()
+
+@router.get("/snapshots/{user_id}")
+async def get_recommendation_snapshot(user_id: str):
+    """Latest precomputed recommendations for a user, served from memory"""
+    store = await aget_model("recommendation_snapshots")
+    snapshot = store.get(user_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="No recommendation snapshot for this user")
+    return snapshot
+
+@router.get("/rules")
+async def rule_tables():
+    """The rule tables currently in effect and their version"""
+    engine = await aget_model("recommendation_engine")
+    return {"rules_version": engine.rules_version, "tables": engine.rule_definitions}
+
 @router.get("/health")
 async def health_check():
     return {"status": "Recommendation engine is healthy"}
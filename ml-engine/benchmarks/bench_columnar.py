@@ -0,0 +1,81 @@
+"""Benchmark columnar text feature extraction against the per-activity loop.
+
+Sentiment is excluded on both sides so only the text-derived columns are
+compared.
+
+    python benchmarks/bench_columnar.py --sizes 10000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.columnar import activities_to_columns, extract_text_features  # noqa: E402
+
+WORDS = ["thanks", "lgtm", "deploy", "is", "the", "build", "broken", "again", "can", "you", "review",
+         "on", "it", "great", "work", "why", "does", "this", "fail", "+1"]
+
+
+def make_activities(n: int, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    activities = []
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 30)))
+        text += rng.choice(["", "?", "!", "?!", "??"])
+        activities.append({"message_text": text, "response_time": rng.uniform(0, 7200)})
+    return activities
+
+
+def loop_features(slack_data: List[Dict]) -> np.ndarray:
+    """The per-activity extraction loop extract_features used before"""
+    features = []
+    for activity in slack_data:
+        text = activity.get('message_text', '')
+        features.append([
+            len(text),
+            activity.get('response_time', 0),
+            0.0,
+            len(text.split()),
+            text.count('?'),
+            text.count('!'),
+        ])
+    return np.array(features)
+
+
+def columnar_features(slack_data: List[Dict]) -> np.ndarray:
+    texts, response_times = activities_to_columns(slack_data)
+    return extract_text_features(texts, response_times)
+
+
+def best_of(fn, data, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'messages':>10} {'loop s':>10} {'columnar s':>11} {'speedup':>8}")
+    for size in args.sizes:
+        activities = make_activities(size)
+        assert np.allclose(loop_features(activities), columnar_features(activities), rtol=1e-6)
+        loop_seconds = best_of(loop_features, activities, args.repeats)
+        columnar_seconds = best_of(columnar_features, activities, args.repeats)
+        print(f"{size:>10} {loop_seconds:>10.3f} {columnar_seconds:>11.3f} {loop_seconds / columnar_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Benchmark every ml-engine model hot path and the API endpoints end to end.
+
+Runs fully offline: sentiment comes from the word-list ``lexicon`` backend,
+and the trained PerformancePredictor is fitted on synthetic data and
+published to a temporary model directory. Each case runs at several input
+sizes and reports p50/p99 latency, throughput and peak memory.
+
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --threshold 0.25
+
+With ``--baseline`` the exit status is 1 if any case's p50 latency or peak
+memory grew by more than the threshold.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import (  # noqa: E402
+    compare, environment, load_results, peak_memory, print_table, save_results, summarize, time_calls,
+)
+
+WORDS = ["thanks", "lgtm", "deploy", "is", "the", "build", "broken", "again", "can", "you", "review",
+         "on", "it", "great", "work", "why", "does", "this", "fail", "+1"]
+ROLES = ["Developer", "Senior Developer", "Tech Lead", "Designer"]
+
+
+def configure_environment(model_path: str, sentiment_backend: str):
+    """Must run before any ml-engine module is imported; they read settings at import"""
+    os.environ.update({
+        "SENTIMENT_BACKEND": sentiment_backend,
+        "ML_MODEL_PATH": model_path,
+        "ML_WARMUP_MODELS": "",
+        # No on-disk caches or state, so every run starts from the same place
+        "SENTIMENT_CACHE_PATH": "",
+        "COLLABORATION_STATE_PATH": "",
+        # Predictors keep the model they were constructed with, and score every
+        # call; the prediction cache has its own case
+        "MODEL_RELOAD_INTERVAL": "1e9",
+        "PREDICTION_CACHE_SIZE": "0",
+        "PREDICTION_CACHE_REDIS_URL": "",
+        "INFERENCE_POOL": "thread",
+    })
+
+
+def make_activities(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    activities = []
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 30)))
+        activities.append({
+            "message_text": text + rng.choice(["", "?", "!", "?!"]),
+            "response_time": rng.uniform(0, 7200),
+            "channel_id": f"C{rng.randint(1, 20)}",
+            "timestamp": "2024-01-01T00:00:00Z",
+        })
+    return activities
+
+
+def make_users(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [{
+        "user_id": f"user-{i}",
+        "tasks_completed": rng.randint(0, 40),
+        "achievement_points": rng.randint(0, 2000),
+        "collaboration_score": rng.uniform(0, 100),
+        "avg_task_completion_time": rng.uniform(1, 120),
+        "code_quality_score": rng.uniform(0, 100),
+        "peer_ratings": rng.uniform(0, 5),
+    } for i in range(n)]
+
+
+def make_profiles(n: int, rng: random.Random) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    profiles = []
+    for _ in range(n):
+        profiles.append(({"role": rng.choice(ROLES), "skills": ["python"]}, {
+            "collaboration_scores": {
+                "response_time": rng.uniform(0, 100), "teamwork": rng.uniform(0, 100),
+                "helpfulness": rng.uniform(0, 100), "communication": rng.uniform(0, 100),
+            },
+            "technical_score": rng.uniform(0, 100),
+            "task_completion_rate": rng.uniform(0, 100),
+            "code_quality_score": rng.uniform(0, 100),
+            "innovation_score": rng.uniform(0, 100),
+            "mentoring_score": rng.uniform(0, 100),
+        }))
+    return profiles
+
+
+def publish_trained_predictor(rng: random.Random, rows: int = 2000):
+    """Fit the predictor on synthetic history and publish it like the training job does"""
+    from models.ai_models import PERFORMANCE_FEATURES
+    from training.performance import publish, train
+
+    users = make_users(rows, rng)
+    features = np.array([[user[name] for name in PERFORMANCE_FEATURES] for user in users], dtype=float)
+    targets = np.clip(40 + features[:, 0] + features[:, 2] * 0.3 + np.array([rng.gauss(0, 5) for _ in users]), 0, 100)
+    model, _ = train(features, targets)
+    return publish(model, {"rows": rows, "synthetic": True})
+
+
+def build_cases(rng: random.Random) -> Dict[str, Callable[[int], Callable[[], Any]]]:
+    """Case name -> factory that builds the timed callable for one input size"""
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from models.ai_models import CollaborationAnalyzer, PerformancePredictor, RecommendationEngine, rule_record
+    from models.prediction_cache import PredictionCache
+
+    analyzer = CollaborationAnalyzer()
+    rule_based = PerformancePredictor()
+    publish_trained_predictor(rng)
+    trained = PerformancePredictor()
+    cached = PerformancePredictor()
+    cached.prediction_cache = PredictionCache(max_size=1_000_000, redis_url="")
+    assert not rule_based.is_trained and trained.is_trained
+    engine = RecommendationEngine()
+    client = TestClient(app)
+
+    def extract_features(size):
+        activities = make_activities(size, rng)
+
+        def run():
+            # Cold sentiment cache, so the model runs on every message
+            analyzer.sentiment_cache.clear()
+            return analyzer.extract_features(activities)
+        return run
+
+    def collaboration_score(size):
+        features = analyzer.extract_features(make_activities(size, rng))
+        return lambda: analyzer.calculate_collaboration_score(features)
+
+    def predict_each(predictor):
+        def factory(size):
+            users = make_users(size, rng)
+            return lambda: [predictor.predict_performance(user) for user in users]
+        return factory
+
+    def predict_batch(predictor):
+        def factory(size):
+            users = make_users(size, rng)
+            return lambda: predictor.predict_performance_batch(users)
+        return factory
+
+    def recommendations(size):
+        profiles = make_profiles(size, rng)
+        return lambda: [engine.generate_recommendations(profile, data) for profile, data in profiles]
+
+    def cohort(size):
+        records = [rule_record(profile, data) for profile, data in make_profiles(size, rng)]
+        return lambda: engine.apply_rules(records, ["recommendations", "strengths", "improvement_areas"])
+
+    def post(path, payload):
+        return lambda: client.post(path, json=payload).raise_for_status()
+
+    def api_analyze(size):
+        return post("/collaboration/analyze", {"user_id": "u1", "slack_activities": make_activities(size, rng)})
+
+    def api_cohort(size):
+        return post("/recommendations/cohort", {"users": [
+            {"user_id": f"user-{i}", "user_profile": profile, "performance_data": data}
+            for i, (profile, data) in enumerate(make_profiles(size, rng))
+        ]})
+
+    def api_predict(size):
+        # One request per user, as the backend calls it today
+        users = make_users(size, rng)
+
+        def run():
+            for user in users:
+                client.post("/performance/predict", json=user).raise_for_status()
+        return run
+
+    def api_predict_batch(size):
+        return post("/performance/predict-batch", {"users": make_users(size, rng)})
+
+    def api_recommendations(size):
+        profiles = make_profiles(size, rng)
+
+        def run():
+            for profile, data in profiles:
+                client.post("/recommendations/generate",
+                            json={"user_profile": profile, "performance_data": data}).raise_for_status()
+        return run
+
+    return {
+        "collaboration.extract_features": extract_features,
+        "collaboration.calculate_collaboration_score": collaboration_score,
+        "performance.predict_performance.rule_based": predict_each(rule_based),
+        "performance.predict_performance.trained": predict_each(trained),
+        "performance.predict_performance_batch.rule_based": predict_batch(rule_based),
+        "performance.predict_performance_batch.trained": predict_batch(trained),
+        "performance.predict_performance_batch.cached": predict_batch(cached),
+        "recommendations.generate_recommendations": recommendations,
+        "recommendations.apply_rules.cohort": cohort,
+        "api.collaboration.analyze": api_analyze,
+        "api.performance.predict": api_predict,
+        "api.performance.predict_batch": api_predict_batch,
+        "api.recommendations.generate": api_recommendations,
+        "api.recommendations.cohort": api_cohort,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Input sizes (messages, users or profiles per call)")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed calls per case and size")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Time budget per case and size")
+    parser.add_argument("--only", nargs="+", default=None, help="Run only cases starting with these prefixes")
+    parser.add_argument("--sentiment-backend", default="lexicon")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed fractional growth in p50 latency or peak memory")
+    args = parser.parse_args()
+
+    model_path = tempfile.mkdtemp(prefix="ml-engine-bench-")
+    configure_environment(model_path, args.sentiment_backend)
+    rng = random.Random(args.seed)
+    cases = build_cases(rng)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, factory in cases.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        for size in args.sizes:
+            fn = factory(size)
+            latencies = time_calls(fn, args.repeats, args.max_seconds)
+            results[f"{name}[{size}]"] = summarize(size, latencies, peak_memory(fn))
+
+    report = {"environment": environment(), "cases": results}
+    baseline = load_results(args.baseline) if args.baseline else None
+    if args.baseline and baseline is None:
+        print(f"Baseline {args.baseline} not found; nothing to compare against")
+    print_table(results, baseline["cases"] if baseline else None)
+
+    if args.output:
+        save_results(args.output, report)
+    if args.save_baseline:
+        save_results(args.save_baseline, report)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if baseline:
+        regressions = compare(results, baseline["cases"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} {regression['metric']}: "
+                  f"{regression['baseline']:.3f} -> {regression['current']:.3f} ({regression['change']:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
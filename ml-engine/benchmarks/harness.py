@@ -0,0 +1,112 @@
+"""Timing, memory and baseline-comparison helpers for the benchmark suite"""
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+# Changes smaller than these are timer and allocator noise, whatever their ratio
+NOISE_FLOOR = {"p50_ms": 0.05, "peak_memory_bytes": 64 * 1024}
+
+
+def time_calls(fn: Callable[[], Any], repeats: int, max_seconds: float, min_repeats: int = 5) -> List[float]:
+    """Latency of each call in seconds, after one untimed warm-up call.
+
+    Stops early once ``max_seconds`` is spent and ``min_repeats`` samples exist,
+    so slow cases at large sizes do not dominate the run.
+    """
+    fn()
+    latencies = []
+    budget_end = time.perf_counter() + max_seconds
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+        if len(latencies) >= min_repeats and time.perf_counter() > budget_end:
+            break
+    return latencies
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """Peak bytes allocated through Python and NumPy during one call.
+
+    Measured in a separate call so tracing overhead does not skew latencies.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(size: int, latencies: List[float], peak_bytes: int) -> Dict[str, Any]:
+    p50 = float(np.percentile(latencies, 50))
+    return {
+        "size": size,
+        "samples": len(latencies),
+        "p50_ms": p50 * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "mean_ms": float(np.mean(latencies)) * 1000,
+        "throughput_per_s": size / p50 if p50 > 0 else float("inf"),
+        "peak_memory_bytes": peak_bytes,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "argv": sys.argv[1:],
+    }
+
+
+def save_results(path: str, results: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(cases: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[Dict[str, Any]]:
+    """Cases whose p50 latency or peak memory grew by more than ``threshold`` (a fraction)"""
+    regressions = []
+    for key, current in cases.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None or after - before < floor:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append({
+                    "case": key, "metric": metric, "baseline": before, "current": after, "change": change,
+                })
+    return regressions
+
+
+def print_table(cases: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None):
+    print(f"{'case':<58} {'p50 ms':>10} {'p99 ms':>10} {'items/s':>12} {'peak MiB':>9} {'vs base':>8}")
+    for key, result in cases.items():
+        previous = (baseline or {}).get(key)
+        delta = ""
+        if previous and previous.get("p50_ms"):
+            delta = f"{(result['p50_ms'] - previous['p50_ms']) / previous['p50_ms']:+.0%}"
+        print(f"{key:<58} {result['p50_ms']:>10.3f} {result['p99_ms']:>10.3f} "
+              f"{result['throughput_per_s']:>12.0f} {result['peak_memory_bytes'] / 2 ** 20:>9.2f} {delta:>8}")
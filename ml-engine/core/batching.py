@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.metrics import observe_batch, observe_stage
+
+
+class MicroBatcher:
+    """Dynamic batching for concurrent single-item requests.
+
+    Callers ``submit`` one item and await its result. Items are collected until
+    ``max_batch_size`` are queued or ``max_wait_ms`` has passed since the first
+    one arrived, then the whole batch goes through ``handler`` in one call and
+    the results are fanned back out in order. The handler must return exactly
+    one result per item. With a ``router``, batch sizes and per-item queue
+    waits are also exported as the microbatch stage of that router.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0, latency_window: int = 1000,
+                 router: Optional[str] = None):
+        self.handler = handler
+        self.router = router
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self._started_at: Optional[float] = None
+        self.items = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.batch_sizes: Counter = Counter()
+        self._queue_wait_total = 0.0
+        self._latencies: deque = deque(maxlen=latency_window)
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._collector is None or self._collector.done() or self._collector.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.create_task(self._collect())
+            self._started_at = self._started_at or time.perf_counter()
+
+        future = loop.create_future()
+        submitted = time.perf_counter()
+        await self._queue.put((item, future, submitted))
+        try:
+            return await future
+        finally:
+            self._latencies.append(time.perf_counter() - submitted)
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Run batches concurrently so the next one can fill while this one
+            # is in the model; the inference pool bounds actual parallelism
+            task = asyncio.create_task(self._run_batch(batch))
+            # Hold a reference so the running batch is not garbage collected
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        dispatched = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_sizes[len(batch)] += 1
+        waits = [dispatched - submitted for _, _, submitted in batch]
+        self._queue_wait_total += sum(waits)
+        if self.router:
+            observe_batch(self.router, "microbatch", len(batch))
+            for wait in waits:
+                observe_stage(self.router, "microbatch_wait", wait)
+
+        try:
+            results = await self.handler([item for item, _, _ in batch])
+        except Exception as e:
+            self.failed_batches += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "items": self.items,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "avg_queue_wait_ms": self._queue_wait_total / self.items * 1000 if self.items else 0.0,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p99_ms": percentile(0.99),
+            "throughput_per_second": self.items / elapsed if elapsed else 0.0,
+        }
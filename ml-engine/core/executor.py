@@ -0,0 +1,156 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from core.metrics import count_failure, current_router, observe_stage
+
+INFERENCE_POOL = os.getenv("INFERENCE_POOL", "thread")  # "thread" or "process"
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "64"))
+INFERENCE_TIMEOUT = float(os.getenv("INFERENCE_TIMEOUT", "30"))
+
+
+def _timed_call(fn: Callable[..., Any], *args) -> Tuple[float, Any]:
+    """Runs in the pool: the task's start time alongside its result.
+
+    time.monotonic is system-wide, so the start time is comparable with the
+    submit time even when the task ran in another process.
+    """
+    return time.monotonic(), fn(*args)
+
+
+def _warm_up_worker(names: Tuple[str, ...]):
+    """Pool initializer: load models before the worker takes its first task"""
+    from models.registry import registry
+
+    for name in names:
+        try:
+            registry.get(name)
+        except Exception:
+            # An initializer error would break the whole pool; the first task retries the load
+            pass
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+class InferenceExecutor:
+    """Runs blocking model work in a worker pool so the event loop stays responsive.
+
+    At most ``workers + queue_size`` tasks are admitted at once; further
+    submissions fail fast with a 503. Tasks that do not finish within the
+    timeout fail with a 504. With a process pool, task functions and their
+    arguments must be picklable, and each worker process loads its own models
+    through the registry: ``warm_up`` loads them in every worker before it
+    takes a task, so the load is not charged to a request's timeout.
+    """
+
+    def __init__(self, kind: str = INFERENCE_POOL, workers: int = INFERENCE_WORKERS,
+                 queue_size: int = INFERENCE_QUEUE_SIZE, timeout: float = INFERENCE_TIMEOUT):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown inference pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self.warm_models: List[str] = []
+        self._warm_workers: List[Future] = []
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                # Forking a process that already holds torch threads can deadlock
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_up_worker, initargs=(tuple(self.warm_models),)
+                )
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return self._pool
+
+    def warm_up(self, names: List[str]):
+        """Start the worker processes and load ``names`` in each; a no-op for a thread pool.
+
+        One no-op task per worker is submitted at once, so the pool spawns
+        all its workers now rather than on demand.
+        """
+        if self.kind != "process":
+            return
+        self.warm_models = list(names)
+        pool = self._get_pool()
+        self._warm_workers = [pool.submit(_worker_ready) for _ in range(self.workers)]
+
+    def readiness(self) -> Dict[str, Any]:
+        warm = sum(1 for future in self._warm_workers if future.done() and not future.exception())
+        return {"ready": warm == len(self._warm_workers), "warm_workers": warm}
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        """Run ``fn(*args)`` in the pool and await its result"""
+        router = current_router.get()
+        if self._pending >= self.capacity:
+            self.rejected += 1
+            count_failure(router, "rejected")
+            raise HTTPException(status_code=503, detail="Inference queue is full",
+                                headers={"Retry-After": "1"})
+
+        loop = asyncio.get_running_loop()
+        # Only touched from the event loop, so no lock is needed
+        self._pending += 1
+        submitted = time.monotonic()
+        future = self._get_pool().submit(_timed_call, fn, *args)
+        # The slot is held until the work actually finishes, not just until the
+        # caller gives up, so the bound reflects real pool load
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+
+        try:
+            started, result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # Drops the task if it is still queued; a running task cannot be interrupted
+            future.cancel()
+            self.timed_out += 1
+            count_failure(router, "timed_out")
+            raise HTTPException(status_code=504, detail="Inference timed out")
+        except Exception:
+            count_failure(router, "error")
+            raise
+        observe_stage(router, "queue_wait", started - submitted)
+        return result
+
+    def _release(self):
+        self._pending -= 1
+        self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "timeout": self.timeout,
+            "in_flight": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+executor = InferenceExecutor()
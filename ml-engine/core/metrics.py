@@ -0,0 +1,145 @@
+import os
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from starlette.responses import JSONResponse
+
+# Set this (to an empty, per-deployment directory) when running several uvicorn
+# workers or a process inference pool, so /metrics aggregates every process
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+ROUTERS = ("collaboration", "performance", "recommendations")
+
+# Seconds: 100µs for a cached prediction up to a long transformer batch
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384)
+
+# Stages nest: feature_extraction includes the tokenization and forward_pass
+# of the messages it scores, and queue_wait is time before a pool task starts
+STAGE_SECONDS = Histogram(
+    "ml_engine_stage_seconds", "Time spent in one processing stage",
+    ["router", "stage"], buckets=LATENCY_BUCKETS,
+)
+BATCH_SIZE = Histogram(
+    "ml_engine_batch_size", "Items handed to a stage in one call",
+    ["router", "stage"], buckets=BATCH_BUCKETS,
+)
+REQUEST_SECONDS = Histogram(
+    "ml_engine_request_seconds", "End-to-end request latency",
+    ["router", "route", "method", "status"], buckets=LATENCY_BUCKETS,
+)
+INFERENCE_FAILURES = Counter(
+    "ml_engine_inference_failures_total", "Inference work that was rejected, timed out or failed",
+    ["router", "reason"],
+)
+
+# Router of the request being handled; read by code running on the event loop.
+# Model code runs in the inference pool and labels its stages explicitly.
+current_router: ContextVar[str] = ContextVar("current_router", default="other")
+
+
+def router_for_path(path: str) -> str:
+    prefix = path.lstrip("/").split("/", 1)[0]
+    return prefix if prefix in ROUTERS else "other"
+
+
+# Labelled children are looked up once; observing one is then a lock and two adds
+@lru_cache(maxsize=None)
+def _stage(router: str, stage: str):
+    return STAGE_SECONDS.labels(router, stage)
+
+
+@lru_cache(maxsize=None)
+def _batch(router: str, stage: str):
+    return BATCH_SIZE.labels(router, stage)
+
+
+def observe_stage(router: str, stage: str, seconds: float):
+    _stage(router, stage).observe(seconds)
+
+
+def observe_batch(router: str, stage: str, size: int):
+    _batch(router, stage).observe(size)
+
+
+def count_failure(router: str, reason: str, amount: int = 1):
+    INFERENCE_FAILURES.labels(router, reason).inc(amount)
+
+
+class timed:
+    """Context manager recording the time spent in its block as one stage observation"""
+
+    __slots__ = ("router", "stage", "started")
+
+    def __init__(self, router: str, stage: str):
+        self.router = router
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe_stage(self.router, self.stage, time.perf_counter() - self.started)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response that records body encoding as the serialization stage"""
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        observe_stage(current_router.get(), "serialization", time.perf_counter() - started)
+        return body
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware timing each request and tagging it with its router.
+
+    Requests are labelled with the matched route template rather than the raw
+    path, so path parameters do not create new series; unmatched paths share
+    one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        router = router_for_path(scope["path"])
+        token = current_router.set(router)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.labels(
+                router, getattr(route, "path", "unmatched"), scope["method"], str(status)
+            ).observe(time.perf_counter() - started)
+            current_router.reset(token)
+
+
+def render_metrics() -> bytes:
+    """Every metric in Prometheus text format, across processes in multiprocess mode"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
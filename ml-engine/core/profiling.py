@@ -0,0 +1,178 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException
+
+# Off by default: the admin router is not even mounted unless this is set
+PROFILING_ENABLED = os.getenv("ML_PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+ADMIN_TOKEN = os.getenv("ML_ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = float(os.getenv("ML_PROFILE_MAX_SECONDS", "60"))
+# Stack depth tracemalloc records per allocation; deeper shows which request path allocated
+TRACEMALLOC_FRAMES = int(os.getenv("ML_TRACEMALLOC_FRAMES", "25"))
+# Snapshots kept for diffing; the oldest is dropped beyond this
+MAX_SNAPSHOTS = 10
+
+# Allocations made by tracemalloc itself and the import machinery are noise
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def collapse_stack(frame, thread_name: str) -> str:
+    """One stack in collapsed (flamegraph.pl / speedscope) form, root first"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for the threads of this process.
+
+    A background thread reads every other thread's current stack at a fixed
+    interval and counts identical stacks; nothing is hooked into the
+    interpreter, so the profiled code runs unmodified and nothing remains
+    once the profile ends. Work running in a process inference pool is not
+    visible from here.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, interval: float) -> Tuple[Counter, Dict[str, Any]]:
+        if not self._lock.acquire(blocking=False):
+            raise HTTPException(status_code=409, detail="A CPU profile is already running")
+        try:
+            return self._sample(min(seconds, PROFILE_MAX_SECONDS), interval)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> Tuple[Counter, Dict[str, Any]]:
+        sampler = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks: Counter = Counter()
+        samples = 0
+        started = time.monotonic()
+        deadline = started + seconds
+
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == sampler:
+                    continue
+                if ident not in names:
+                    # Started during the profile
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stacks[collapse_stack(frame, names.get(ident, f"thread-{ident}"))] += 1
+            samples += 1
+            time.sleep(interval)
+
+        return stacks, {
+            "seconds": time.monotonic() - started,
+            "samples": samples,
+            "interval_ms": interval * 1000,
+            "stacks": len(stacks),
+        }
+
+
+def _stat_dict(stat) -> Dict[str, Any]:
+    result = {
+        "size_bytes": stat.size,
+        "count": stat.count,
+        "traceback": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+    }
+    if hasattr(stat, "size_diff"):
+        result["size_diff_bytes"] = stat.size_diff
+        result["count_diff"] = stat.count_diff
+    return result
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots kept in memory, so growth between two points can be diffed.
+
+    Tracing only runs between ``start`` and ``stop``; it slows allocation
+    noticeably while on.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[int, Tuple[float, tracemalloc.Snapshot]]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = TRACEMALLOC_FRAMES) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [
+                {"id": snapshot_id, "taken_at": taken_at}
+                for snapshot_id, (taken_at, _) in self._snapshots.items()
+            ]
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            "snapshots": snapshots,
+        }
+
+    def take_snapshot(self) -> int:
+        if not tracemalloc.is_tracing():
+            raise HTTPException(status_code=409, detail="Memory tracing is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots[snapshot_id] = (time.time(), snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def top(self, snapshot_id: int, key_type: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+        """Largest allocation sites in one snapshot"""
+        stats = self._get(snapshot_id).statistics(key_type)
+        return [_stat_dict(stat) for stat in stats[:limit]]
+
+    def diff(self, base_id: int, current_id: int, key_type: str = "lineno",
+             limit: int = 25) -> List[Dict[str, Any]]:
+        """Allocation sites that grew the most between two snapshots"""
+        stats = self._get(current_id).compare_to(self._get(base_id), key_type)
+        return [_stat_dict(stat) for stat in stats[:limit]]
+
+    def _get(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"No memory snapshot {snapshot_id}")
+        return entry[1]
+
+
+cpu_profiler = SamplingProfiler()
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,26 @@
+import time
+
+# Long enough that a Redis outage costs one connect timeout per interval,
+# not one per request
+REDIS_RETRY_SECONDS = 30.0
+
+
+class RedisBackoff:
+    """Circuit breaker for an optional Redis tier.
+
+    Redis only ever speeds things up here, so after an error the tier is
+    skipped for ``retry_seconds`` and callers fall back to what they would do
+    without it, instead of waiting on a timeout in every request.
+    """
+
+    def __init__(self, retry_seconds: float = REDIS_RETRY_SECONDS):
+        self.retry_seconds = retry_seconds
+        self.failures = 0
+        self._retry_at = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def failed(self):
+        self.failures += 1
+        self._retry_at = time.monotonic() + self.retry_seconds
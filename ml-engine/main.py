@@ -1,14 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, TimedJSONResponse, render_metrics
+
 app = FastAPI(
     title="Pragati ML Engine",
     description="AI/ML services for performance analysis and recommendations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=TimedJSONResponse,
 )
 
 # CORS middleware
@@ -19,13 +23,51 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so request latency includes CORS handling
+app.add_middleware(MetricsMiddleware)
 
 from api import collaboration, performance, recommendations
+from core.executor import executor
+from core.profiling import PROFILING_ENABLED
+from models.registry import registry
+
+# Models loaded in the background at startup; requests for any model not yet
+# loaded construct it on demand, so cheap endpoints never wait on the transformer
+WARMUP_MODELS = [
+    name.strip() for name in os.getenv(
+        "ML_WARMUP_MODELS", "performance_predictor,recommendation_engine,collaboration_analyzer"
+    ).split(",") if name.strip()
+]
+# A typo here would otherwise fail /ready forever; refuse to start instead
+try:
+    registry.validate(WARMUP_MODELS)
+except ValueError as e:
+    raise RuntimeError(f"Invalid ML_WARMUP_MODELS: {e}") from None
+# Models only ever used inside inference tasks; with a process pool this
+# process never runs one, so only the pool workers load them
+POOL_ONLY_MODELS = {"collaboration_analyzer"}
+LOCAL_WARMUP_MODELS = [
+    name for name in WARMUP_MODELS if executor.kind == "thread" or name not in POOL_ONLY_MODELS
+]
+
+@app.on_event("startup")
+async def warm_up_models():
+    registry.warm_up(LOCAL_WARMUP_MODELS)
+    executor.warm_up(WARMUP_MODELS)
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    executor.shutdown()
 
 app.include_router(collaboration.router, prefix="/collaboration", tags=["collaboration"])
 app.include_router(performance.router, prefix="/performance", tags=["performance"])
 app.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
 
+# Profiling endpoints exist only when enabled, so they cost nothing otherwise
+if PROFILING_ENABLED:
+    from api import admin
+    app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
 @app.get("/")
 async def root():
     return {"message": "Pragati ML Engine is running"}
@@ -34,6 +76,30 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness gate: 503 until every warm-up model has finished loading, here and in the pool workers"""
+    readiness = registry.readiness(LOCAL_WARMUP_MODELS)
+    pool = executor.readiness()
+    readiness["ready"] = readiness["ready"] and pool["ready"]
+    readiness["warm_workers"] = pool["warm_workers"]
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+@app.get("/models")
+async def model_stats():
+    """Per-model load state, load time and memory footprint"""
+    return registry.stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Stage latency, batch size and request histograms in Prometheus text format"""
+    return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+@app.get("/executor")
+async def executor_stats():
+    """Inference pool configuration and load"""
+    return executor.stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
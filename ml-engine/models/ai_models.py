@@ -1,55 +1,220 @@
+import copy
 import os
+import threading
+import time
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error
-from transformers import pipeline
-import pickle
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from core.metrics import count_failure, observe_batch, observe_stage, timed
+from models.columnar import activities_to_columns, extract_text_features
+from models.flat_forest import FlatForest
+from models.prediction_cache import PredictionCache, feature_keys
+from models.registry import get_model, process_memory
+from models.rules import compile_rule_tables, field_columns, load_rule_definitions, rules_version
+from models.sentiment_backends import SENTIMENT_BACKEND, backend_model_id, load_sentiment_backend
+from models.sentiment_batching import (
+    SENTIMENT_MAX_TOKENS, BatchingStats, WordTokenizer, plan_batches, split_messages,
+)
+from models.sentiment_cache import SentimentCache
+
+MODEL_PATH = os.getenv("ML_MODEL_PATH", "/app/models")
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "30"))
+
+SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+
+# Column order of the performance feature matrix
+PERFORMANCE_FEATURES = [
+    'tasks_completed',
+    'achievement_points',
+    'collaboration_score',
+    'avg_task_completion_time',
+    'code_quality_score',
+    'peer_ratings',
+]
 
 class CollaborationAnalyzer:
     """ML model for analyzing collaboration patterns from Slack data"""
     
-    def __init__(self):
-        self.sentiment_analyzer = pipeline("sentiment-analysis", 
-                                         model="cardiffnlp/twitter-roberta-base-sentiment-latest")
+    def __init__(self, batch_size: int = None, backend: str = None):
+        # Heavy libraries are imported on construction, not at module import,
+        # so the API can start accepting requests before they are loaded
+        from sklearn.ensemble import RandomForestRegressor
+        
+        self.backend = backend or SENTIMENT_BACKEND
+        self.sentiment_analyzer = load_sentiment_backend(SENTIMENT_MODEL, self.backend)
+        self.batch_size = batch_size or SENTIMENT_BATCH_SIZE
+        self.sentiment_cache = SentimentCache(backend_model_id(SENTIMENT_MODEL, self.backend))
+        # Token counts drive batching and chunking; backends without a subword
+        # tokenizer are measured in words
+        self.tokenizer = getattr(self.sentiment_analyzer, 'tokenizer', None) or WordTokenizer()
+        self.max_tokens = min(SENTIMENT_MAX_TOKENS, getattr(self.tokenizer, 'model_max_length', SENTIMENT_MAX_TOKENS))
+        self._split_tokenizers = threading.local()
+        self.batching_stats = BatchingStats()
         self.model = RandomForestRegressor(n_estimators=100, random_state=42)
         self.is_trained = False
     
+    def _split_tokenizer(self):
+        """This thread's own copy of the tokenizer, for splitting messages.
+        
+        A fast tokenizer keeps its truncation settings in Rust state. Splitting
+        (no truncation) on the pipeline's tokenizer while another pool thread
+        runs the pipeline (truncation on) fails with "Already borrowed".
+        """
+        tokenizer = getattr(self._split_tokenizers, 'tokenizer', None)
+        if tokenizer is None:
+            tokenizer = self._split_tokenizers.tokenizer = copy.deepcopy(self.tokenizer)
+        return tokenizer
+    
+    @staticmethod
+    def _sentiment_to_score(result: Dict) -> float:
+        """Convert a pipeline result to a numerical score (-1 to 1)"""
+        if result['label'] == 'POSITIVE':
+            return result['score']
+        elif result['label'] == 'NEGATIVE':
+            return -result['score']
+        else:  # NEUTRAL
+            return 0.0
+    
     def analyze_message_sentiment(self, message: str) -> float:
         """Analyze sentiment of a message"""
+        return self.analyze_messages_sentiment([message])[0]
+    
+    def analyze_messages_sentiment(self, messages: List[str], batch_size: int = None) -> List[float]:
+        """Analyze sentiment of many messages, running the model only on cache misses"""
+        scores = self.sentiment_cache.get_many(messages)
+        
+        # Repeated messages within one request share a single forward pass
+        pending: Dict[str, List[int]] = {}
+        for i, (message, score) in enumerate(zip(messages, scores)):
+            if score is None:
+                pending.setdefault(message, []).append(i)
+        
+        texts = list(pending)
+        computed = self._infer_sentiment(texts, batch_size or self.batch_size)
+        # Failed inferences are not cached so they get retried next time
+        succeeded = [(text, score) for text, score in zip(texts, computed) if score is not None]
+        self.sentiment_cache.put_many([text for text, _ in succeeded], [score for _, score in succeeded])
+        
+        for text, score in zip(texts, computed):
+            for i in pending[text]:
+                scores[i] = 0.0 if score is None else score
+        
+        return scores
+    
+    def _infer_sentiment(self, messages: List[str], batch_size: int) -> List[Optional[float]]:
+        """Run the sentiment model in length-bucketed batches; failed messages come back as None
+        
+        Messages are sorted into batches of similar token length so little
+        padding is computed, and messages over SENTIMENT_MAX_TOKENS are scored
+        chunk by chunk and averaged, weighted by chunk length.
+        """
         try:
-            result = self.sentiment_analyzer(message)[0]
-            # Convert to numerical score (-1 to 1)
-            if result['label'] == 'POSITIVE':
-                return result['score']
-            elif result['label'] == 'NEGATIVE':
-                return -result['score']
-            else:  # NEUTRAL
-                return 0.0
-        except:
-            return 0.0
+            with timed("collaboration", "tokenization"):
+                units, chunked = split_messages(messages, self._split_tokenizer(), self.max_tokens)
+        except Exception:
+            count_failure("collaboration", "sentiment_error", len(messages))
+            return [None] * len(messages)
+        self.batching_stats.record_request(len(messages), chunked, units, batch_size)
+        
+        # (score, tokens) of every successfully scored chunk, per message
+        chunk_scores: List[List[tuple]] = [[] for _ in messages]
+        for bound, batch in plan_batches(units, batch_size):
+            texts = [unit.text for unit in batch]
+            started = time.perf_counter()
+            try:
+                results = self.sentiment_analyzer(texts, batch_size=batch_size, truncation=True,
+                                                  max_length=self.max_tokens)
+                scores = [self._sentiment_to_score(result) for result in results]
+            except Exception:
+                # Fall back to one input at a time so a single bad message
+                # does not fail the whole batch
+                scores = []
+                for text in texts:
+                    try:
+                        scores.append(self._sentiment_to_score(
+                            self.sentiment_analyzer(text, truncation=True, max_length=self.max_tokens)[0]
+                        ))
+                    except Exception:
+                        scores.append(None)
+            elapsed = time.perf_counter() - started
+            self.batching_stats.record_batch(bound, batch, elapsed)
+            observe_stage("collaboration", "forward_pass", elapsed)
+            observe_batch("collaboration", "forward_pass", len(batch))
+            if None in scores:
+                count_failure("collaboration", "sentiment_error", scores.count(None))
+            for unit, score in zip(batch, scores):
+                if score is not None:
+                    chunk_scores[unit.message].append((score, unit.tokens))
+        
+        return [self._combine_chunk_scores(chunks) for chunks in chunk_scores]
+    
+    @staticmethod
+    def _combine_chunk_scores(chunks: List[tuple]) -> Optional[float]:
+        """Token-weighted mean of (score, tokens) pairs; None if every chunk failed"""
+        if not chunks:
+            return None
+        if len(chunks) == 1:
+            return chunks[0][0]
+        scores, tokens = zip(*chunks)
+        return float(np.average(scores, weights=tokens))
     
     def extract_features(self, slack_data: List[Dict]) -> np.ndarray:
         """Extract features from Slack activity data"""
-        features = []
-        
-        for activity in slack_data:
-            feature_vector = [
-                len(activity.get('message_text', '')),  # Message length
-                activity.get('response_time', 0),  # Response time
-                self.analyze_message_sentiment(activity.get('message_text', '')),  # Sentiment
-                len(activity.get('message_text', '').split()),  # Word count
-                activity.get('message_text', '').count('?'),  # Questions asked
-                activity.get('message_text', '').count('!'),  # Exclamations
-            ]
-            features.append(feature_vector)
-        
-        return np.array(features)
+        observe_batch("collaboration", "feature_extraction", len(slack_data))
+        with timed("collaboration", "feature_extraction"):
+            texts, response_times = activities_to_columns(slack_data)
+            sentiments = self.analyze_messages_sentiment(texts)
+            return extract_text_features(texts, response_times, sentiments)
     
     def calculate_collaboration_score(self, features: np.ndarray) -> Dict[str, float]:
         """Calculate collaboration metrics"""
+        with timed("collaboration", "scoring"):
+            return CollaborationAggregate.from_features(features).scores()
+
+class CollaborationAggregate:
+    """Running totals that fully determine the collaboration scores.
+    
+    Every score in calculate_collaboration_score is a mean or a count over the
+    feature matrix, so these sums can be folded chunk by chunk (or message by
+    message) and merged across shards without keeping the matrix around.
+    """
+    
+    __slots__ = ('count', 'response_time_sum', 'sentiment_sum', 'word_count_sum', 'question_messages')
+    
+    def __init__(self, count: int = 0, response_time_sum: float = 0.0, sentiment_sum: float = 0.0,
+                 word_count_sum: float = 0.0, question_messages: int = 0):
+        self.count = count
+        self.response_time_sum = response_time_sum
+        self.sentiment_sum = sentiment_sum
+        self.word_count_sum = word_count_sum
+        self.question_messages = question_messages
+    
+    @classmethod
+    def from_features(cls, features: np.ndarray) -> 'CollaborationAggregate':
+        aggregate = cls()
+        aggregate.update(features)
+        return aggregate
+    
+    def update(self, features: np.ndarray):
+        """Fold a feature matrix (extract_features layout) into the totals"""
         if len(features) == 0:
+            return
+        self.count += len(features)
+        self.response_time_sum += float(np.sum(features[:, 1], dtype=np.float64))
+        self.sentiment_sum += float(np.sum(features[:, 2], dtype=np.float64))
+        self.word_count_sum += float(np.sum(features[:, 3], dtype=np.float64))
+        self.question_messages += int(np.count_nonzero(features[:, 4] > 0))
+    
+    def merge(self, other: 'CollaborationAggregate'):
+        self.count += other.count
+        self.response_time_sum += other.response_time_sum
+        self.sentiment_sum += other.sentiment_sum
+        self.word_count_sum += other.word_count_sum
+        self.question_messages += other.question_messages
+    
+    def scores(self) -> Dict[str, float]:
+        """Calculate collaboration metrics"""
+        if self.count == 0:
             return {
                 'response_time': 50.0,
                 'helpfulness': 50.0,
@@ -58,19 +223,18 @@ class CollaborationAnalyzer:
             }
         
         # Response time score (inverse of average response time, normalized)
-        avg_response_time = np.mean(features[:, 1])
+        avg_response_time = self.response_time_sum / self.count
         response_score = max(0, 100 - (avg_response_time / 3600) * 10)  # Penalize slow responses
         
         # Helpfulness score (based on question answering patterns)
-        questions_answered = np.sum(features[:, 4] > 0)
-        helpfulness_score = min(100, (questions_answered / len(features)) * 100)
+        helpfulness_score = min(100, (self.question_messages / self.count) * 100)
         
         # Communication score (based on sentiment and engagement)
-        avg_sentiment = np.mean(features[:, 2])
+        avg_sentiment = self.sentiment_sum / self.count
         communication_score = 50 + (avg_sentiment * 50)  # Convert to 0-100 scale
         
         # Teamwork score (composite metric)
-        avg_word_count = np.mean(features[:, 3])
+        avg_word_count = self.word_count_sum / self.count
         teamwork_score = min(100, (avg_word_count / 20) * 50 + communication_score * 0.5)
         
         return {
@@ -83,9 +247,64 @@ class CollaborationAnalyzer:
 class PerformancePredictor:
     """ML model for predicting future performance"""
     
+    ARTIFACT_NAME = 'performance_predictor'
+    
     def __init__(self):
+        from sklearn.ensemble import RandomForestRegressor
+        
         self.model = RandomForestRegressor(n_estimators=100, random_state=42)
         self.is_trained = False
+        self.model_version = None
+        self.load_stats = None
+        self.prediction_cache = PredictionCache()
+        self._next_reload_check = 0.0
+        self.maybe_reload()
+    
+    def maybe_reload(self, force: bool = False) -> bool:
+        """Hot-load the latest trained artifact if a new version has been published.
+        
+        The LATEST marker is checked at most every MODEL_RELOAD_INTERVAL seconds,
+        so this is cheap enough to call before every prediction.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_reload_check:
+            return False
+        self._next_reload_check = now + MODEL_RELOAD_INTERVAL
+        
+        version = latest_model_version(self.ARTIFACT_NAME)
+        if version is None or version == self.model_version:
+            return False
+        
+        rss_before = process_memory()
+        started = time.perf_counter()
+        try:
+            model = self._load_artifact(version)
+        except Exception:
+            # Keep serving the current model if the new artifact is unreadable
+            model = None
+        if model is None:
+            return False
+        
+        self.model = model
+        self.model_version = version
+        self.is_trained = True
+        # Entries are keyed by version already; drop the old model's to free the space
+        self.prediction_cache.clear()
+        rss_after = process_memory()
+        self.load_stats = {
+            'load_seconds': time.perf_counter() - started,
+            'memory_mapped': isinstance(model, FlatForest),
+            'rss_delta_bytes': rss_after['rss_bytes'] - rss_before['rss_bytes'],
+            **rss_after,
+        }
+        return True
+    
+    def _load_artifact(self, version: str):
+        """Memory-map a flattened forest; older pickled artifacts are still readable"""
+        forest_dir = os.path.join(MODEL_PATH, self.ARTIFACT_NAME, version, 'forest')
+        if os.path.isdir(forest_dir):
+            return FlatForest.load(forest_dir, mmap_mode='r')
+        return load_model(f'{self.ARTIFACT_NAME}/{version}/model.pkl')
     
     def prepare_features(self, user_data: Dict) -> np.ndarray:
         """Prepare features for performance prediction"""
@@ -101,6 +320,7 @@ class PerformancePredictor:
     
     def predict_performance(self, user_data: Dict) -> float:
         """Predict user's future performance score"""
+        self.maybe_reload()
         if not self.is_trained:
             # Use rule-based approach if model isn't trained
             return self._rule_based_prediction(user_data)
@@ -124,105 +344,176 @@ class PerformancePredictor:
         
         total_score = base_score + tasks_bonus + points_bonus + collab_bonus
         return min(100, max(0, total_score))
-
-class RecommendationEngine:
-    """AI engine for generating personalized recommendations"""
-    
-    def __init__(self):
-        self.collaboration_analyzer = CollaborationAnalyzer()
-        self.performance_predictor = PerformancePredictor()
     
-    def generate_recommendations(self, user_profile: Dict, performance_data: Dict) -> List[Dict]:
-        """Generate personalized recommendations"""
-        recommendations = []
-        
-        # Analyze collaboration patterns
-        collab_scores = performance_data.get('collaboration_scores', {})
-        
-        # Low response time recommendation
-        if collab_scores.get('response_time', 100) < 70:
-            recommendations.append({
-                'title': 'Improve Response Time',
-                'description': 'Consider setting up notifications for important channels and responding within 2 hours during work hours.',
-                'priority': 'high',
-                'category': 'communication'
-            })
-        
-        # Low collaboration score recommendation
-        if collab_scores.get('teamwork', 100) < 60:
-            recommendations.append({
-                'title': 'Enhance Team Collaboration',
-                'description': 'Participate more actively in team discussions and offer help to colleagues.',
-                'priority': 'medium',
-                'category': 'collaboration'
-            })
-        
-        # Technical skills recommendation
-        if performance_data.get('technical_score', 100) < 80:
-            recommendations.append({
-                'title': 'Expand Technical Skills',
-                'description': 'Consider learning new technologies relevant to your role and current projects.',
-                'priority': 'medium',
-                'category': 'technical'
-            })
-        
-        # Leadership potential
-        if collab_scores.get('helpfulness', 0) > 85 and user_profile.get('role') == 'Senior Developer':
-            recommendations.append({
-                'title': 'Consider Leadership Training',
-                'description': 'Your helpfulness scores suggest leadership potential. Consider mentoring or leadership programs.',
-                'priority': 'low',
-                'category': 'career'
-            })
-        
-        return recommendations
+    def prepare_features_batch(self, users: List[Dict]) -> np.ndarray:
+        """Prepare an N×6 feature matrix in input order; missing values are NaN"""
+        return np.array(
+            [[user.get(name) for name in PERFORMANCE_FEATURES] for user in users], dtype=float
+        ).reshape(len(users), len(PERFORMANCE_FEATURES))
     
-    def identify_strengths_and_areas(self, performance_data: Dict) -> Dict[str, List[str]]:
-        """Identify strengths and improvement areas"""
-        strengths = []
-        improvement_areas = []
-        
-        collab_scores = performance_data.get('collaboration_scores', {})
-        
-        # Identify strengths
-        if collab_scores.get('communication', 0) > 85:
-            strengths.append('Excellent Communication Skills')
+    def predict_performance_batch(self, users: List[Dict]) -> Dict[str, np.ndarray]:
+        """Predict score, confidence and trend for many users in one vectorized pass
         
-        if performance_data.get('task_completion_rate', 0) > 90:
-            strengths.append('High Task Completion Rate')
+        Results are cached per feature vector and model version, so repeated
+        polls with unchanged inputs skip the model entirely.
+        """
+        self.maybe_reload()
+        observe_batch("performance", "predict", len(users))
+        with timed("performance", "feature_extraction"):
+            raw = self.prepare_features_batch(users)
+        keys = feature_keys(raw, self.model_version or 'rule-based')
+        predictions = self.prediction_cache.get_many(keys)
         
-        if collab_scores.get('helpfulness', 0) > 80:
-            strengths.append('Team Collaboration')
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if missing:
+            computed = self._predict_features(raw[missing])
+            fresh = list(zip(computed['predicted_score'].tolist(), computed['confidence'].tolist(),
+                             computed['trend'].tolist()))
+            self.prediction_cache.put_many([keys[i] for i in missing], fresh)
+            for i, prediction in zip(missing, fresh):
+                predictions[i] = prediction
         
-        if performance_data.get('code_quality_score', 0) > 85:
-            strengths.append('Code Quality & Best Practices')
-        
-        # Identify improvement areas
-        if collab_scores.get('response_time', 100) < 70:
-            improvement_areas.append('Response Time to Messages')
+        return {
+            'predicted_score': np.array([prediction[0] for prediction in predictions], dtype=float),
+            'confidence': np.array([prediction[1] for prediction in predictions], dtype=float),
+            'trend': np.array([prediction[2] for prediction in predictions], dtype=str),
+        }
+    
+    def _predict_features(self, raw: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score a feature matrix with NaN for missing values"""
+        features = np.nan_to_num(raw, nan=0.0)
         
-        if performance_data.get('innovation_score', 100) < 60:
-            improvement_areas.append('Innovation & Creative Problem Solving')
+        observe_batch("performance", "forward_pass", len(raw))
+        with timed("performance", "forward_pass"):
+            if self.is_trained:
+                predicted = np.clip(self.model.predict(features), 0, 100)
+            else:
+                predicted = self._rule_based_prediction_batch(raw)
         
-        if performance_data.get('mentoring_score', 100) < 50:
-            improvement_areas.append('Mentoring Junior Team Members')
+        with timed("performance", "scoring"):
+            # Confidence based on data completeness
+            confidence = np.mean(features > 0, axis=1) * 100
+            
+            # Trend relative to the current performance level
+            current_avg = (features[:, 0] * 2 + features[:, 2] + features[:, 4]) / 4
+            trend = np.where(predicted > current_avg, 'improving',
+                             np.where(predicted < current_avg, 'declining', 'stable'))
         
         return {
-            'strengths': strengths,
-            'improvement_areas': improvement_areas
+            'predicted_score': predicted,
+            'confidence': confidence,
+            'trend': trend,
         }
+    
+    def _rule_based_prediction_batch(self, raw: np.ndarray) -> np.ndarray:
+        """Vectorized _rule_based_prediction over a feature matrix with NaN for missing values"""
+        tasks = np.nan_to_num(raw[:, 0], nan=0.0)
+        points = np.nan_to_num(raw[:, 1], nan=0.0)
+        collaboration = np.nan_to_num(raw[:, 2], nan=50.0)
+        
+        total_score = (50
+                       + np.minimum(30, tasks * 2)
+                       + np.minimum(20, points / 50)
+                       + collaboration * 0.3)
+        return np.clip(total_score, 0, 100)
+
+class RecommendationEngine:
+    """AI engine for generating personalized recommendations"""
+    
+    def __init__(self, rule_definitions: Optional[Dict[str, List[Dict]]] = None):
+        # Rules are data: the built-in tables, optionally overridden by RECOMMENDATION_RULES_PATH
+        self.rule_definitions = rule_definitions if rule_definitions is not None else load_rule_definitions()
+        self.rules = compile_rule_tables(self.rule_definitions)
+        self.rules_version = rules_version(self.rule_definitions)
+    
+    @property
+    def collaboration_analyzer(self) -> CollaborationAnalyzer:
+        # Shared through the registry so the sentiment model is loaded once per process
+        return get_model("collaboration_analyzer")
+    
+    @property
+    def performance_predictor(self) -> PerformancePredictor:
+        return get_model("performance_predictor")
+    
+    def generate_recommendations(self, user_profile: Dict, performance_data: Dict) -> List[Dict]:
+        """Generate personalized recommendations"""
+        return self.generate_recommendations_batch([rule_record(user_profile, performance_data)])[0]
+    
+    def identify_strengths_and_areas(self, performance_data: Dict) -> Dict[str, List[str]]:
+        """Identify strengths and improvement areas"""
+        return self.identify_strengths_and_areas_batch([rule_record({}, performance_data)])[0]
+    
+    def generate_recommendations_batch(self, records: List[Dict]) -> List[List[Dict]]:
+        """Recommendations for a cohort of rule_record()s in one vectorized pass"""
+        return self.apply_rules(records, ['recommendations'])['recommendations']
+    
+    def identify_strengths_and_areas_batch(self, records: List[Dict]) -> List[Dict[str, List[str]]]:
+        results = self.apply_rules(records, ['strengths', 'improvement_areas'])
+        return [
+            {'strengths': user_strengths, 'improvement_areas': user_areas}
+            for user_strengths, user_areas in zip(results['strengths'], results['improvement_areas'])
+        ]
+    
+    def apply_rules(self, records: List[Dict], tables: List[str]) -> Dict[str, List[List[Any]]]:
+        """Apply several rule tables to one cohort, reading each field from the records once"""
+        observe_batch("recommendations", "scoring", len(records))
+        with timed("recommendations", "feature_extraction"):
+            columns = field_columns(records, list(dict.fromkeys(
+                field for name in tables for field in self.rules[name].fields
+            )))
+        with timed("recommendations", "scoring"):
+            return {name: self.rules[name].apply(records, columns) for name in tables}
+    
+    def suggest_career_paths(self, user_profiles: List[Dict]) -> List[List[Dict]]:
+        """Career progression paths for each profile"""
+        records = [rule_record(profile) for profile in user_profiles]
+        return self.apply_rules(records, ['career_paths'])['career_paths']
+    
+    def suggest_learning_paths(self, user_profiles: List[Dict]) -> List[List[Dict]]:
+        """Learning resources for each profile's skill gaps"""
+        records = [rule_record(profile) for profile in user_profiles]
+        return self.apply_rules(records, ['learning_recommendations'])['learning_recommendations']
+
+def rule_record(user_profile: Dict, performance_data: Optional[Dict] = None) -> Dict:
+    """The record shape rule table fields are resolved against"""
+    return {'profile': user_profile or {}, 'performance': performance_data or {}}
 
 # Model persistence
 def save_model(model, filename: str):
-    """Save trained model to file"""
-    os.makedirs('/app/models', exist_ok=True)
-    with open(f'/app/models/{filename}', 'wb') as f:
-        pickle.dump(model, f)
+    """Save trained model to file.
+    
+    joblib writes NumPy arrays uncompressed and page-aligned, so ``load_model``
+    can memory-map them instead of copying them into every worker.
+    """
+    import joblib
+    
+    path = os.path.join(MODEL_PATH, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(model, path)
+
+def load_model(filename: str, mmap_mode: Optional[str] = 'r'):
+    """Load trained model from file, memory-mapping its arrays by default"""
+    import joblib
+    
+    try:
+        # joblib also reads artifacts written with plain pickle
+        return joblib.load(os.path.join(MODEL_PATH, filename), mmap_mode=mmap_mode)
+    except FileNotFoundError:
+        return None
+
+def publish_model_version(name: str, version: str):
+    """Point the LATEST marker of a versioned model at ``version``"""
+    pointer = os.path.join(MODEL_PATH, name, 'LATEST')
+    tmp_pointer = f'{pointer}.{os.getpid()}.tmp'
+    with open(tmp_pointer, 'w') as f:
+        f.write(version)
+    # Atomic so a reader never sees a half-written version
+    os.replace(tmp_pointer, pointer)
 
-def load_model(filename: str):
-    """Load trained model from file"""
+def latest_model_version(name: str) -> Optional[str]:
+    """Version the LATEST marker of a versioned model points at, if any"""
     try:
-        with open(f'/app/models/{filename}', 'rb') as f:
-            return pickle.load(f)
+        with open(os.path.join(MODEL_PATH, name, 'LATEST')) as f:
+            return f.read().strip() or None
     except FileNotFoundError:
         return None
@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from models.ai_models import CollaborationAggregate
+
+COLLABORATION_STATE_PATH = os.getenv("COLLABORATION_STATE_PATH", "/app/models/collaboration_state.sqlite3")
+
+
+def aggregate_to_dict(aggregate: CollaborationAggregate) -> Dict[str, Any]:
+    return {field: getattr(aggregate, field) for field in CollaborationAggregate.__slots__}
+
+
+def aggregate_from_dict(data: Dict[str, Any]) -> CollaborationAggregate:
+    return CollaborationAggregate(
+        count=int(data.get("count", 0)),
+        response_time_sum=float(data.get("response_time_sum", 0.0)),
+        sentiment_sum=float(data.get("sentiment_sum", 0.0)),
+        word_count_sum=float(data.get("word_count_sum", 0.0)),
+        question_messages=int(data.get("question_messages", 0)),
+    )
+
+
+FIELDS = CollaborationAggregate.__slots__
+
+# Totals are added in SQL, so workers sharing the file never overwrite each other's updates
+UPSERT = (
+    f"INSERT INTO collaboration_state (user_id, {', '.join(FIELDS)}) VALUES (?, {', '.join('?' for _ in FIELDS)}) "
+    f"ON CONFLICT(user_id) DO UPDATE SET {', '.join(f'{field} = {field} + excluded.{field}' for field in FIELDS)}"
+)
+SELECT_ROW = f"SELECT {', '.join(FIELDS)} FROM collaboration_state WHERE user_id = ?"
+
+
+class CollaborationStateStore:
+    """Per-user running collaboration statistics with O(1) updates.
+
+    Each user's state is a CollaborationAggregate; an update adds the new
+    activities' features to the user's row in sqlite and returns the merged
+    totals, so scores are readable instantly and survive restarts. Several
+    workers may share one file: merges are additive upserts, and reads come
+    from the file, so every worker sees every other worker's updates. States
+    from different shards combine with ``merge`` because every field is an
+    additive sum. Nothing is kept in memory when there is a file; without a
+    path, state is kept in this process only.
+    """
+
+    def __init__(self, path: Optional[str] = COLLABORATION_STATE_PATH):
+        self.path = path
+        # Only used without a file, where it is the store itself
+        self._states: Dict[str, CollaborationAggregate] = {}
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # Autocommit mode, so transactions are only the explicit BEGIN IMMEDIATE ones
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS collaboration_state ("
+                "user_id TEXT PRIMARY KEY, count INTEGER NOT NULL, response_time_sum REAL NOT NULL, "
+                "sentiment_sum REAL NOT NULL, word_count_sum REAL NOT NULL, question_messages INTEGER NOT NULL)"
+            )
+
+    def update(self, user_id: str, features: np.ndarray) -> Dict[str, float]:
+        """Fold new activity features into a user's state and return the current scores"""
+        delta = CollaborationAggregate.from_features(features)
+        return self.merge_user(user_id, delta)
+
+    def merge_user(self, user_id: str, delta: CollaborationAggregate) -> Dict[str, float]:
+        with self._lock:
+            return self._merge([(user_id, delta)])[user_id].scores()
+
+    def merge(self, states: Dict[str, Dict[str, Any]]):
+        """Combine exported states (e.g. from another shard) into this store"""
+        with self._lock:
+            self._merge([(user_id, aggregate_from_dict(data)) for user_id, data in states.items()])
+
+    def scores(self, user_id: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            state = self._load(user_id)
+            return state.scores() if state is not None else None
+
+    def state(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._load(user_id)
+            return aggregate_to_dict(state) if state is not None else None
+
+    def export(self, user_ids: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._db is not None and user_ids is None:
+                rows = self._db.execute(f"SELECT user_id, {', '.join(FIELDS)} FROM collaboration_state")
+                states = ((row[0], CollaborationAggregate(*row[1:])) for row in rows)
+            else:
+                ids = self._states.keys() if user_ids is None else user_ids
+                states = ((user_id, self._load(user_id)) for user_id in ids)
+            return {user_id: aggregate_to_dict(state) for user_id, state in states if state is not None}
+
+    def reset(self, user_id: str):
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM collaboration_state WHERE user_id = ?", (user_id,))
+            else:
+                self._states.pop(user_id, None)
+
+    def _merge(self, deltas) -> Dict[str, CollaborationAggregate]:
+        """Add deltas to the stored totals and return the merged states"""
+        if self._db is None:
+            for user_id, delta in deltas:
+                self._states.setdefault(user_id, CollaborationAggregate()).merge(delta)
+            return {user_id: self._states[user_id] for user_id, _ in deltas}
+
+        # BEGIN IMMEDIATE takes the write lock up front, so the rows read back
+        # are exactly the totals this transaction produced
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(UPSERT, [
+                (user_id, *(getattr(delta, field) for field in FIELDS)) for user_id, delta in deltas
+            ])
+            merged = {
+                user_id: CollaborationAggregate(*self._db.execute(SELECT_ROW, (user_id,)).fetchone())
+                for user_id, _ in deltas
+            }
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return merged
+
+    def _load(self, user_id: str) -> Optional[CollaborationAggregate]:
+        # The file is the source of truth; other workers may have merged since
+        if self._db is not None:
+            row = self._db.execute(SELECT_ROW, (user_id,)).fetchone()
+            return CollaborationAggregate(*row) if row is not None else None
+        return self._states.get(user_id)
@@ -0,0 +1,68 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Column layout shared with extract_features / calculate_collaboration_score
+FEATURE_COLUMNS = ('message_length', 'response_time', 'sentiment', 'word_count', 'questions', 'exclamations')
+
+@lru_cache(maxsize=None)
+def _arrow():
+    """pyarrow and its compute module, imported on first use; None if not installed"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError:  # pyarrow is optional
+        return None
+    return pyarrow, pyarrow.compute
+
+
+def activities_to_columns(slack_data: List[Dict[str, Any]]) -> Tuple[List[str], List[float]]:
+    """Split activity dicts into a text column and a response-time column"""
+    texts = [activity.get('message_text', '') or '' for activity in slack_data]
+    response_times = [activity.get('response_time', 0) for activity in slack_data]
+    return texts, response_times
+
+
+def extract_text_features(texts: Sequence[str], response_times: Sequence[float],
+                          sentiments: Optional[Sequence[float]] = None) -> np.ndarray:
+    """Build the N×6 float32 feature matrix with vectorized string kernels.
+
+    ``texts`` may be a list, a pandas string Series or a pyarrow string array.
+    Arrow compute kernels are used when pyarrow is installed; otherwise NumPy's
+    vectorized ``np.char`` functions are used. Word counts stay on
+    ``str.split()``: it is already a C loop, and matching its Unicode
+    whitespace rules in a regex kernel measured ~3x slower.
+    """
+    n = len(texts)
+    features = np.zeros((n, len(FEATURE_COLUMNS)), dtype=np.float32)
+    if n == 0:
+        return features
+
+    arrow = _arrow()
+    if arrow is not None:
+        pa, pc = arrow
+        column = texts if isinstance(texts, (pa.Array, pa.ChunkedArray)) else pa.array(texts, type=pa.large_string())
+        column = pc.fill_null(column, '')
+        features[:, 0] = pc.utf8_length(column).to_numpy(zero_copy_only=False)
+        features[:, 4] = pc.count_substring(column, '?').to_numpy(zero_copy_only=False)
+        features[:, 5] = pc.count_substring(column, '!').to_numpy(zero_copy_only=False)
+    else:
+        column = np.asarray(texts, dtype=str)
+        features[:, 0] = np.char.str_len(column)
+        features[:, 4] = np.char.count(column, '?')
+        features[:, 5] = np.char.count(column, '!')
+
+    features[:, 3] = np.fromiter((len(text.split()) for text in _as_strings(texts)), dtype=np.float32, count=n)
+    features[:, 1] = np.asarray(response_times, dtype=np.float32)
+    if sentiments is not None:
+        features[:, 2] = np.asarray(sentiments, dtype=np.float32)
+
+    return features
+
+
+def _as_strings(texts) -> Sequence[str]:
+    """Python strings with nulls as '', for the few kernels that need them"""
+    if hasattr(texts, 'to_pylist'):  # pyarrow arrays
+        texts = texts.to_pylist()
+    return [text or '' for text in texts]
@@ -0,0 +1,94 @@
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+
+class FlatForest:
+    """A fitted RandomForestRegressor flattened into plain NumPy arrays.
+
+    All trees share one set of node arrays, so the forest can be saved as
+    ``.npy`` files and loaded with ``mmap_mode='r'``. Every worker process that
+    maps the same files then shares one page-cache copy of the weights instead
+    of holding a private unpickled copy. Leaves point back at themselves, so
+    prediction is a fixed number of vectorized steps over all trees and rows
+    at once.
+    """
+
+    ARRAYS = ("children_left", "children_right", "feature", "threshold", "value", "roots")
+
+    def __init__(self, children_left: np.ndarray, children_right: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 max_depth: int, n_features: int):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "FlatForest":
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            # x <= inf always holds, so a leaf keeps stepping onto itself
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            children_left=np.concatenate(lefts).astype(np.int64),
+            children_right=np.concatenate(rights).astype(np.int64),
+            feature=np.concatenate(features).astype(np.int64),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max(estimator.tree_.max_depth for estimator in forest.estimators_),
+            n_features=forest.n_features_in_,
+        )
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # sklearn compares float32 inputs against float64 thresholds; match it exactly
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+
+        return self.value[nodes].mean(axis=0)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+        with open(os.path.join(directory, "forest.json"), "w") as f:
+            json.dump({"max_depth": int(self.max_depth), "n_features": int(self.n_features)}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> "FlatForest":
+        with open(os.path.join(directory, "forest.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in cls.ARRAYS
+        }
+        return cls(**arrays, **meta)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.redis_backoff import RedisBackoff
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "300"))
+# Shared tier across workers and replicas; unset (or empty) keeps the cache in-process only
+PREDICTION_CACHE_REDIS_URL = os.getenv("PREDICTION_CACHE_REDIS_URL", os.getenv("REDIS_URL", ""))
+
+Prediction = Tuple[float, float, str]
+
+
+def feature_keys(features: np.ndarray, model_version: str) -> List[str]:
+    """One key per feature row, scoped to the model version that would score it"""
+    # +0.0 folds -0.0 into 0.0 so equal inputs always hash alike; NaN (missing) hashes consistently
+    rows = np.ascontiguousarray(np.asarray(features, dtype=np.float64) + 0.0)
+    prefix = model_version.encode("utf-8") + b"\0"
+    return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).hexdigest() for row in rows]
+
+
+class PredictionCache:
+    """TTL + LRU cache of (predicted_score, confidence, trend) per feature vector.
+
+    Keys include the model version, so a hot-loaded model never sees the
+    previous model's entries; ``clear`` drops them from the in-process tier
+    right away and the Redis tier lets them expire by TTL.
+    """
+
+    def __init__(self, max_size: int = PREDICTION_CACHE_SIZE, ttl: float = PREDICTION_CACHE_TTL,
+                 redis_url: Optional[str] = PREDICTION_CACHE_REDIS_URL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Prediction]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_backoff = RedisBackoff()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if redis_url:
+            try:
+                import redis
+            except ImportError:  # the Redis tier is optional
+                redis = None
+            if redis is not None:
+                self._redis = redis.Redis.from_url(
+                    redis_url, socket_connect_timeout=0.1, socket_timeout=0.1
+                )
+
+    def get_many(self, keys: List[str]) -> List[Optional[Prediction]]:
+        results: List[Optional[Prediction]] = [None] * len(keys)
+        now = time.monotonic()
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    results[i] = entry[1]
+                    self.hits += 1
+                else:
+                    if entry is not None:
+                        del self._entries[key]
+                    missing.append(i)
+
+        if missing and self._redis_available():
+            try:
+                values = self._redis.mget([self._redis_key(keys[i]) for i in missing])
+            except Exception:
+                self._redis_backoff.failed()
+                values = [None] * len(missing)
+            found = []
+            wall_now = time.time()
+            for i, value in zip(missing, values):
+                if value is None:
+                    continue
+                # Stored as {"prediction": [...], "expires_at": epoch}; anything else predates that
+                entry = json.loads(value)
+                if not isinstance(entry, dict) or entry["expires_at"] <= wall_now:
+                    continue
+                results[i] = tuple(entry["prediction"])
+                # Kept locally only for what remains of the Redis entry's life, not a fresh TTL
+                found.append((keys[i], results[i], now + entry["expires_at"] - wall_now))
+            if found:
+                self._store_local(found)
+            with self._lock:
+                self.redis_hits += len(found)
+            missing = [i for i in missing if results[i] is None]
+
+        with self._lock:
+            self.misses += len(missing)
+        return results
+
+    def put_many(self, keys: List[str], predictions: List[Prediction]):
+        if not keys:
+            return
+        expires_at = time.monotonic() + self.ttl
+        self._store_local([(key, prediction, expires_at) for key, prediction in zip(keys, predictions)])
+        if self._redis_available():
+            value_expires_at = time.time() + self.ttl
+            try:
+                pipeline = self._redis.pipeline(transaction=False)
+                for key, prediction in zip(keys, predictions):
+                    value = json.dumps({"prediction": prediction, "expires_at": value_expires_at})
+                    pipeline.set(self._redis_key(key), value, px=max(1, int(self.ttl * 1000)))
+                pipeline.execute()
+            except Exception:
+                self._redis_backoff.failed()
+
+    def clear(self):
+        """Drop the in-process tier, e.g. after a new model version is loaded"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "redis_enabled": self._redis is not None,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "redis_errors": self._redis_backoff.failures,
+                "hit_rate": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            }
+
+    def _store_local(self, items: List[Tuple[str, Prediction, float]]):
+        """Store (key, prediction, monotonic expiry) entries"""
+        with self._lock:
+            for key, prediction, expires_at in items:
+                self._entries[key] = (expires_at, prediction)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"ml-engine:prediction:{key}"
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and self._redis_backoff.available()
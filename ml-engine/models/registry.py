@@ -0,0 +1,182 @@
+import asyncio
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def process_memory() -> Dict[str, int]:
+    """Resident and shared memory of the current process, in bytes"""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    try:
+        with open("/proc/self/statm") as statm:
+            _, resident, shared = (int(value) for value in statm.read().split()[:3])
+        return {"rss_bytes": resident * page_size, "shared_bytes": shared * page_size}
+    except OSError:
+        # Not on Linux: fall back to the peak RSS, which getrusage reports in KiB
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {"rss_bytes": peak, "shared_bytes": 0}
+
+
+class ModelEntry:
+    """A registered model factory and, once loaded, its shared instance"""
+
+    def __init__(self, name: str, version: str, factory: Callable[[], Any]):
+        self.name = name
+        self.version = version
+        self.factory = factory
+        self.instance = None
+        self.state = "registered"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def load(self) -> Any:
+        if self.instance is not None:
+            return self.instance
+
+        with self.lock:
+            if self.instance is None:
+                self.state = "loading"
+                rss_before = process_memory()["rss_bytes"]
+                started = time.perf_counter()
+                try:
+                    instance = self.factory()
+                except Exception as e:
+                    self.state = "failed"
+                    self.error = str(e)
+                    raise
+                self.load_seconds = time.perf_counter() - started
+                # RSS growth while constructing is the best process-level
+                # estimate available for native (torch/numpy) allocations
+                self.memory_bytes = max(0, process_memory()["rss_bytes"] - rss_before)
+                self.error = None
+                self.instance = instance
+                self.state = "ready"
+
+        return self.instance
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "memory_bytes": self.memory_bytes,
+            "error": self.error,
+        }
+
+
+class ModelRegistry:
+    """Process-wide registry handing out shared, lazily constructed models"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, ModelEntry]] = {}
+        self._defaults: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, version: str, factory: Callable[[], Any], default: bool = True):
+        """Register a factory; the default version is what `get(name)` returns"""
+        with self._lock:
+            self._entries.setdefault(name, {})[version] = ModelEntry(name, version, factory)
+            if default or name not in self._defaults:
+                self._defaults[name] = version
+
+    def entry(self, name: str, version: Optional[str] = None) -> ModelEntry:
+        with self._lock:
+            versions = self._entries.get(name)
+            if not versions:
+                raise KeyError(f"Unknown model: {name}")
+            version = version or self._defaults[name]
+            if version not in versions:
+                raise KeyError(f"Unknown version {version} for model {name}")
+            return versions[version]
+
+    def get(self, name: str, version: Optional[str] = None) -> Any:
+        """Return the shared instance, constructing it on first use"""
+        return self.entry(name, version).load()
+
+    def validate(self, names: List[str]):
+        """Raise ValueError naming any model that is not registered"""
+        with self._lock:
+            unknown = [name for name in names if name not in self._entries]
+            known = sorted(self._entries)
+        if unknown:
+            raise ValueError(f"Unknown model(s) {', '.join(unknown)}; registered models are {', '.join(known)}")
+
+    def warm_up(self, names: List[str]):
+        """Load the given models in a background thread"""
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    # The failure is recorded on the entry and reported by readiness
+                    pass
+
+        thread = threading.Thread(target=load_all, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def readiness(self, names: List[str]) -> Dict[str, Any]:
+        """Load state of the given models; ready only when all of them are loaded"""
+        states = {name: self.entry(name).state for name in names}
+        return {
+            "ready": all(state == "ready" for state in states.values()),
+            "models": states,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = [entry for versions in self._entries.values() for entry in versions.values()]
+        return {
+            "process": process_memory(),
+            "models": [entry.stats() for entry in entries],
+        }
+
+
+def _collaboration_analyzer():
+    from models.ai_models import CollaborationAnalyzer
+    return CollaborationAnalyzer()
+
+
+def _performance_predictor():
+    from models.ai_models import PerformancePredictor
+    return PerformancePredictor()
+
+
+def _recommendation_engine():
+    from models.ai_models import RecommendationEngine
+    return RecommendationEngine()
+
+
+def _collaboration_state():
+    from models.collaboration_state import CollaborationStateStore
+    return CollaborationStateStore()
+
+
+def _recommendation_snapshots():
+    from models.snapshots import RecommendationSnapshotStore
+    return RecommendationSnapshotStore()
+
+
+registry = ModelRegistry()
+registry.register("collaboration_analyzer", "1", _collaboration_analyzer)
+registry.register("performance_predictor", "1", _performance_predictor)
+registry.register("recommendation_engine", "1", _recommendation_engine)
+registry.register("collaboration_state", "1", _collaboration_state)
+registry.register("recommendation_snapshots", "1", _recommendation_snapshots)
+
+
+def get_model(name: str, version: Optional[str] = None) -> Any:
+    return registry.get(name, version)
+
+
+async def aget_model(name: str, version: Optional[str] = None) -> Any:
+    """Async variant of get_model that never blocks the event loop on a model load"""
+    entry = registry.entry(name, version)
+    if entry.instance is not None:
+        return entry.instance
+    return await asyncio.to_thread(entry.load)
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# JSON file of rule tables; a table defined there replaces the built-in one of the same name
+RECOMMENDATION_RULES_PATH = os.getenv("RECOMMENDATION_RULES_PATH")
+
+NUMERIC_OPS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+# "eq" is an exact match; "contains" is a case-insensitive substring match
+STRING_OPS = ("eq", "contains")
+
+# Every rule matches when all of its conditions hold. Fields are dotted paths
+# into {"profile": user_profile, "performance": performance_data}; a missing
+# or null value takes the condition's default.
+DEFAULT_RULE_TABLES: Dict[str, List[Dict[str, Any]]] = {
+    "recommendations": [
+        {
+            "when": [{"field": "performance.collaboration_scores.response_time", "op": "<", "value": 70, "default": 100}],
+            "output": {
+                "title": "Improve Response Time",
+                "description": "Consider setting up notifications for important channels and responding within 2 hours during work hours.",
+                "priority": "high",
+                "category": "communication",
+            },
+        },
+        {
+            "when": [{"field": "performance.collaboration_scores.teamwork", "op": "<", "value": 60, "default": 100}],
+            "output": {
+                "title": "Enhance Team Collaboration",
+                "description": "Participate more actively in team discussions and offer help to colleagues.",
+                "priority": "medium",
+                "category": "collaboration",
+            },
+        },
+        {
+            "when": [{"field": "performance.technical_score", "op": "<", "value": 80, "default": 100}],
+            "output": {
+                "title": "Expand Technical Skills",
+                "description": "Consider learning new technologies relevant to your role and current projects.",
+                "priority": "medium",
+                "category": "technical",
+            },
+        },
+        {
+            "when": [
+                {"field": "performance.collaboration_scores.helpfulness", "op": ">", "value": 85, "default": 0},
+                {"field": "profile.role", "op": "eq", "value": "Senior Developer", "default": ""},
+            ],
+            "output": {
+                "title": "Consider Leadership Training",
+                "description": "Your helpfulness scores suggest leadership potential. Consider mentoring or leadership programs.",
+                "priority": "low",
+                "category": "career",
+            },
+        },
+    ],
+    "strengths": [
+        {"when": [{"field": "performance.collaboration_scores.communication", "op": ">", "value": 85, "default": 0}],
+         "output": "Excellent Communication Skills"},
+        {"when": [{"field": "performance.task_completion_rate", "op": ">", "value": 90, "default": 0}],
+         "output": "High Task Completion Rate"},
+        {"when": [{"field": "performance.collaboration_scores.helpfulness", "op": ">", "value": 80, "default": 0}],
+         "output": "Team Collaboration"},
+        {"when": [{"field": "performance.code_quality_score", "op": ">", "value": 85, "default": 0}],
+         "output": "Code Quality & Best Practices"},
+    ],
+    "improvement_areas": [
+        {"when": [{"field": "performance.collaboration_scores.response_time", "op": "<", "value": 70, "default": 100}],
+         "output": "Response Time to Messages"},
+        {"when": [{"field": "performance.innovation_score", "op": "<", "value": 60, "default": 100}],
+         "output": "Innovation & Creative Problem Solving"},
+        {"when": [{"field": "performance.mentoring_score", "op": "<", "value": 50, "default": 100}],
+         "output": "Mentoring Junior Team Members"},
+    ],
+    "career_paths": [
+        {
+            "when": [
+                {"field": "profile.role", "op": "contains", "value": "developer", "default": ""},
+                {"field": "profile.skills.leadership", "op": ">", "value": 70, "default": 0},
+            ],
+            "output": {
+                "title": "Engineering Manager",
+                "requirements": ["Leadership training", "Project management skills"],
+                "timeline": "1-2 years",
+            },
+        },
+        {
+            "when": [
+                {"field": "profile.role", "op": "contains", "value": "developer", "default": ""},
+                {"field": "profile.skills.technical", "op": ">", "value": 85, "default": 0},
+            ],
+            "output": {
+                "title": "Senior/Principal Engineer",
+                "requirements": ["Advanced technical skills", "System design"],
+                "timeline": "6 months - 1 year",
+            },
+        },
+        {
+            "when": [{"field": "profile.skills.innovation", "op": ">", "value": 75, "default": 0}],
+            "output": {
+                "title": "Technical Lead/Architect",
+                "requirements": ["System architecture", "Technical mentoring"],
+                "timeline": "1-3 years",
+            },
+        },
+    ],
+    "learning_recommendations": [
+        {
+            "when": [{"field": "profile.skills.technical", "op": "<", "value": 70, "default": 0}],
+            "output": {
+                "category": "Technical Skills",
+                "resources": ["Advanced programming courses", "System design fundamentals", "Code review best practices"],
+                "priority": "high",
+            },
+        },
+        {
+            "when": [{"field": "profile.skills.communication", "op": "<", "value": 60, "default": 0}],
+            "output": {
+                "category": "Communication",
+                "resources": ["Technical writing workshop", "Presentation skills course", "Active listening training"],
+                "priority": "medium",
+            },
+        },
+        {
+            "when": [
+                {"field": "profile.skills.leadership", "op": "<", "value": 50, "default": 0},
+                {"field": "profile.role", "op": "contains", "value": "senior", "default": ""},
+            ],
+            "output": {
+                "category": "Leadership",
+                "resources": ["Leadership fundamentals", "Mentoring best practices", "Team management course"],
+                "priority": "medium",
+            },
+        },
+    ],
+}
+
+
+def field_columns(records: Sequence[Dict[str, Any]], paths: List[str]) -> Dict[str, List[Any]]:
+    """Column of values (None where missing) for each dotted path.
+
+    Walks one path level at a time across all records, and fields sharing a
+    prefix (e.g. ``performance.collaboration_scores``) walk it only once.
+    """
+    levels: Dict[str, List[Any]] = {"": list(records)}
+    columns = {}
+    for path in paths:
+        prefix = ""
+        for key in path.split("."):
+            parent = levels[prefix]
+            prefix = f"{prefix}.{key}" if prefix else key
+            if prefix not in levels:
+                levels[prefix] = [value.get(key) if isinstance(value, dict) else None for value in parent]
+        columns[path] = levels[prefix]
+    return columns
+
+
+class RuleTable:
+    """A declarative rule table compiled for evaluation over a whole cohort.
+
+    Numeric conditions are grouped by operator, so evaluating the table is one
+    comparison per operator over an N×F matrix of the referenced fields,
+    whatever the number of rules. Rule matches then come from a single
+    condition-count product against the rule membership matrix.
+    """
+
+    def __init__(self, name: str, rules: List[Dict[str, Any]]):
+        self.name = name
+        self.rules = rules
+        self.outputs = [rule["output"] for rule in rules]
+
+        conditions = [(index, condition) for index, rule in enumerate(rules) for condition in rule.get("when", [])]
+        self._membership = np.zeros((len(conditions), len(rules)), dtype=np.int32)
+        self._numeric_fields: List[Tuple[str, float]] = []
+        self._string_fields: List[Tuple[str, str]] = []
+        numeric: Dict[str, Tuple[List[int], List[int], List[float]]] = {}
+        self._string_conditions: List[Tuple[int, int, str, str]] = []
+
+        for position, (rule_index, condition) in enumerate(conditions):
+            self._membership[position, rule_index] = 1
+            field, op, value = condition["field"], condition["op"], condition["value"]
+            if op in NUMERIC_OPS:
+                index = self._field_index(self._numeric_fields, (field, float(condition.get("default", 0))))
+                positions, indices, thresholds = numeric.setdefault(op, ([], [], []))
+                positions.append(position)
+                indices.append(index)
+                thresholds.append(float(value))
+            elif op in STRING_OPS:
+                index = self._field_index(self._string_fields, (field, str(condition.get("default", ""))))
+                text = str(value) if op == "eq" else str(value).lower()
+                self._string_conditions.append((position, index, op, text))
+            else:
+                raise ValueError(f"Unknown operator {op!r} in rule table {name}")
+
+        self._numeric_conditions = [
+            (NUMERIC_OPS[op], np.asarray(positions), np.asarray(indices), np.asarray(thresholds))
+            for op, (positions, indices, thresholds) in numeric.items()
+        ]
+        self._condition_counts = self._membership.sum(axis=0)
+
+    @staticmethod
+    def _field_index(fields: List[Tuple[str, Any]], key: Tuple[str, Any]) -> int:
+        if key not in fields:
+            fields.append(key)
+        return fields.index(key)
+
+    @property
+    def fields(self) -> List[str]:
+        """Every dotted path the table's conditions read"""
+        return list(dict.fromkeys(field for field, _ in self._numeric_fields + self._string_fields))
+
+    def match(self, records: Sequence[Dict[str, Any]],
+              columns: Optional[Dict[str, Sequence[Any]]] = None) -> np.ndarray:
+        """N×R boolean matrix: which rules match which records.
+
+        ``columns`` may hold pre-extracted field columns (see field_columns),
+        so several tables evaluated over one cohort walk the records once.
+        """
+        if columns is None:
+            columns = field_columns(records, self.fields)
+        satisfied = np.zeros((len(records), len(self._membership)), dtype=np.int32)
+
+        if self._numeric_conditions:
+            numeric = np.empty((len(records), len(self._numeric_fields)), dtype=float)
+            for i, (field, default) in enumerate(self._numeric_fields):
+                numeric[:, i] = [default if value is None else value for value in columns[field]]
+            for compare, positions, indices, thresholds in self._numeric_conditions:
+                satisfied[:, positions] = compare(numeric[:, indices], thresholds)
+
+        if self._string_conditions:
+            strings = [
+                np.array([default if value is None else str(value) for value in columns[field]], dtype=str)
+                for field, default in self._string_fields
+            ]
+            for position, index, op, text in self._string_conditions:
+                values = strings[index]
+                if op == "eq":
+                    satisfied[:, position] = values == text
+                else:
+                    satisfied[:, position] = np.char.find(np.char.lower(values), text) >= 0
+
+        return (satisfied @ self._membership) == self._condition_counts
+
+    def apply(self, records: Sequence[Dict[str, Any]],
+              columns: Optional[Dict[str, Sequence[Any]]] = None) -> List[List[Any]]:
+        """Outputs of the matching rules for each record, in table order"""
+        if not records:
+            return []
+        results: List[List[Any]] = [[] for _ in records]
+        # Row-major, so each record's outputs come out in table order
+        rows, rules = np.nonzero(self.match(records, columns))
+        for row, rule in zip(rows.tolist(), rules.tolist()):
+            output = self.outputs[rule]
+            results[row].append(dict(output) if isinstance(output, dict) else output)
+        return results
+
+
+def load_rule_definitions(path: Optional[str] = RECOMMENDATION_RULES_PATH) -> Dict[str, List[Dict[str, Any]]]:
+    """Built-in rule tables, with any tables from the JSON file at ``path`` replacing them"""
+    definitions = dict(DEFAULT_RULE_TABLES)
+    if path:
+        with open(path) as f:
+            definitions.update(json.load(f))
+    return definitions
+
+
+def compile_rule_tables(definitions: Dict[str, List[Dict[str, Any]]]) -> Dict[str, RuleTable]:
+    return {name: RuleTable(name, rules) for name, rules in definitions.items()}
+
+
+def rules_version(definitions: Dict[str, List[Dict[str, Any]]]) -> str:
+    """Content hash of the rule definitions; changes whenever any rule does"""
+    encoded = json.dumps(definitions, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
@@ -0,0 +1,167 @@
+import os
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "pytorch")  # "pytorch", "onnx" or "lexicon"
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "/app/models/onnx")
+ONNX_NUM_THREADS = int(os.getenv("ONNX_NUM_THREADS", "0"))  # 0 lets ONNX Runtime decide
+ONNX_MAX_LENGTH = 512
+
+BACKENDS = ("pytorch", "onnx", "lexicon")
+
+
+def backend_model_id(model_id: str, backend: str = SENTIMENT_BACKEND) -> str:
+    """Identifier for cached results; quantized scores differ slightly from PyTorch ones"""
+    if backend == "pytorch":
+        return model_id
+    if backend == "lexicon":
+        return "lexicon"
+    return f"{model_id}:onnx-int8"
+
+
+def load_sentiment_backend(model_id: str, backend: str = SENTIMENT_BACKEND):
+    """Return a callable with the transformers sentiment pipeline's call shape and output"""
+    if backend == "pytorch":
+        from transformers import pipeline
+        return pipeline("sentiment-analysis", model=model_id)
+    if backend == "onnx":
+        return OnnxSentimentPipeline(ensure_onnx_model(model_id))
+    if backend == "lexicon":
+        return LexiconSentimentPipeline()
+    raise ValueError(f"Unknown sentiment backend: {backend}")
+
+
+def onnx_model_dir(model_id: str, root: str = ONNX_MODEL_DIR) -> str:
+    return os.path.join(root, model_id.replace("/", "__"))
+
+
+def ensure_onnx_model(model_id: str, root: str = ONNX_MODEL_DIR) -> str:
+    """Export and quantize the model on first use; later calls reuse the artifact"""
+    model_dir = onnx_model_dir(model_id, root)
+    if not os.path.exists(os.path.join(model_dir, "model.int8.onnx")):
+        export_quantized_onnx(model_id, model_dir)
+    return model_dir
+
+
+def export_quantized_onnx(model_id: str, output_dir: str) -> str:
+    """Export a sequence classification model to ONNX with dynamic int8 quantization"""
+    import shutil
+    import tempfile
+
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id)
+    model.eval()
+
+    # Everything is written to a private directory beside output_dir and then
+    # moved in with os.replace, so workers exporting at the same time never
+    # write to the same file or load a partial one
+    work_dir = tempfile.mkdtemp(prefix=".export-", dir=output_dir)
+    try:
+        # The tokenizer and config (for id2label) travel with the ONNX graph
+        tokenizer.save_pretrained(work_dir)
+        model.config.save_pretrained(work_dir)
+
+        fp32_path = os.path.join(work_dir, "model.onnx")
+        sample = tokenizer(["export sample"], return_tensors="pt")
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (sample["input_ids"], sample["attention_mask"]),
+                fp32_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"},
+                },
+                opset_version=14,
+            )
+        quantize_dynamic(fp32_path, os.path.join(work_dir, "model.int8.onnx"), weight_type=QuantType.QInt8)
+
+        # The int8 model goes last: its presence is what marks the export complete
+        names = sorted(os.listdir(work_dir), key=lambda name: name == "model.int8.onnx")
+        for name in names:
+            os.replace(os.path.join(work_dir, name), os.path.join(output_dir, name))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return os.path.join(output_dir, "model.int8.onnx")
+
+
+class OnnxSentimentPipeline:
+    """ONNX Runtime stand-in for the transformers sentiment-analysis pipeline"""
+
+    def __init__(self, model_dir: str, num_threads: int = ONNX_NUM_THREADS):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, "model.int8.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+
+    def __call__(self, inputs: Union[str, List[str]], batch_size: Optional[int] = None,
+                 max_length: int = ONNX_MAX_LENGTH, **kwargs) -> List[Dict[str, Any]]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        batch_size = batch_size or len(texts) or 1
+        results = []
+
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=max_length, return_tensors="np",
+            )
+            logits = self.session.run(["logits"], {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": encoded["attention_mask"].astype(np.int64),
+            })[0]
+            results.extend(self._postprocess(logits))
+
+        return results
+
+    def _postprocess(self, logits: np.ndarray) -> List[Dict[str, Any]]:
+        # Same softmax + top label the pipeline applies for single-label models
+        shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probabilities = shifted / shifted.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [
+            {"label": self.id2label[int(index)], "score": float(probabilities[row, index])}
+            for row, index in enumerate(best)
+        ]
+
+
+class LexiconSentimentPipeline:
+    """Tiny word-list sentiment model for offline benchmarks and local development.
+
+    Needs no downloads or native libraries and is deterministic, so runs are
+    comparable across machines; its scores are not meant to be accurate.
+    """
+
+    POSITIVE = frozenset(("thanks", "thank", "great", "good", "nice", "awesome", "lgtm", "love", "+1", "helpful"))
+    NEGATIVE = frozenset(("broken", "fail", "fails", "failed", "bad", "wrong", "bug", "blocked", "why", "again"))
+
+    def __call__(self, inputs: Union[str, List[str]], batch_size: Optional[int] = None,
+                 **kwargs) -> List[Dict[str, Any]]:
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        return [self._score(text) for text in texts]
+
+    def _score(self, text: str) -> Dict[str, Any]:
+        words = text.lower().split()
+        balance = sum(word in self.POSITIVE for word in words) - sum(word in self.NEGATIVE for word in words)
+        if balance == 0:
+            return {"label": "NEUTRAL", "score": 1.0}
+        score = min(1.0, 0.5 + 0.1 * abs(balance))
+        return {"label": "POSITIVE" if balance > 0 else "NEGATIVE", "score": score}
@@ -0,0 +1,161 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Longest input the model is run on, special tokens included; longer messages are chunked
+SENTIMENT_MAX_TOKENS = int(os.getenv("SENTIMENT_MAX_TOKENS", "512"))
+# Chunks scored per long message; beyond this, evenly spaced chunks are sampled
+SENTIMENT_MAX_CHUNKS = int(os.getenv("SENTIMENT_MAX_CHUNKS", "8"))
+
+# Upper bounds (in tokens) of the length buckets batches are formed in
+BUCKET_BOUNDS = (16, 32, 64, 128, 256, 512)
+
+
+class WordTokenizer:
+    """Whitespace stand-in for backends that do not expose a subword tokenizer"""
+
+    def __call__(self, texts: List[str], add_special_tokens: bool = False, **kwargs) -> Dict[str, List[List[str]]]:
+        return {"input_ids": [text.split() for text in texts]}
+
+    def decode(self, ids: Sequence[str], **kwargs) -> str:
+        return " ".join(ids)
+
+    def num_special_tokens_to_add(self, pair: bool = False) -> int:
+        return 0
+
+
+class InferenceUnit:
+    """One model input: a whole message, or one chunk of a long message"""
+
+    __slots__ = ("message", "text", "tokens")
+
+    def __init__(self, message: int, text: str, tokens: int):
+        self.message = message
+        self.text = text
+        self.tokens = tokens
+
+
+def bucket_bound(tokens: int) -> int:
+    for bound in BUCKET_BOUNDS:
+        if tokens <= bound:
+            return bound
+    return BUCKET_BOUNDS[-1]
+
+
+def split_messages(messages: List[str], tokenizer, max_tokens: int = SENTIMENT_MAX_TOKENS,
+                   max_chunks: int = SENTIMENT_MAX_CHUNKS) -> Tuple[List[InferenceUnit], int]:
+    """Turn messages into inference units no longer than ``max_tokens``.
+
+    Messages that fit are one unit each. Longer messages are cut into
+    consecutive token windows, decoded back to text, and scored separately.
+    Returns the units and the number of messages that were chunked.
+    """
+    specials = tokenizer.num_special_tokens_to_add(pair=False) if hasattr(tokenizer, "num_special_tokens_to_add") else 2
+    window = max(1, max_tokens - specials)
+    token_ids = tokenizer(messages, add_special_tokens=False)["input_ids"]
+
+    units: List[InferenceUnit] = []
+    chunked = 0
+    for index, (message, ids) in enumerate(zip(messages, token_ids)):
+        if len(ids) <= window:
+            units.append(InferenceUnit(index, message, len(ids) + specials))
+            continue
+        chunked += 1
+        starts = list(range(0, len(ids), window))
+        if len(starts) > max_chunks:
+            starts = [starts[i] for i in np.linspace(0, len(starts) - 1, max_chunks).round().astype(int)]
+        for start in starts:
+            chunk = ids[start:start + window]
+            units.append(InferenceUnit(index, tokenizer.decode(chunk), len(chunk) + specials))
+    return units, chunked
+
+
+def plan_batches(units: List[InferenceUnit], batch_size: int) -> List[Tuple[int, List[InferenceUnit]]]:
+    """Group units into (bucket bound, batch) pairs of similar length.
+
+    Units are sorted by token length, so a batch is padded only up to its
+    own longest member instead of the longest message in the request.
+    """
+    ordered = sorted(units, key=lambda unit: unit.tokens)
+    batches: List[Tuple[int, List[InferenceUnit]]] = []
+    current: List[InferenceUnit] = []
+    current_bound = None
+    for unit in ordered:
+        bound = bucket_bound(unit.tokens)
+        if current and (bound != current_bound or len(current) == batch_size):
+            batches.append((current_bound, current))
+            current = []
+        current.append(unit)
+        current_bound = bound
+    if current:
+        batches.append((current_bound, current))
+    return batches
+
+
+def padded_tokens(lengths: Sequence[int], batch_size: int) -> int:
+    """Tokens a model processes when ``lengths`` are batched in this order and padded per batch"""
+    total = 0
+    for start in range(0, len(lengths), batch_size):
+        batch = lengths[start:start + batch_size]
+        total += len(batch) * max(batch)
+    return total
+
+
+class BatchingStats:
+    """Per-bucket throughput and padding waste of sentiment inference"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, Dict[str, float]] = {}
+        self.messages = 0
+        self.chunked_messages = 0
+        self.naive_padded_tokens = 0
+
+    def record_request(self, messages: int, chunked: int, units: List[InferenceUnit], batch_size: int):
+        # What batching the units in arrival order would have padded to, for comparison
+        naive = padded_tokens([unit.tokens for unit in units], batch_size) if units else 0
+        with self._lock:
+            self.messages += messages
+            self.chunked_messages += chunked
+            self.naive_padded_tokens += naive
+
+    def record_batch(self, bound: int, batch: List[InferenceUnit], seconds: float):
+        tokens = [unit.tokens for unit in batch]
+        with self._lock:
+            bucket = self._buckets.setdefault(bound, {
+                "batches": 0, "units": 0, "tokens": 0, "padded_tokens": 0, "seconds": 0.0,
+            })
+            bucket["batches"] += 1
+            bucket["units"] += len(batch)
+            bucket["tokens"] += sum(tokens)
+            bucket["padded_tokens"] += len(batch) * max(tokens)
+            bucket["seconds"] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {}
+            for bound, bucket in sorted(self._buckets.items()):
+                seconds = bucket["seconds"]
+                buckets[f"<={bound}"] = {
+                    **bucket,
+                    "padding_waste": _waste(bucket["tokens"], bucket["padded_tokens"]),
+                    "units_per_second": bucket["units"] / seconds if seconds else None,
+                    "tokens_per_second": bucket["tokens"] / seconds if seconds else None,
+                }
+            tokens = sum(bucket["tokens"] for bucket in self._buckets.values())
+            padded = sum(bucket["padded_tokens"] for bucket in self._buckets.values())
+            return {
+                "messages": self.messages,
+                "chunked_messages": self.chunked_messages,
+                "tokens": tokens,
+                "padded_tokens": padded,
+                "padding_waste": _waste(tokens, padded),
+                "unsorted_padding_waste": _waste(tokens, self.naive_padded_tokens),
+                "buckets": buckets,
+            }
+
+
+def _waste(tokens: int, padded: int) -> Optional[float]:
+    return 1 - tokens / padded if padded else None
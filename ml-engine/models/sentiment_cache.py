@@ -0,0 +1,153 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH")  # unset disables the on-disk tier
+
+
+def normalize_text(text: str) -> str:
+    """Normalize message text so trivially different copies share a cache entry"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text: str, model_id: str) -> str:
+    """Content-addressed key for a message under a given model"""
+    digest = hashlib.sha256()
+    digest.update(model_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SentimentCache:
+    """Two-tier sentiment score cache: in-process LRU with an optional sqlite tier.
+
+    Several workers may share the sqlite file. A sqlite error (a locked
+    database, a full disk) is counted in ``stats()`` and the lookup or write
+    carries on with the in-process tier alone, so a score that was already
+    computed is never lost to the cache.
+    """
+
+    def __init__(self, model_id: str, max_size: int = SENTIMENT_CACHE_SIZE,
+                 path: Optional[str] = SENTIMENT_CACHE_PATH):
+        self.model_id = model_id
+        self.max_size = max_size
+        self.path = path
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_errors = 0
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, score REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get_many(self, texts: Iterable[str]) -> List[Optional[float]]:
+        """Look up cached scores, returning None for every miss"""
+        keys = [cache_key(text, self.model_id) for text in texts]
+        results: List[Optional[float]] = [None] * len(keys)
+        missing: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self._entries.get(key)
+                if score is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    results[i] = score
+                    self.hits += 1
+
+            if missing and self._db is not None:
+                try:
+                    found = self._read_disk(list(missing))
+                except sqlite3.Error:
+                    self.disk_errors += 1
+                    found = {}
+                for key, score in found.items():
+                    for i in missing.pop(key):
+                        results[i] = score
+                        self.disk_hits += 1
+                    self._store(key, score)
+
+            self.misses += sum(len(positions) for positions in missing.values())
+
+        return results
+
+    def put_many(self, texts: Iterable[str], scores: Iterable[float]):
+        """Store scores for the given texts in both tiers"""
+        items = [(cache_key(text, self.model_id), float(score)) for text, score in zip(texts, scores)]
+
+        with self._lock:
+            for key, score in items:
+                self._store(key, score)
+
+            if self._db is not None and items:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO sentiment_cache (key, score) VALUES (?, ?)", items
+                    )
+                    self._db.commit()
+                except sqlite3.Error:
+                    self.disk_errors += 1
+                    self._db.rollback()
+
+    def get(self, text: str) -> Optional[float]:
+        return self.get_many([text])[0]
+
+    def put(self, text: str, score: float):
+        self.put_many([text], [score])
+
+    def clear(self):
+        """Drop the in-process tier; the on-disk tier is left untouched"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "model_id": self.model_id,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "disk_enabled": self._db is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_errors": self.disk_errors,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def _store(self, key: str, score: float):
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, float]:
+        found = {}
+        # Stay well below sqlite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, score FROM sentiment_cache WHERE key IN ({placeholders})", chunk
+            )
+            found.update(rows.fetchall())
+        return found
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+RECOMMENDATION_SNAPSHOT_PATH = os.getenv(
+    "RECOMMENDATION_SNAPSHOT_PATH", "/app/models/recommendation_snapshots.sqlite3"
+)
+# How often readers look for snapshots written by another process (the batch job)
+SNAPSHOT_SYNC_INTERVAL = float(os.getenv("RECOMMENDATION_SNAPSHOT_SYNC_INTERVAL", "5"))
+
+# Rule tables stored in every snapshot, in response field order
+SNAPSHOT_TABLES = ('recommendations', 'strengths', 'improvement_areas', 'career_paths', 'learning_recommendations')
+
+
+def input_fingerprint(user_profile: Dict[str, Any], performance_data: Dict[str, Any], rules_version: str) -> str:
+    """Content hash of everything a user's recommendations depend on"""
+    encoded = json.dumps(
+        [user_profile, performance_data, rules_version], sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _to_json(value):
+    # Rule outputs may hold numpy scalars or arrays taken from the cohort frame
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class RecommendationSnapshotStore:
+    """Latest precomputed recommendations per user, served from memory.
+
+    Snapshots are written through to sqlite, which the batch job and the API
+    workers share. Each write batch gets a new generation number; readers
+    pick up newer generations at most every SNAPSHOT_SYNC_INTERVAL seconds,
+    and only when sqlite reports another connection has committed, so a
+    lookup is normally a dict access.
+    """
+
+    def __init__(self, path: Optional[str] = RECOMMENDATION_SNAPSHOT_PATH,
+                 sync_interval: float = SNAPSHOT_SYNC_INTERVAL):
+        self.path = path
+        self.sync_interval = sync_interval
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self._generation = 0
+        self._data_version = None
+        self._next_sync = 0.0
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS recommendation_snapshots ("
+                "user_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, rules_version TEXT NOT NULL, "
+                "generation INTEGER NOT NULL, computed_at TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS recommendation_snapshots_generation "
+                "ON recommendation_snapshots (generation)"
+            )
+            self._db.commit()
+            self._sync()
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        self._maybe_sync()
+        return self._snapshots.get(user_id)
+
+    def fingerprints(self) -> Dict[str, str]:
+        self._maybe_sync()
+        with self._lock:
+            return {user_id: snapshot['fingerprint'] for user_id, snapshot in self._snapshots.items()}
+
+    def put_many(self, snapshots: List[Dict[str, Any]]):
+        """Store snapshots (user_id, fingerprint, rules_version and the table outputs) as one generation"""
+        if not snapshots:
+            return
+        computed_at = datetime.utcnow().isoformat()
+        # Serialized before taking the write lock; memory holds the decoded form, as readers see it
+        payloads = [self._payload(snapshot) for snapshot in snapshots]
+        with self._lock:
+            if self._db is None:
+                self._generation += 1
+                generation = self._generation
+            else:
+                # Generation numbers are allocated under sqlite's write lock, so
+                # concurrent writers (the batch job, API workers) never share one
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    generation = self._db.execute(
+                        "SELECT COALESCE(MAX(generation), 0) + 1 FROM recommendation_snapshots"
+                    ).fetchone()[0]
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO recommendation_snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                        [(snapshot['user_id'], snapshot['fingerprint'], snapshot['rules_version'],
+                          generation, computed_at, payload)
+                         for snapshot, payload in zip(snapshots, payloads)],
+                    )
+                    self._db.commit()
+                except BaseException:
+                    self._db.rollback()
+                    raise
+            stored = [
+                {'user_id': snapshot['user_id'], 'fingerprint': snapshot['fingerprint'],
+                 'rules_version': snapshot['rules_version'], 'generation': generation,
+                 'computed_at': computed_at, **json.loads(payload)}
+                for snapshot, payload in zip(snapshots, payloads)
+            ]
+            for snapshot in stored:
+                self._snapshots[snapshot['user_id']] = snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "synced_generation": self._generation,
+                "persistent": self._db is not None,
+            }
+
+    @staticmethod
+    def _payload(snapshot: Dict[str, Any]) -> str:
+        return json.dumps({table: snapshot[table] for table in SNAPSHOT_TABLES}, default=_to_json)
+
+    def _maybe_sync(self):
+        if self._db is None:
+            return
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        with self._lock:
+            self._next_sync = now + self.sync_interval
+            self._sync_locked()
+
+    def _sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        """Load generations newer than ours if another connection has committed since the last look"""
+        if self._db is None:
+            return
+        data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        self._data_version = data_version
+        rows = self._db.execute(
+            "SELECT user_id, fingerprint, rules_version, generation, computed_at, payload "
+            "FROM recommendation_snapshots WHERE generation > ?", (self._generation,)
+        ).fetchall()
+        for user_id, fingerprint, rules_version, generation, computed_at, payload in rows:
+            self._snapshots[user_id] = {
+                'user_id': user_id, 'fingerprint': fingerprint, 'rules_version': rules_version,
+                'generation': generation, 'computed_at': computed_at, **json.loads(payload),
+            }
+            self._generation = max(self._generation, generation)
+
+
+def refresh_snapshots(engine, store: RecommendationSnapshotStore,
+                      inputs: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]) -> Dict[str, Any]:
+    """Recompute snapshots for users whose inputs or rules changed since their last snapshot.
+
+    ``inputs`` maps user id to (user_profile, performance_data). All changed
+    users are evaluated as one cohort.
+    """
+    from models.ai_models import rule_record
+
+    started = time.perf_counter()
+    known = store.fingerprints()
+    changed = []
+    for user_id, (user_profile, performance_data) in inputs.items():
+        fingerprint = input_fingerprint(user_profile, performance_data, engine.rules_version)
+        if known.get(user_id) != fingerprint:
+            changed.append((user_id, fingerprint, rule_record(user_profile, performance_data)))
+
+    if changed:
+        results = engine.apply_rules([record for _, _, record in changed], list(SNAPSHOT_TABLES))
+        store.put_many([
+            {
+                'user_id': user_id, 'fingerprint': fingerprint, 'rules_version': engine.rules_version,
+                **{table: results[table][i] for table in SNAPSHOT_TABLES},
+            }
+            for i, (user_id, fingerprint, _) in enumerate(changed)
+        ])
+
+    return {
+        "users": len(inputs),
+        "recomputed": len(changed),
+        "unchanged": len(inputs) - len(changed),
+        "rules_version": engine.rules_version,
+        "seconds": time.perf_counter() - started,
+    }
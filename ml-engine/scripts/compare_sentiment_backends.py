@@ -0,0 +1,104 @@
+"""Compare the ONNX int8 sentiment backend against the PyTorch pipeline.
+
+Reports label agreement, the delta of the numerical score used by
+CollaborationAnalyzer, and latency/throughput for both backends.
+
+    python scripts/compare_sentiment_backends.py --messages messages.txt --batch-size 32
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.ai_models import SENTIMENT_MODEL, CollaborationAnalyzer  # noqa: E402
+from models.sentiment_backends import load_sentiment_backend, onnx_model_dir  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "thanks!",
+    "+1",
+    "lgtm",
+    "on it",
+    "This deploy broke staging again, really frustrating.",
+    "Great job on the release everyone, the demo went perfectly!",
+    "Can someone review my PR when you get a chance?",
+    "I'm not sure this approach will scale, can we discuss tomorrow?",
+    "The build is still failing after the fix :(",
+    "Happy to help, ping me if you get stuck.",
+    "Meeting moved to 3pm.",
+    "Why does this keep timing out??",
+]
+
+
+def load_messages(path: str) -> List[str]:
+    if not path:
+        return SAMPLE_MESSAGES
+    with open(path) as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def run_backend(name: str, messages: List[str], batch_size: int, repeats: int):
+    started = time.perf_counter()
+    analyzer = load_sentiment_backend(SENTIMENT_MODEL, name)
+    load_seconds = time.perf_counter() - started
+
+    # Warm up so one-time graph initialisation is not counted
+    analyzer(messages[:batch_size], batch_size=batch_size)
+
+    single_latencies = []
+    for message in messages[:200]:
+        started = time.perf_counter()
+        analyzer(message)
+        single_latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        results = analyzer(messages, batch_size=batch_size)
+    batched_seconds = (time.perf_counter() - started) / repeats
+
+    return results, {
+        "load_seconds": load_seconds,
+        "single_p50_ms": float(np.percentile(single_latencies, 50) * 1000),
+        "single_p99_ms": float(np.percentile(single_latencies, 99) * 1000),
+        "batched_messages_per_second": len(messages) / batched_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", help="File with one message per line (defaults to a built-in sample)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    messages = load_messages(args.messages)
+    pytorch_results, pytorch_timing = run_backend("pytorch", messages, args.batch_size, args.repeats)
+    onnx_results, onnx_timing = run_backend("onnx", messages, args.batch_size, args.repeats)
+
+    pytorch_scores = np.array([CollaborationAnalyzer._sentiment_to_score(r) for r in pytorch_results])
+    onnx_scores = np.array([CollaborationAnalyzer._sentiment_to_score(r) for r in onnx_results])
+    deltas = np.abs(pytorch_scores - onnx_scores)
+    agreement = np.mean([p["label"] == o["label"] for p, o in zip(pytorch_results, onnx_results)])
+
+    onnx_path = os.path.join(onnx_model_dir(SENTIMENT_MODEL), "model.int8.onnx")
+    report = {
+        "messages": len(messages),
+        "accuracy": {
+            "label_agreement": float(agreement),
+            "score_delta_mean": float(deltas.mean()),
+            "score_delta_max": float(deltas.max()),
+        },
+        "pytorch": pytorch_timing,
+        "onnx": dict(onnx_timing, model_size_bytes=os.path.getsize(onnx_path)),
+        "speedup": onnx_timing["batched_messages_per_second"] / pytorch_timing["batched_messages_per_second"],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
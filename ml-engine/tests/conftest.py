@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules import each other relative to the ml-engine root, as under uvicorn
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+from models.ai_models import CollaborationAggregate
+from models.collaboration_state import CollaborationStateStore
+
+
+def delta(count, response_time_sum, questions=0):
+    return CollaborationAggregate(count=count, response_time_sum=response_time_sum, sentiment_sum=0.5 * count,
+                                  word_count_sum=10.0 * count, question_messages=questions)
+
+
+def test_workers_sharing_a_file_keep_each_others_updates(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first = CollaborationStateStore(path)
+    second = CollaborationStateStore(path)
+
+    first.merge_user("u1", delta(2, 60.0, questions=1))
+    second.merge_user("u1", delta(3, 90.0))
+    first.merge_user("u1", delta(1, 30.0, questions=1))
+
+    expected = {"count": 6, "response_time_sum": 180.0, "sentiment_sum": 3.0, "word_count_sum": 60.0,
+                "question_messages": 2}
+    assert first.state("u1") == expected
+    assert second.state("u1") == expected
+    assert CollaborationStateStore(path).state("u1") == expected
+    assert first.scores("u1") == second.scores("u1")
+
+
+def test_merge_returns_totals_including_other_workers(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first = CollaborationStateStore(path)
+    second = CollaborationStateStore(path)
+
+    first.merge_user("u1", delta(1, 10.0))
+    scores = second.merge_user("u1", delta(1, 30.0))
+
+    assert scores == delta(2, 40.0).scores()
+
+
+def test_shard_merge_and_export(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first = CollaborationStateStore(path)
+    second = CollaborationStateStore(path)
+
+    first.merge_user("u1", delta(1, 10.0))
+    second.merge({"u1": {"count": 1, "response_time_sum": 20.0}, "u2": {"count": 4}})
+
+    exported = first.export()
+    assert exported["u1"]["count"] == 2
+    assert exported["u1"]["response_time_sum"] == 30.0
+    assert exported["u2"]["count"] == 4
+    assert set(first.export(["u2", "missing"])) == {"u2"}
+
+    second.reset("u1")
+    assert first.state("u1") is None
+
+
+def test_in_memory_store():
+    store = CollaborationStateStore(path=None)
+    store.merge_user("u1", delta(1, 10.0))
+    store.merge_user("u1", delta(1, 20.0))
+    assert store.state("u1")["response_time_sum"] == 30.0
+    assert store.scores("missing") is None
+
+
+def test_file_backed_store_keeps_no_states_in_memory(tmp_path):
+    store = CollaborationStateStore(str(tmp_path / "state.sqlite3"))
+    for i in range(50):
+        store.merge_user(f"u{i}", delta(1, 30.0))
+    store.scores("u1")
+    assert len(store.export()) == 50
+    assert store.export(["u1", "missing"]) == {"u1": store.state("u1")}
+    assert store._states == {}
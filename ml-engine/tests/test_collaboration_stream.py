@@ -0,0 +1,26 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import collaboration
+
+
+def client(monkeypatch, max_line_bytes):
+    monkeypatch.setattr(collaboration, "STREAM_MAX_LINE_BYTES", max_line_bytes)
+    app = FastAPI()
+    app.include_router(collaboration.router, prefix="/collaboration")
+    return TestClient(app)
+
+
+def test_unterminated_long_line_is_rejected(monkeypatch):
+    def body():
+        # One line that never ends, sent in pieces
+        for _ in range(100):
+            yield b'{"message_text": "' + b"x" * 1000
+
+    response = client(monkeypatch, 10_000).post("/collaboration/analyze-stream", content=body())
+    assert response.status_code == 413
+
+
+def test_empty_stream_is_accepted_under_the_limit(monkeypatch):
+    response = client(monkeypatch, 10_000).post("/collaboration/analyze-stream", content=b"\n\n")
+    assert response.status_code == 200
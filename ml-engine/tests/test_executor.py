@@ -0,0 +1,29 @@
+import asyncio
+
+from core.executor import InferenceExecutor
+
+
+def _loaded_state(name):
+    from models.registry import registry
+    return registry.entry(name).state
+
+
+def test_process_workers_load_warm_up_models_before_their_first_task(tmp_path, monkeypatch):
+    # Spawned workers inherit the environment, so their snapshot store lands here
+    monkeypatch.setenv("RECOMMENDATION_SNAPSHOT_PATH", str(tmp_path / "snapshots.sqlite3"))
+    executor = InferenceExecutor(kind="process", workers=2, queue_size=4, timeout=60)
+    try:
+        executor.warm_up(["recommendation_snapshots"])
+        for future in executor._warm_workers:
+            future.result(timeout=60)
+        assert executor.readiness() == {"ready": True, "warm_workers": 2}
+        assert asyncio.run(executor.run(_loaded_state, "recommendation_snapshots")) == "ready"
+    finally:
+        executor.shutdown()
+
+
+def test_thread_pool_needs_no_worker_warm_up():
+    executor = InferenceExecutor(kind="thread", workers=2)
+    executor.warm_up(["recommendation_snapshots"])
+    assert executor._pool is None
+    assert executor.readiness() == {"ready": True, "warm_workers": 0}
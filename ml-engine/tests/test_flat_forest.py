@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from models.flat_forest import FlatForest
+
+
+def fit(X, y, **params):
+    return RandomForestRegressor(n_estimators=15, random_state=0, **params).fit(X, y)
+
+
+def inputs_on_thresholds(forest, X):
+    """Rows whose features sit exactly on split thresholds, so ties are exercised"""
+    rows = []
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        for node in np.flatnonzero(tree.children_left != -1):
+            row = X[node % len(X)].copy()
+            row[tree.feature[node]] = tree.threshold[node]
+            rows.append(row)
+    return np.asarray(rows)
+
+
+@pytest.mark.parametrize("params", [{}, {"max_depth": 1}, {"max_depth": 3}, {"min_samples_leaf": 5}])
+def test_matches_sklearn(params):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 6)) * [1, 10, 100, 0.01, 5, 50]
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) + rng.normal(size=300)
+    forest = fit(X, y, **params)
+    flat = FlatForest.from_sklearn(forest)
+
+    X_test = np.vstack([rng.normal(size=(200, 6)) * [1, 10, 100, 0.01, 5, 50], inputs_on_thresholds(forest, X)])
+    assert np.allclose(flat.predict(X_test), forest.predict(X_test))
+
+
+def test_ties_on_integer_features():
+    # Integer features put thresholds at x.5 and test rows at every side of them
+    rng = np.random.default_rng(1)
+    X = rng.integers(0, 5, size=(200, 3)).astype(float)
+    y = X @ [1.0, -2.0, 0.5]
+    forest = fit(X, y)
+    grid = np.array(np.meshgrid(*[np.arange(-1, 6, 0.5)] * 3)).reshape(3, -1).T
+
+    assert np.allclose(FlatForest.from_sklearn(forest).predict(grid), forest.predict(grid))
+
+
+def test_single_leaf_trees():
+    X = np.arange(20, dtype=float).reshape(10, 2)
+    forest = fit(X, np.full(10, 7.0))
+
+    assert np.allclose(FlatForest.from_sklearn(forest).predict(X), forest.predict(X))
+
+
+def test_float32_rounding_matches_sklearn():
+    # Values that round across a threshold when cast to float32, as sklearn does
+    X = np.array([[0.1], [0.2], [0.30000001], [0.4]] * 10)
+    y = np.array([0.0, 1.0, 2.0, 3.0] * 10)
+    forest = fit(X, y, bootstrap=False)
+    probes = np.array([[t] for est in forest.estimators_ for t in est.tree_.threshold if t != -2])
+    probes = np.vstack([probes, np.nextafter(probes, np.inf), np.nextafter(probes, -np.inf)])
+
+    assert np.allclose(FlatForest.from_sklearn(forest).predict(probes), forest.predict(probes))
+
+
+def test_save_and_mmap_load(tmp_path):
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(100, 4))
+    forest = fit(X, X[:, 0] - X[:, 3])
+    FlatForest.from_sklearn(forest).save(str(tmp_path))
+
+    loaded = FlatForest.load(str(tmp_path))
+    assert isinstance(loaded.threshold, np.memmap)
+    assert np.allclose(loaded.predict(X), forest.predict(X))
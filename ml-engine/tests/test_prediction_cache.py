@@ -0,0 +1,66 @@
+import json
+import time
+
+from models.prediction_cache import PredictionCache
+
+
+class FakeRedis:
+    """Just enough of redis-py for PredictionCache: values and millisecond expiries"""
+
+    def __init__(self):
+        self.values = {}
+
+    def mget(self, keys):
+        now = time.time()
+        return [value if expires > now else None for value, expires in (self.values.get(k, (None, 0)) for k in keys)]
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def set(self, key, value, px):
+        self.values[key] = (value.encode(), time.time() + px / 1000)
+
+    def execute(self):
+        pass
+
+
+def cache_with(redis, ttl=60.0):
+    cache = PredictionCache(ttl=ttl, redis_url="")
+    cache._redis = redis
+    return cache
+
+
+def test_redis_hit_keeps_the_original_expiry():
+    redis = FakeRedis()
+    writer = cache_with(redis, ttl=60.0)
+    writer.put_many(["k"], [(70.0, 0.9, "up")])
+
+    # Pretend the Redis entry was written 50s ago by another worker
+    key = writer._redis_key("k")
+    value, expires = redis.values[key]
+    entry = json.loads(value)
+    entry["expires_at"] -= 50
+    redis.values[key] = (json.dumps(entry).encode(), expires - 50)
+
+    reader = cache_with(redis, ttl=60.0)
+    assert reader.get_many(["k"]) == [(70.0, 0.9, "up")]
+    local_expires_at = reader._entries["k"][0]
+    assert local_expires_at - time.monotonic() < 11
+
+
+def test_expired_or_old_format_redis_values_are_misses():
+    redis = FakeRedis()
+    reader = cache_with(redis)
+    redis.values[reader._redis_key("old")] = (json.dumps([1.0, 0.5, "flat"]).encode(), time.time() + 60)
+    redis.values[reader._redis_key("stale")] = (
+        json.dumps({"prediction": [1.0, 0.5, "flat"], "expires_at": time.time() - 1}).encode(), time.time() + 60
+    )
+
+    assert reader.get_many(["old", "stale"]) == [None, None]
+    assert reader.stats()["misses"] == 2
+
+
+def test_local_hit():
+    cache = PredictionCache(ttl=60.0, redis_url="")
+    cache.put_many(["a"], [(1.0, 0.5, "flat")])
+    assert cache.get_many(["a", "b"]) == [(1.0, 0.5, "flat"), None]
@@ -0,0 +1,14 @@
+import pytest
+
+from models.registry import ModelRegistry, registry
+
+
+def test_validate_accepts_registered_models():
+    registry.validate(["performance_predictor", "recommendation_engine", "collaboration_analyzer"])
+
+
+def test_validate_names_unknown_models():
+    local = ModelRegistry()
+    local.register("known", "1", object)
+    with pytest.raises(ValueError, match="typo_model.*known"):
+        local.validate(["known", "typo_model"])
@@ -0,0 +1,207 @@
+"""The rule tables against the hand-written if-chains they replaced.
+
+The reference functions below are the pre-rule-table code, verbatim apart
+from being lifted out of their classes and endpoints. The old code raised on
+``None`` values; the rule tables give null the same default as a missing
+field, so for those profiles the reference runs with the ``None`` values
+removed.
+"""
+import random
+
+import pytest
+
+from models.ai_models import RecommendationEngine, rule_record
+from models.rules import DEFAULT_RULE_TABLES
+
+
+def old_generate_recommendations(user_profile, performance_data):
+    recommendations = []
+    collab_scores = performance_data.get('collaboration_scores', {})
+    if collab_scores.get('response_time', 100) < 70:
+        recommendations.append({
+            'title': 'Improve Response Time',
+            'description': 'Consider setting up notifications for important channels and responding within 2 hours during work hours.',
+            'priority': 'high',
+            'category': 'communication'
+        })
+    if collab_scores.get('teamwork', 100) < 60:
+        recommendations.append({
+            'title': 'Enhance Team Collaboration',
+            'description': 'Participate more actively in team discussions and offer help to colleagues.',
+            'priority': 'medium',
+            'category': 'collaboration'
+        })
+    if performance_data.get('technical_score', 100) < 80:
+        recommendations.append({
+            'title': 'Expand Technical Skills',
+            'description': 'Consider learning new technologies relevant to your role and current projects.',
+            'priority': 'medium',
+            'category': 'technical'
+        })
+    if collab_scores.get('helpfulness', 0) > 85 and user_profile.get('role') == 'Senior Developer':
+        recommendations.append({
+            'title': 'Consider Leadership Training',
+            'description': 'Your helpfulness scores suggest leadership potential. Consider mentoring or leadership programs.',
+            'priority': 'low',
+            'category': 'career'
+        })
+    return recommendations
+
+
+def old_identify_strengths_and_areas(performance_data):
+    strengths = []
+    improvement_areas = []
+    collab_scores = performance_data.get('collaboration_scores', {})
+    if collab_scores.get('communication', 0) > 85:
+        strengths.append('Excellent Communication Skills')
+    if performance_data.get('task_completion_rate', 0) > 90:
+        strengths.append('High Task Completion Rate')
+    if collab_scores.get('helpfulness', 0) > 80:
+        strengths.append('Team Collaboration')
+    if performance_data.get('code_quality_score', 0) > 85:
+        strengths.append('Code Quality & Best Practices')
+    if collab_scores.get('response_time', 100) < 70:
+        improvement_areas.append('Response Time to Messages')
+    if performance_data.get('innovation_score', 100) < 60:
+        improvement_areas.append('Innovation & Creative Problem Solving')
+    if performance_data.get('mentoring_score', 100) < 50:
+        improvement_areas.append('Mentoring Junior Team Members')
+    return {'strengths': strengths, 'improvement_areas': improvement_areas}
+
+
+def old_career_paths(user_profile):
+    current_role = user_profile.get('role', '').lower()
+    skills = user_profile.get('skills', {})
+    career_paths = []
+    if 'developer' in current_role:
+        if skills.get('leadership', 0) > 70:
+            career_paths.append({
+                'title': 'Engineering Manager',
+                'requirements': ['Leadership training', 'Project management skills'],
+                'timeline': '1-2 years'
+            })
+        if skills.get('technical', 0) > 85:
+            career_paths.append({
+                'title': 'Senior/Principal Engineer',
+                'requirements': ['Advanced technical skills', 'System design'],
+                'timeline': '6 months - 1 year'
+            })
+    if skills.get('innovation', 0) > 75:
+        career_paths.append({
+            'title': 'Technical Lead/Architect',
+            'requirements': ['System architecture', 'Technical mentoring'],
+            'timeline': '1-3 years'
+        })
+    return career_paths
+
+
+def old_learning_paths(user_profile):
+    skills = user_profile.get('skills', {})
+    role = user_profile.get('role', '').lower()
+    learning_recommendations = []
+    if skills.get('technical', 0) < 70:
+        learning_recommendations.append({
+            'category': 'Technical Skills',
+            'resources': ['Advanced programming courses', 'System design fundamentals', 'Code review best practices'],
+            'priority': 'high'
+        })
+    if skills.get('communication', 0) < 60:
+        learning_recommendations.append({
+            'category': 'Communication',
+            'resources': ['Technical writing workshop', 'Presentation skills course', 'Active listening training'],
+            'priority': 'medium'
+        })
+    if skills.get('leadership', 0) < 50 and 'senior' in role:
+        learning_recommendations.append({
+            'category': 'Leadership',
+            'resources': ['Leadership fundamentals', 'Mentoring best practices', 'Team management course'],
+            'priority': 'medium'
+        })
+    return learning_recommendations
+
+
+ROLES = ['Senior Developer', 'senior developer', 'SENIOR DEVELOPER', 'Senior developer ', 'Developer',
+         'Frontend developer', 'Senior Manager', 'Manager', 'Designer', '', None]
+# Thresholds used by the rules and the values either side of them
+SCORES = [0, 49, 50, 59, 59.9, 60, 69, 70, 70.5, 75, 76, 79, 80, 81, 85, 85.0001, 86, 90, 91, 100, None]
+COLLABORATION_FIELDS = ['response_time', 'teamwork', 'helpfulness', 'communication']
+PERFORMANCE_FIELDS = ['technical_score', 'task_completion_rate', 'code_quality_score', 'innovation_score',
+                      'mentoring_score']
+SKILLS = ['leadership', 'technical', 'innovation', 'communication']
+
+
+def maybe_fields(rng, names):
+    return {name: rng.choice(SCORES) for name in names if rng.random() < 0.8}
+
+
+def generate_profile(rng):
+    profile, performance = {}, {}
+    if rng.random() < 0.9:
+        profile['role'] = rng.choice(ROLES)
+    if rng.random() < 0.9:
+        profile['skills'] = maybe_fields(rng, SKILLS) if rng.random() < 0.95 else None
+    if rng.random() < 0.9:
+        performance['collaboration_scores'] = (
+            maybe_fields(rng, COLLABORATION_FIELDS) if rng.random() < 0.95 else None
+        )
+    performance.update(maybe_fields(rng, PERFORMANCE_FIELDS))
+    return profile, performance
+
+
+def without_none(value):
+    if isinstance(value, dict):
+        return {key: without_none(item) for key, item in value.items() if item is not None}
+    return value
+
+
+def reference(function, *args):
+    try:
+        return function(*args)
+    except (TypeError, AttributeError):
+        # A None value the old code could not compare; null now means "use the default"
+        return function(*(without_none(arg) for arg in args))
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RecommendationEngine(DEFAULT_RULE_TABLES)
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    rng = random.Random(1234)
+    return [generate_profile(rng) for _ in range(3000)]
+
+
+def test_recommendations_match_old_chain(engine, profiles):
+    records = [rule_record(profile, performance) for profile, performance in profiles]
+    results = engine.generate_recommendations_batch(records)
+    for (profile, performance), result in zip(profiles, results):
+        assert result == reference(old_generate_recommendations, profile, performance), (profile, performance)
+
+
+def test_strengths_and_areas_match_old_chain(engine, profiles):
+    records = [rule_record({}, performance) for _, performance in profiles]
+    results = engine.identify_strengths_and_areas_batch(records)
+    for (_, performance), result in zip(profiles, results):
+        assert result == reference(old_identify_strengths_and_areas, performance), performance
+
+
+def test_career_paths_match_old_chain(engine, profiles):
+    results = engine.suggest_career_paths([profile for profile, _ in profiles])
+    for (profile, _), result in zip(profiles, results):
+        assert result == reference(old_career_paths, profile), profile
+
+
+def test_learning_paths_match_old_chain(engine, profiles):
+    results = engine.suggest_learning_paths([profile for profile, _ in profiles])
+    for (profile, _), result in zip(profiles, results):
+        assert result == reference(old_learning_paths, profile), profile
+
+
+def test_single_profile_methods(engine, profiles):
+    for profile, performance in profiles[:200]:
+        assert engine.generate_recommendations(profile, performance) == \
+            reference(old_generate_recommendations, profile, performance)
+        assert engine.identify_strengths_and_areas(performance) == \
+            reference(old_identify_strengths_and_areas, performance)
@@ -0,0 +1,40 @@
+import sqlite3
+
+from models.sentiment_cache import SentimentCache
+
+
+class FailingConnection:
+    """A sqlite connection whose every statement fails, as when another worker holds the lock"""
+
+    def __init__(self):
+        self.rollbacks = 0
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    executemany = execute
+
+    def commit(self):
+        raise sqlite3.OperationalError("database is locked")
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_round_trip_through_the_disk_tier(tmp_path):
+    path = str(tmp_path / "sentiment.sqlite3")
+    SentimentCache("model", path=path).put_many(["great  work"], [0.9])
+    cache = SentimentCache("model", path=path)
+    assert cache.get_many(["great work", "other"]) == [0.9, None]
+    assert (cache.stats()["disk_hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_sqlite_errors_fall_back_to_the_in_process_tier(tmp_path):
+    cache = SentimentCache("model", path=str(tmp_path / "sentiment.sqlite3"))
+    cache._db = FailingConnection()
+
+    cache.put_many(["great work"], [0.9])
+    assert cache._db.rollbacks == 1
+    assert cache.get_many(["great work", "other"]) == [0.9, None]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["disk_errors"]) == (1, 1, 2)
@@ -0,0 +1,36 @@
+import threading
+
+from models.ai_models import CollaborationAnalyzer
+
+
+def test_each_thread_splits_with_its_own_tokenizer():
+    analyzer = CollaborationAnalyzer(backend="lexicon")
+    seen = []
+
+    def split():
+        seen.append(analyzer._split_tokenizer())
+
+    threads = [threading.Thread(target=split) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    split()
+    split()
+
+    assert len({id(tokenizer) for tokenizer in seen}) == 4
+    assert all(tokenizer is not analyzer.tokenizer for tokenizer in seen)
+
+
+def test_tokenizer_failure_marks_messages_failed():
+    analyzer = CollaborationAnalyzer(backend="lexicon")
+
+    class BrokenTokenizer:
+        def __call__(self, *args, **kwargs):
+            raise RuntimeError("Already borrowed")
+
+    analyzer._split_tokenizers.tokenizer = BrokenTokenizer()
+    assert analyzer._infer_sentiment(["good work", "thanks"], 8) == [None, None]
+    # Failed scores are not cached, and callers see a neutral score
+    assert analyzer.analyze_messages_sentiment(["good work"]) == [0.0]
+    assert analyzer.sentiment_cache.get_many(["good work"]) == [None]
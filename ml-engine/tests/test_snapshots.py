@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from models.snapshots import SNAPSHOT_TABLES, RecommendationSnapshotStore
+
+
+def snapshot(user_id, **tables):
+    return {'user_id': user_id, 'fingerprint': f"fp-{user_id}", 'rules_version': "v1",
+            **{table: tables.get(table, []) for table in SNAPSHOT_TABLES}}
+
+
+def test_numpy_values_are_stored_as_plain_json(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite3")
+    store = RecommendationSnapshotStore(path)
+    store.put_many([snapshot("u1", recommendations=[{"priority": np.int64(2), "score": np.float32(0.5)}],
+                             strengths=np.array(["focus"]))])
+
+    expected = {"recommendations": [{"priority": 2, "score": 0.5}], "strengths": ["focus"]}
+    for reader in (store, RecommendationSnapshotStore(path)):
+        stored = reader.get("u1")
+        assert {table: stored[table] for table in expected} == expected
+        assert type(stored["recommendations"][0]["priority"]) is int
+
+
+def test_failed_batch_rolls_back_and_releases_the_write_lock(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite3")
+    store = RecommendationSnapshotStore(path)
+    broken = snapshot("u2")
+    del broken['fingerprint']
+    with pytest.raises(KeyError):
+        store.put_many([snapshot("u1"), broken])
+    assert store.get("u1") is None
+
+    # Neither this connection nor another writer is left stuck behind the failed batch
+    store.put_many([snapshot("u1")])
+    other = RecommendationSnapshotStore(path)
+    other.put_many([snapshot("u3")])
+    assert other.get("u1")['generation'] == 1
+    assert other.get("u3")['generation'] == 2
@@ -0,0 +1,180 @@
+"""Train PerformancePredictor from the backend's performance history.
+
+Each training row is one user and one period with a recorded
+``performance_score`` metric. The six predictor features are aggregated
+for that period from ``tasks``, ``achievements`` and
+``performance_metrics``. Rows are streamed from a server-side cursor in
+chunks, the forest is fitted on all cores, and the result is published as
+a new versioned artifact that running API workers hot-load.
+
+    python -m training.performance --days 365
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from models.ai_models import (
+    MODEL_PATH, PERFORMANCE_FEATURES, PerformancePredictor, publish_model_version,
+)
+from models.flat_forest import FlatForest
+
+TRAINING_CHUNK_SIZE = int(os.getenv("TRAINING_CHUNK_SIZE", "10000"))
+
+# Aggregation happens in Postgres so only one compact row per user-period
+# crosses the wire; the lateral subqueries use the per-user indexes
+TRAINING_QUERY = """
+WITH targets AS (
+    SELECT user_id, period_start, period_end, AVG(metric_value) AS target
+    FROM performance_metrics
+    WHERE metric_name = 'performance_score' AND period_start >= %(since)s
+    GROUP BY user_id, period_start, period_end
+)
+SELECT
+    COALESCE(task_stats.tasks_completed, 0),
+    COALESCE(achievement_stats.points, 0),
+    COALESCE(metric_stats.collaboration_score, 0),
+    COALESCE(task_stats.avg_completion_hours, 0),
+    COALESCE(metric_stats.code_quality_score, 0),
+    COALESCE(metric_stats.peer_ratings, 0),
+    targets.target
+FROM targets
+LEFT JOIN LATERAL (
+    SELECT COUNT(*) AS tasks_completed,
+           AVG(EXTRACT(EPOCH FROM (completed_at - created_at)) / 3600) AS avg_completion_hours
+    FROM tasks
+    WHERE assignee_id = targets.user_id AND status = 'completed'
+      AND completed_at >= targets.period_start AND completed_at < targets.period_end
+) task_stats ON TRUE
+LEFT JOIN LATERAL (
+    SELECT SUM(points) AS points
+    FROM achievements
+    WHERE user_id = targets.user_id
+      AND earned_at >= targets.period_start AND earned_at < targets.period_end
+) achievement_stats ON TRUE
+LEFT JOIN LATERAL (
+    SELECT AVG(metric_value) FILTER (WHERE metric_name = 'collaboration_score') AS collaboration_score,
+           AVG(metric_value) FILTER (WHERE metric_name = 'code_quality_score') AS code_quality_score,
+           AVG(metric_value) FILTER (WHERE metric_name = 'peer_ratings') AS peer_ratings
+    FROM performance_metrics
+    WHERE user_id = targets.user_id
+      AND period_start >= targets.period_start AND period_end <= targets.period_end
+) metric_stats ON TRUE
+"""
+
+
+def database_dsn() -> str:
+    """Connection string built from the same POSTGRES_* settings the backend uses"""
+    return (
+        f"host={os.getenv('POSTGRES_HOST', 'localhost')} "
+        f"port={os.getenv('POSTGRES_PORT', '5432')} "
+        f"dbname={os.getenv('POSTGRES_DB', 'pragati')} "
+        f"user={os.getenv('POSTGRES_USER', 'pragati_user')} "
+        f"password={os.getenv('POSTGRES_PASSWORD', 'pragati_password')}"
+    )
+
+
+def load_training_data(since: datetime, dsn: Optional[str] = None,
+                       chunk_size: int = TRAINING_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Stream training rows in chunks into an N×6 feature matrix and a target vector"""
+    import psycopg2
+
+    chunks = []
+    with psycopg2.connect(dsn or database_dsn()) as connection:
+        # A named cursor keeps the result set on the server
+        with connection.cursor(name="performance_training") as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(TRAINING_QUERY, {"since": since})
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                chunks.append(np.asarray(rows, dtype=np.float64))
+
+    if not chunks:
+        return np.empty((0, len(PERFORMANCE_FEATURES))), np.empty(0)
+
+    data = np.concatenate(chunks)
+    return data[:, :-1], data[:, -1]
+
+
+def train(features: np.ndarray, targets: np.ndarray, n_jobs: int = -1,
+          holdout: float = 0.2, random_state: int = 42) -> Tuple[Any, Dict[str, float]]:
+    """Fit the forest on all cores and report hold-out error"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn.model_selection import train_test_split
+
+    metrics: Dict[str, float] = {}
+    if holdout and len(targets) >= 10:
+        x_train, x_test, y_train, y_test = train_test_split(
+            features, targets, test_size=holdout, random_state=random_state
+        )
+        model = RandomForestRegressor(n_estimators=100, random_state=random_state, n_jobs=n_jobs)
+        model.fit(x_train, y_train)
+        predictions = model.predict(x_test)
+        metrics = {
+            "holdout_mae": float(mean_absolute_error(y_test, predictions)),
+            "holdout_r2": float(r2_score(y_test, predictions)),
+        }
+
+    # The published model is refitted on every row
+    model = RandomForestRegressor(n_estimators=100, random_state=random_state, n_jobs=n_jobs)
+    model.fit(features, targets)
+    # Serving predicts a handful of rows at a time, where a per-call thread pool costs more than it saves
+    model.set_params(n_jobs=None)
+    return model, metrics
+
+
+def publish(model: Any, metadata: Dict[str, Any]) -> str:
+    """Persist a versioned artifact and make it the one workers hot-load"""
+    version = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    name = PerformancePredictor.ARTIFACT_NAME
+    # Flattened arrays are memory-mapped by every serving worker
+    FlatForest.from_sklearn(model).save(os.path.join(MODEL_PATH, name, version, "forest"))
+    save_model_metadata(name, version, dict(metadata, version=version))
+    publish_model_version(name, version)
+    return version
+
+
+def save_model_metadata(name: str, version: str, metadata: Dict[str, Any]):
+    with open(os.path.join(MODEL_PATH, name, version, "metadata.json"), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=365, help="How much history to train on")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Cores used for fitting (-1 for all)")
+    parser.add_argument("--chunk-size", type=int, default=TRAINING_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    since = datetime.utcnow() - timedelta(days=args.days)
+    features, targets = load_training_data(since, chunk_size=args.chunk_size)
+    loaded = time.perf_counter()
+    if len(targets) == 0:
+        raise SystemExit("No performance_score history found; nothing to train on")
+
+    model, metrics = train(features, targets, n_jobs=args.n_jobs)
+    fitted = time.perf_counter()
+
+    version = publish(model, {
+        "trained_at": datetime.utcnow().isoformat(),
+        "since": since.isoformat(),
+        "rows": int(len(targets)),
+        "features": PERFORMANCE_FEATURES,
+        "load_seconds": loaded - started,
+        "fit_seconds": fitted - loaded,
+        **metrics,
+    })
+    print(f"Published performance_predictor {version}: {len(targets)} rows, "
+          f"load {loaded - started:.1f}s, fit {fitted - loaded:.1f}s, {metrics}")
+
+
+if __name__ == "__main__":
+    main()